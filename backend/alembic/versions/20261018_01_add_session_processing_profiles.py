@@ -0,0 +1,51 @@
+"""Add per-session processing profiles."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_01_add_session_processing_profiles"
+down_revision = "20250110_01_add_fund_models"
+branch_labels = None
+depends_on = None
+
+
+PROFILES_TABLE = "session_processing_profiles"
+
+
+def upgrade() -> None:
+    op.create_table(
+        PROFILES_TABLE,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "session_id",
+            sa.String(length=36),
+            sa.ForeignKey("user_sessions.session_id"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("read_file_ms", sa.Float(), nullable=True),
+        sa.Column("validate_headers_ms", sa.Float(), nullable=True),
+        sa.Column("parse_rows_ms", sa.Float(), nullable=True),
+        sa.Column("resolve_investors_ms", sa.Float(), nullable=True),
+        sa.Column("insert_distributions_ms", sa.Float(), nullable=True),
+        sa.Column("calculate_tax_ms", sa.Float(), nullable=True),
+        sa.Column("commit_ms", sa.Float(), nullable=True),
+        sa.Column("total_ms", sa.Float(), nullable=True),
+        sa.Column("file_size", sa.Integer(), nullable=True),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("valid_rows", sa.Integer(), nullable=True),
+        sa.Column("distribution_count", sa.Integer(), nullable=True),
+        sa.Column("peak_memory_kb", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_session_processing_profiles_id", PROFILES_TABLE, ["id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_session_processing_profiles_id", table_name=PROFILES_TABLE)
+    op.drop_table(PROFILES_TABLE)
@@ -0,0 +1,54 @@
+"""Stage rule set publication: DRAFT status, rule version counter, active-only uniqueness."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_02_stage_rule_set_publication"
+down_revision = "20261018_01_add_session_processing_profiles"
+branch_labels = None
+depends_on = None
+
+
+RULE_SETS_TABLE = "salt_rule_sets"
+VERSIONS_TABLE = "salt_rule_versions"
+ACTIVE_PERIOD_INDEX = "uq_salt_rule_set_active_year_quarter"
+ACTIVE_ONLY = sa.text("status = 'ACTIVE'")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # New enum values cannot be added inside a transaction block
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE rulesetstatus ADD VALUE IF NOT EXISTS 'DRAFT'")
+
+    op.create_table(
+        VERSIONS_TABLE,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    # The (year, quarter, status) constraint also allowed only one ARCHIVED set
+    # per period, so a second re-publish failed after archiving the active set
+    with op.batch_alter_table(RULE_SETS_TABLE) as batch_op:
+        batch_op.drop_constraint(ACTIVE_PERIOD_INDEX, type_="unique")
+    op.create_index(
+        ACTIVE_PERIOD_INDEX,
+        RULE_SETS_TABLE,
+        ["year", "quarter"],
+        unique=True,
+        sqlite_where=ACTIVE_ONLY,
+        postgresql_where=ACTIVE_ONLY,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(ACTIVE_PERIOD_INDEX, table_name=RULE_SETS_TABLE)
+    op.execute(sa.text(f"DELETE FROM {RULE_SETS_TABLE} WHERE status = 'DRAFT'"))
+    with op.batch_alter_table(RULE_SETS_TABLE) as batch_op:
+        batch_op.create_unique_constraint(ACTIVE_PERIOD_INDEX, ["year", "quarter", "status"])
+    op.drop_table(VERSIONS_TABLE)
+    # Postgres cannot drop enum values; DRAFT stays unused in rulesetstatus
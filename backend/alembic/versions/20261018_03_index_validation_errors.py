@@ -0,0 +1,28 @@
+"""Index validation errors by session for pagination and summaries."""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_03_index_validation_errors"
+down_revision = "20261018_02_stage_rule_set_publication"
+branch_labels = None
+depends_on = None
+
+
+ERRORS_TABLE = "validation_errors"
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_validation_errors_session_id", ERRORS_TABLE, ["session_id", "id"]
+    )
+    op.create_index(
+        "idx_validation_errors_session_code", ERRORS_TABLE, ["session_id", "error_code"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_validation_errors_session_code", table_name=ERRORS_TABLE)
+    op.drop_index("idx_validation_errors_session_id", table_name=ERRORS_TABLE)
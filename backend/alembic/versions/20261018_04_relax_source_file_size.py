@@ -0,0 +1,29 @@
+"""Drop the 10MB ceiling on stored SALT workbooks; chunked uploads enforce their own limit."""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_04_relax_source_file_size"
+down_revision = "20261018_03_index_validation_errors"
+branch_labels = None
+depends_on = None
+
+
+SOURCE_FILES_TABLE = "source_files"
+SIZE_CONSTRAINT = "ck_source_file_size_valid"
+
+
+def upgrade() -> None:
+    with op.batch_alter_table(SOURCE_FILES_TABLE) as batch_op:
+        batch_op.drop_constraint(SIZE_CONSTRAINT, type_="check")
+        batch_op.create_check_constraint(SIZE_CONSTRAINT, "file_size > 0")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table(SOURCE_FILES_TABLE) as batch_op:
+        batch_op.drop_constraint(SIZE_CONSTRAINT, type_="check")
+        batch_op.create_check_constraint(
+            SIZE_CONSTRAINT, "file_size > 0 AND file_size <= 10485760"
+        )
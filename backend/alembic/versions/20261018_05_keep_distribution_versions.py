@@ -0,0 +1,57 @@
+"""Keep distribution rows superseded by delta uploads so deleting the delta restores them."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from backend.src.models.enums import USJurisdiction
+
+# revision identifiers, used by Alembic.
+revision = "20261018_05_keep_distribution_versions"
+down_revision = "20261018_04_relax_source_file_size"
+branch_labels = None
+depends_on = None
+
+
+VERSIONS_TABLE = "distribution_versions"
+
+
+def upgrade() -> None:
+    op.create_table(
+        VERSIONS_TABLE,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "superseded_by_session_id",
+            sa.String(length=36),
+            sa.ForeignKey("user_sessions.session_id"),
+            nullable=False,
+        ),
+        sa.Column("distribution_id", sa.Integer(), nullable=False),
+        sa.Column("investor_id", sa.Integer(), sa.ForeignKey("investors.id"), nullable=False),
+        sa.Column(
+            "session_id",
+            sa.String(length=36),
+            sa.ForeignKey("user_sessions.session_id"),
+            nullable=False,
+        ),
+        sa.Column("fund_code", sa.String(length=50), sa.ForeignKey("funds.fund_code"), nullable=False),
+        sa.Column("jurisdiction", sa.Enum(USJurisdiction, name="usjurisdiction"), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("composite_exemption", sa.Boolean(), nullable=False),
+        sa.Column("withholding_exemption", sa.Boolean(), nullable=False),
+        sa.Column("composite_tax_amount", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("withholding_tax_amount", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(f"ix_{VERSIONS_TABLE}_id", VERSIONS_TABLE, ["id"])
+    op.create_index(
+        "idx_distribution_versions_superseded_by", VERSIONS_TABLE, ["superseded_by_session_id"]
+    )
+    op.create_index("idx_distribution_versions_session_id", VERSIONS_TABLE, ["session_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_distribution_versions_session_id", table_name=VERSIONS_TABLE)
+    op.drop_index("idx_distribution_versions_superseded_by", table_name=VERSIONS_TABLE)
+    op.drop_index(f"ix_{VERSIONS_TABLE}_id", table_name=VERSIONS_TABLE)
+    op.drop_table(VERSIONS_TABLE)
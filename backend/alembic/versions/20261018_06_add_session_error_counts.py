@@ -0,0 +1,43 @@
+"""Keep exact validation error counts per session beside the capped error details."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_06_add_session_error_counts"
+down_revision = "20261018_05_keep_distribution_versions"
+branch_labels = None
+depends_on = None
+
+
+COUNTS_TABLE = "session_error_counts"
+
+
+def upgrade() -> None:
+    op.create_table(
+        COUNTS_TABLE,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "session_id",
+            sa.String(length=36),
+            sa.ForeignKey("user_sessions.session_id"),
+            nullable=False,
+        ),
+        sa.Column("error_code", sa.String(length=50), nullable=False),
+        sa.Column(
+            "severity",
+            sa.Enum("ERROR", "WARNING", name="errorseverity"),
+            nullable=False,
+        ),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+    )
+    op.create_index(f"ix_{COUNTS_TABLE}_id", COUNTS_TABLE, ["id"])
+    op.create_index("idx_session_error_counts_session_id", COUNTS_TABLE, ["session_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_session_error_counts_session_id", table_name=COUNTS_TABLE)
+    op.drop_index(f"ix_{COUNTS_TABLE}_id", table_name=COUNTS_TABLE)
+    op.drop_table(COUNTS_TABLE)
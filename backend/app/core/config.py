@@ -24,9 +24,20 @@ class Settings:
     secret_key: str = "your-secret-key-change-in-production"
     access_token_expire_minutes: int = 30
 
+    # Startup: skip schema DDL when the stored schema version matches and
+    # warm parser tables and the active rule context in the background.
+    # Opt-in: drift the model fingerprint cannot see (a manual ALTER, a
+    # restored database) is only repaired by the DDL pass
+    fast_start: bool = os.getenv("FAST_START", "false").lower() == "true"
+
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
+    # Fraction of successful requests written to the access log (failures always logged)
+    access_log_sample_rate: float = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.1"))
+
+    # Responses smaller than this many bytes are sent uncompressed
+    compression_min_bytes: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
 
 
 settings = Settings()
@@ -0,0 +1,111 @@
+"""Structured, sampled access logging and request timing middleware."""
+
+import random
+import time
+from typing import Optional
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.monitoring.metrics import registry
+
+access_logger = structlog.get_logger("fundflow.access")
+
+REQUEST_DURATION = registry.histogram(
+    "fundflow_http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    labelnames=("method", "route"),
+)
+REQUESTS_TOTAL = registry.counter(
+    "fundflow_http_requests_total",
+    "HTTP requests by method, route template and status code",
+    labelnames=("method", "route", "status"),
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_template(scope: Scope) -> str:
+    """Return the matched route template rather than the raw URL path."""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class RequestTimingMiddleware:
+    """Record per-route latency and emit compact access log lines.
+
+    Successful requests are logged with probability ``sample_rate``; responses
+    with status >= 400 and requests that raise are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            self._record(scope, status_code or 500, start, error=type(exc).__name__)
+            raise
+        self._record(scope, status_code or 500, start)
+
+    def _record(
+        self, scope: Scope, status_code: int, start: float, error: Optional[str] = None
+    ) -> None:
+        duration = time.perf_counter() - start
+        method = scope["method"]
+        route = _route_template(scope)
+
+        REQUEST_DURATION.labels(method, route).observe(duration)
+        REQUESTS_TOTAL.labels(method, route, str(status_code)).inc()
+
+        failed = error is not None or status_code >= 400
+        if not failed and (self.sample_rate <= 0.0 or random.random() >= self.sample_rate):
+            return
+
+        if error or status_code >= 500:
+            event = access_logger.error
+        elif failed:
+            event = access_logger.warning
+        else:
+            event = access_logger.info
+        fields = {
+            "method": method,
+            "route": route,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+        }
+        if error:
+            fields["error"] = error
+        event("request", **fields)
+
+
+def configure_structlog(log_format: str) -> None:
+    """Route structlog through stdlib logging with a compact renderer."""
+    renderer = (
+        structlog.processors.JSONRenderer()
+        if log_format == "json"
+        else structlog.processors.KeyValueRenderer(key_order=["event"])
+    )
+    structlog.configure(
+        # Timestamp and level come from the stdlib handler format
+        processors=[renderer],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
@@ -1,14 +1,21 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
+import asyncio
 import os
 import logging
 import traceback
 
 from app.core.config import settings, ensure_directories
+from app.core.request_logging import RequestTimingMiddleware, configure_structlog
 from src.api import router as api_router
-from src.database.connection import init_db
+from src.api.metrics import router as metrics_router
+from src.database.connection import SessionLocal, init_db
+from src.services.admission_control import AdmissionRejected
+from src.services.export_service import XLSX_MEDIA_TYPE
+from src.services.prewarm import prewarm
 
 # Configure logging
 logging.basicConfig(
@@ -16,6 +23,7 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+configure_structlog(settings.log_format)
 
 # Ensure required directories exist
 ensure_directories()
@@ -36,13 +44,19 @@ async def startup_event():
     logger.info("Starting up FundFlow application...")
 
     # Import all models to ensure they're registered with SQLAlchemy
-    from src.models import User, UserSession, Investor, Distribution, ValidationError
+    from src.models import User, UserSession, Investor, Distribution, ValidationError, SessionProcessingProfile
     from src.models import SourceFile, SaltRuleSet, WithholdingRule, CompositeRule, ValidationIssue, StateEntityTaxRuleResolved
 
     # Initialize database tables
     logger.info("Initializing database...")
-    init_db()
-    logger.info("Database initialized successfully")
+    if init_db(skip_if_current=settings.fast_start):
+        logger.info("Database initialized successfully")
+    else:
+        logger.info("Database schema is current; skipped DDL")
+
+    if settings.fast_start:
+        # Runs after startup returns, so readiness is not delayed
+        asyncio.get_running_loop().run_in_executor(None, prewarm, SessionLocal)
 
 # Add CORS middleware
 app.add_middleware(
@@ -53,22 +67,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress other text responses on the fly; cached payloads arrive with
+# their own Content-Encoding and pass through untouched
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.compression_min_bytes,
+    compresslevel=6,
+    exclude_content_types=(*DEFAULT_EXCLUDED_CONTENT_TYPES, XLSX_MEDIA_TYPE),
+)
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all requests and responses for debugging"""
-    try:
-        logger.info(f"Request: {request.method} {request.url}")
-        response = await call_next(request)
-        logger.info(f"Response: {response.status_code}")
-        return response
-    except Exception as e:
-        logger.error(f"Request failed: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        return JSONResponse(
-            status_code=500,
-            content={"detail": f"Internal server error: {str(e)}"}
-        )
+# Record per-route latency and write sampled, structured access logs
+app.add_middleware(
+    RequestTimingMiddleware,
+    sample_rate=settings.access_log_sample_rate,
+)
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Shed upload work beyond the admission limits with a retry hint"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 
 @app.exception_handler(Exception)
@@ -88,6 +110,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Include API routes
 app.include_router(api_router, prefix="/api")
+app.include_router(metrics_router)
 
 # Mount static files for uploads and results
 if os.path.exists(settings.upload_dir):
@@ -8,6 +8,7 @@ from .results import router as results_router
 from .template import router as template_router
 from .salt_rules import router as salt_rules_router
 from .sessions import router as sessions_router
+from .chunked_upload import router as chunked_upload_router
 
 # Create main API router
 router = APIRouter()
@@ -19,4 +20,5 @@ router.include_router(health_router)
 router.include_router(results_router)
 router.include_router(template_router)
 router.include_router(salt_rules_router)
-router.include_router(sessions_router)
\ No newline at end of file
+router.include_router(sessions_router)
+router.include_router(chunked_upload_router)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Resumable chunked upload endpoints for large input files.
+
+``POST /uploads`` registers a file, ``PUT /uploads/{id}?offset=N`` appends a
+chunk of raw bytes and ``POST /uploads/{id}/finalize`` checks the SHA-256 and
+processes the file like the direct upload endpoint of its target. Clients
+that lose the connection read the offset with ``GET /uploads/{id}`` and
+resume from there.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ..database.connection import get_db
+from ..services.admission_control import AdmissionRejected
+from ..services.chunked_upload_service import (
+    CHUNKED_UPLOAD_CHUNK_BYTES,
+    ChunkedUploadError,
+    chunked_upload_service,
+)
+from .salt_rules import publication_period, publish_rule_workbook
+from .upload import process_distribution_upload
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/uploads", tags=["Chunked Uploads"])
+
+# Body fragments are gathered into writes of this size off the event loop
+CHUNK_WRITE_BYTES = 1024 * 1024
+
+CONTENT_TYPES = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".xlsm": "application/vnd.ms-excel.sheet.macroEnabled.12",
+}
+
+
+class InitiateUploadRequest(BaseModel):
+    """File announced before its chunks are sent."""
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., gt=0)
+    target: str = Field("distributions", pattern="^(distributions|salt-rules)$")
+
+
+class FinalizeUploadRequest(BaseModel):
+    """Checksum of the whole file plus the options of the target's upload endpoint."""
+    sha256: str = Field(..., pattern="^[0-9a-fA-F]{64}$")
+    mode: str = Field("full", pattern="^(full|delta)$")
+    description: Optional[str] = Field(None, max_length=500)
+    year: Optional[int] = None
+    quarter: Optional[str] = None
+
+
+def _upload_error(exc: ChunkedUploadError) -> HTTPException:
+    """Map a service error to its HTTP response, telling the client where to resume."""
+    headers = None
+    if exc.offset is not None:
+        headers = {"Upload-Offset": str(exc.offset)}
+    return HTTPException(status_code=exc.status_code, detail=str(exc), headers=headers)
+
+
+@router.post("", status_code=201)
+def initiate_upload(request: InitiateUploadRequest) -> Dict[str, Any]:
+    """Start a chunked upload and return its id and suggested chunk size."""
+    try:
+        state = chunked_upload_service.initiate(request.filename, request.size, request.target)
+    except ChunkedUploadError as exc:
+        raise _upload_error(exc)
+    return {
+        **state.to_dict(),
+        "chunk_size": CHUNKED_UPLOAD_CHUNK_BYTES,
+        "max_size": chunked_upload_service.max_size,
+    }
+
+
+@router.get("/{upload_id}")
+def get_upload(upload_id: str, response: Response) -> Dict[str, Any]:
+    """Report how many bytes were received so an interrupted upload can resume."""
+    try:
+        state = chunked_upload_service.get(upload_id)
+    except ChunkedUploadError as exc:
+        raise _upload_error(exc)
+    response.headers["Upload-Offset"] = str(state.offset)
+    return state.to_dict()
+
+
+@router.put("/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    offset: int = Query(..., ge=0, description="Byte offset of the chunk in the file"),
+) -> Dict[str, Any]:
+    """
+    Append the raw request body at ``offset``.
+
+    The body is written to disk as it arrives, batched into writes of about
+    ``CHUNK_WRITE_BYTES`` off the event loop. An offset other than the
+    bytes received so far is rejected with 409 and the current offset in
+    the ``Upload-Offset`` header; bytes of an interrupted chunk that reached
+    the disk are kept.
+    """
+    try:
+        writer = await run_in_threadpool(chunked_upload_service.open_chunk, upload_id, offset)
+    except ChunkedUploadError as exc:
+        raise _upload_error(exc)
+
+    try:
+        buffer = bytearray()
+        async for data in request.stream():
+            buffer += data
+            if len(buffer) >= CHUNK_WRITE_BYTES:
+                await run_in_threadpool(writer.write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await run_in_threadpool(writer.write, bytes(buffer))
+    except ChunkedUploadError as exc:
+        raise _upload_error(exc)
+    finally:
+        # Kept on the loop so a cancelled request still releases the upload;
+        # the writes are flushed already, so this only closes and stats
+        state = writer.close()
+
+    response.headers["Upload-Offset"] = str(state.offset)
+    return state.to_dict()
+
+
+@router.post("/{upload_id}/finalize")
+def finalize_upload(
+    upload_id: str,
+    request: FinalizeUploadRequest,
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Verify the assembled file and process it.
+
+    Distribution files are processed like ``POST /upload`` (``mode`` applies)
+    under the ``session_id`` returned by initiate, so their progress can be
+    followed on ``/sessions/{session_id}/events``. SALT workbooks are
+    published like ``POST /salt-rules/upload`` (``year``/``quarter``/
+    ``description`` apply). The response is that endpoint's response. An incomplete upload, a checksum mismatch or a 429/503
+    from admission control leaves the upload in place; otherwise it is
+    removed once processing ends.
+    """
+    try:
+        state = chunked_upload_service.get(upload_id)
+    except ChunkedUploadError as exc:
+        raise _upload_error(exc)
+    if state.target == "salt-rules":
+        period = publication_period(request.year, request.quarter)
+
+    try:
+        # A saturated service keeps the upload for a retry after Retry-After
+        with chunked_upload_service.finalize(
+            upload_id, request.sha256, keep_on=(AdmissionRejected,)
+        ) as state:
+            file_path = chunked_upload_service.part_path(state)
+            if state.target != "salt-rules":
+                return process_distribution_upload(
+                    db,
+                    file_path,
+                    state.filename,
+                    state.total_size,
+                    request.mode,
+                    max_file_size=chunked_upload_service.max_size,
+                    session_id=state.session_id,
+                )
+
+            year, quarter, effective_date = period
+            try:
+                published = publish_rule_workbook(
+                    db,
+                    file_path,
+                    state.filename,
+                    CONTENT_TYPES[file_path.suffix],
+                    state.total_size,
+                    year,
+                    quarter,
+                    effective_date,
+                    description=request.description,
+                    max_file_size=chunked_upload_service.max_size,
+                )
+            except (HTTPException, AdmissionRejected):
+                raise
+            except Exception as e:
+                logger.error(f"Error publishing chunked upload {upload_id}: {str(e)}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Internal server error: {str(e)}"
+                )
+            return published.model_dump(by_alias=True)
+    except ChunkedUploadError as exc:
+        raise _upload_error(exc)
+
+
+@router.delete("/{upload_id}", status_code=204)
+def cancel_upload(upload_id: str) -> Response:
+    """Abandon an upload and remove the bytes received so far."""
+    try:
+        chunked_upload_service.cancel(upload_id)
+    except ChunkedUploadError as exc:
+        raise _upload_error(exc)
+    return Response(status_code=204)
@@ -2,20 +2,28 @@
 
 import io
 import csv
-from typing import Any
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 from ..database.connection import get_db
 from ..services.session_service import SessionService
 from ..services.distribution_service import DistributionService
 from ..services.validation_service import ValidationService
+from ..services.export_service import ExcelExportService, XLSX_MEDIA_TYPE
+from ..monitoring.instrumentation import record_export
+from ..utils.money import format_money
 
 router = APIRouter()
 
 
 @router.get("/results/{session_id}/download")
-async def download_results(
+def download_results(
     session_id: str,
     format: str = "csv",
     db: Session = Depends(get_db)
@@ -23,8 +31,15 @@ async def download_results(
     """
     Download processed results as Excel or CSV file.
 
-    Format options: 'csv' (default), 'excel'
+    Format options: 'csv' (default), 'excel' (alias 'xlsx')
     """
+    export_format = format.lower()
+    if export_format not in ("csv", "excel", "xlsx"):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid format. Supported formats: csv, excel"
+        )
+
     # Initialize services
     session_service = SessionService(db)
     distribution_service = DistributionService(db)
@@ -37,6 +52,22 @@ async def download_results(
             detail="Session not found"
         )
 
+    if export_format in ("excel", "xlsx"):
+        if not distribution_service.session_has_distributions(session_id):
+            raise HTTPException(
+                status_code=404,
+                detail="No distribution data found for this session"
+            )
+
+        export_service = ExcelExportService(db)
+        export_path = build_xlsx_export(
+            "results",
+            lambda path: export_service.write_results_workbook(session_id, path),
+        )
+        return xlsx_file_response(
+            export_path, f"fundflow_results_{session_id[:8]}.xlsx"
+        )
+
     # Get distributions
     distributions = distribution_service.get_distributions_by_session(session_id)
 
@@ -47,6 +78,7 @@ async def download_results(
         )
 
     # Prepare data for export
+    export_start = time.perf_counter()
     export_data = []
     for dist in distributions:
         fund = dist.fund
@@ -57,36 +89,57 @@ async def download_results(
             "Fund Code": dist.fund_code,
             "Period": f"{fund.period_quarter} {fund.period_year}" if fund else "",
             "Jurisdiction": dist.jurisdiction.value,
-            "Distribution Amount": float(dist.amount),
+            "Distribution Amount": format_money(dist.amount),
             "Composite Exemption": "Yes" if dist.composite_exemption else "No",
             "Withholding Exemption": "Yes" if dist.withholding_exemption else "No",
             "Created Date": dist.created_at.strftime("%Y-%m-%d %H:%M:%S")
         })
 
-    if format.lower() == "csv":
-        # Generate CSV
-        output = io.StringIO()
-        if export_data:
-            writer = csv.DictWriter(output, fieldnames=export_data[0].keys())
-            writer.writeheader()
-            writer.writerows(export_data)
+    # Generate CSV
+    output = io.StringIO()
+    if export_data:
+        writer = csv.DictWriter(output, fieldnames=export_data[0].keys())
+        writer.writeheader()
+        writer.writerows(export_data)
 
-        output.seek(0)
+    output.seek(0)
 
-        # Create filename
-        filename = f"fundflow_results_{session_id[:8]}.csv"
+    # Create filename
+    filename = f"fundflow_results_{session_id[:8]}.csv"
+    payload = output.getvalue().encode('utf-8')
+    record_export("results", "csv", time.perf_counter() - export_start, len(payload))
 
-        return StreamingResponse(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+    return StreamingResponse(
+        io.BytesIO(payload),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid format. Supported formats: csv"
-        )
+
+def build_xlsx_export(kind: str, write: Callable[[Path], Any]) -> Path:
+    """Write a workbook to a temporary file on disk and record export metrics."""
+    handle, path = tempfile.mkstemp(suffix=".xlsx", prefix="fundflow_export_")
+    os.close(handle)
+    export_path = Path(path)
+
+    start = time.perf_counter()
+    try:
+        write(export_path)
+    except Exception:
+        export_path.unlink(missing_ok=True)
+        raise
+    record_export(kind, "xlsx", time.perf_counter() - start, export_path.stat().st_size)
+    return export_path
+
+
+def xlsx_file_response(export_path: Path, filename: str) -> FileResponse:
+    """Stream a generated workbook from disk and remove it once sent."""
+    return FileResponse(
+        path=str(export_path),
+        filename=filename,
+        media_type=XLSX_MEDIA_TYPE,
+        background=BackgroundTask(export_path.unlink, missing_ok=True),
+    )
 
 
 @router.get("/results/{session_id}/download-errors")
@@ -96,6 +149,9 @@ async def download_errors(
 ) -> StreamingResponse:
     """
     Download validation errors as CSV file.
+
+    Rows are streamed page by page, so large error sets are never built
+    in memory at once.
     """
     # Initialize services
     session_service = SessionService(db)
@@ -109,28 +165,17 @@ async def download_errors(
             detail="Session not found"
         )
 
-    # Get validation errors
-    error_data = validation_service.export_errors_to_csv_data(session_id)
-
-    if not error_data:
+    if not validation_service.count_errors(session_id):
         raise HTTPException(
             status_code=404,
             detail="No validation errors found for this session"
         )
 
-    # Generate CSV
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=error_data[0].keys())
-    writer.writeheader()
-    writer.writerows(error_data)
-
-    output.seek(0)
-
     # Create filename
     filename = f"fundflow_errors_{session_id[:8]}.csv"
 
     return StreamingResponse(
-        io.BytesIO(output.getvalue().encode('utf-8')),
+        validation_service.iter_errors_csv(session_id),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
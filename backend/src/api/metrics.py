@@ -0,0 +1,20 @@
+"""Metrics endpoint exposing in-process counters and histograms."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..monitoring.metrics import registry
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Expose metrics in the Prometheus text exposition format.
+
+    Values are per worker process; scrape each worker or aggregate upstream.
+    """
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,32 +2,83 @@
 
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, TypeVar
 import io
 import csv
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
-from ..database.connection import get_db
+from starlette.concurrency import run_in_threadpool
+from ..database.connection import SessionLocal, get_db
 from ..services.session_service import SessionService
 from ..services.distribution_service import DistributionService
 from ..services.validation_service import ValidationService
 from ..services.tax_calculation_service import TaxCalculationService
+from ..services.export_service import ExcelExportService
+from ..services.result_cache import result_cache
 from ..models.investor_fund_commitment import InvestorFundCommitment
+from ..monitoring.instrumentation import record_export
+from ..monitoring.profiling import PROFILE_STAGE_COLUMNS
+from ..utils.encoded_payload import EncodedPayload, payload_response
+from ..utils.fast_json import FastJSONResponse, dumps
+from ..utils.money import format_money, money_float
+from .download import build_xlsx_export, xlsx_file_response
 
 router = APIRouter()
 
+T = TypeVar("T")
 
-@router.get("/results/{session_id}")
+
+def _in_own_session(db: Session, build: Callable[[Session], T]) -> Callable[[], T]:
+    """Wrap ``build`` for the result cache so it runs in its own Session.
+
+    The computation is shared with coalesced requests and outlives a
+    cancelled first caller, so it must not use that caller's request-scoped
+    Session. Only the engine is taken from ``db``.
+    """
+    bind = db.get_bind()
+
+    def compute() -> T:
+        with SessionLocal(bind=bind) as own_db:
+            return build(own_db)
+
+    return compute
+
+
+@router.get("/results/{session_id}", response_class=FastJSONResponse)
 async def get_results(
     session_id: str,
+    request: Request,
+    errors_after: Optional[int] = None,
+    errors_limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get processing results and status for a session.
 
-    Returns session status, distribution data, and validation errors.
+    Returns session status, distribution data, and one page of validation
+    errors; pass the returned ``next_cursor`` as ``errors_after`` for the next.
     """
+    payload = await result_cache.get_or_compute(
+        ("results", session_id, errors_after, errors_limit),
+        _in_own_session(
+            db,
+            lambda own_db: _json_payload(
+                _build_results(own_db, session_id, errors_after, errors_limit)
+            ),
+        ),
+    )
+    return payload_response(request, payload)
+
+
+def _json_payload(content: Dict[str, Any]) -> EncodedPayload:
+    return EncodedPayload(dumps(content), FastJSONResponse.media_type)
+
+
+def _build_results(
+    db: Session, session_id: str, errors_after: Optional[int], errors_limit: int
+) -> Dict[str, Any]:
     # Initialize services
     session_service = SessionService(db)
     distribution_service = DistributionService(db)
@@ -44,37 +95,36 @@ async def get_results(
     # Get session summary
     session_summary = session_service.get_session_summary(session_id)
 
-    # Get distributions
-    distributions = distribution_service.get_distributions_by_session(session_id)
+    # Get distributions as plain rows; values are converted to JSON-native
+    # types here so the payload can skip jsonable_encoder
+    rows = distribution_service.get_result_rows(session_id)
 
     # Format distribution data
-    distribution_data = []
-    for dist in distributions:
-        fund = dist.fund
-        distribution_data.append({
-            "id": dist.id,
-            "investor_id": dist.investor_id,
-            "investor_name": dist.investor.investor_name,
-            "investor_entity_type": dist.investor.investor_entity_type.value,
-            "investor_tax_state": dist.investor.investor_tax_state,
-            "fund_code": dist.fund_code,
-            "period_quarter": fund.period_quarter if fund else None,
-            "period_year": fund.period_year if fund else None,
-            "jurisdiction": dist.jurisdiction.value,
-            "amount": float(dist.amount),
-            "composite_exemption": dist.composite_exemption,
-            "withholding_exemption": dist.withholding_exemption,
-            "composite_tax_amount": float(dist.composite_tax_amount)
-            if dist.composite_tax_amount is not None
-            else None,
-            "withholding_tax_amount": float(dist.withholding_tax_amount)
-            if dist.withholding_tax_amount is not None
-            else None,
-            "created_at": dist.created_at.isoformat()
-        })
+    distribution_data = [
+        {
+            "id": row.id,
+            "investor_id": row.investor_id,
+            "investor_name": row.investor_name,
+            "investor_entity_type": row.investor_entity_type.value,
+            "investor_tax_state": row.investor_tax_state.value,
+            "fund_code": row.fund_code,
+            "period_quarter": row.period_quarter,
+            "period_year": row.period_year,
+            "jurisdiction": row.jurisdiction.value,
+            "amount": money_float(row.amount),
+            "composite_exemption": row.composite_exemption,
+            "withholding_exemption": row.withholding_exemption,
+            "composite_tax_amount": money_float(row.composite_tax_amount),
+            "withholding_tax_amount": money_float(row.withholding_tax_amount),
+            "created_at": row.created_at.isoformat()
+        }
+        for row in rows
+    ]
 
     # Get validation errors
-    validation_errors = validation_service.get_errors_by_session(session_id)
+    validation_errors = validation_service.get_errors_by_session(
+        session_id, after_id=errors_after, limit=errors_limit
+    )
     error_data = []
     for error in validation_errors:
         error_data.append({
@@ -92,25 +142,24 @@ async def get_results(
 
     # Calculate distribution totals if there are distributions
     distribution_summary = {}
-    if distributions:
+    if rows:
         # Get fund info from first distribution
-        first_dist = distributions[0]
-        fund = first_dist.fund
-        if not fund:
+        first_row = rows[0]
+        if first_row.period_quarter is None:
             raise HTTPException(status_code=500, detail="Fund metadata missing for distribution")
         distribution_summary = distribution_service.calculate_total_distributions(
-            first_dist.fund_code,
-            fund.period_quarter,
-            fund.period_year
+            first_row.fund_code,
+            first_row.period_quarter,
+            first_row.period_year
         )
         # Convert Decimal to float for JSON serialization
-        distribution_summary = {k: float(v) for k, v in distribution_summary.items()}
+        distribution_summary = {k: money_float(v) for k, v in distribution_summary.items()}
 
         # Get exemption summary
         exemption_summary = distribution_service.get_exemption_summary(
-            first_dist.fund_code,
-            fund.period_quarter,
-            fund.period_year
+            first_row.fund_code,
+            first_row.period_quarter,
+            first_row.period_year
         )
         distribution_summary["exemption_summary"] = exemption_summary
 
@@ -123,23 +172,37 @@ async def get_results(
         },
         "validation_errors": {
             "data": error_data,
-            "summary": error_summary
+            "summary": error_summary,
+            "next_cursor": (
+                validation_errors[-1].id if len(validation_errors) == errors_limit else None
+            )
         }
     }
 
 
-@router.get("/results/{session_id}/preview")
+@router.get("/results/{session_id}/preview", response_class=FastJSONResponse)
 async def get_results_preview(
     session_id: str,
-    limit: int = 100,
+    request: Request,
+    limit: int = Query(100, ge=0),
     mode: str = Query("upload", pattern="^(upload|results)$"),
     db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get preview of first N distribution records for display.
 
     Optimized for frontend data grid display.
     """
+    payload = await result_cache.get_or_compute(
+        ("preview", session_id, limit, mode),
+        _in_own_session(
+            db, lambda own_db: _json_payload(_build_preview(own_db, session_id, limit, mode))
+        ),
+    )
+    return payload_response(request, payload)
+
+
+def _build_preview(db: Session, session_id: str, limit: int, mode: str) -> Dict[str, Any]:
     # Initialize services
     session_service = SessionService(db)
     distribution_service = DistributionService(db)
@@ -153,12 +216,12 @@ async def get_results_preview(
         )
 
     # Get limited distributions
-    distributions = distribution_service.get_distributions_by_session(session_id)
-    limited_distributions = distributions[:limit]
+    total_records = distribution_service.count_by_session(session_id)
+    rows = distribution_service.get_result_rows(session_id, limit=limit)
 
     # Preload commitment percentages for displayed investor/fund pairs
-    investor_ids = {dist.investor_id for dist in limited_distributions}
-    fund_codes = {dist.fund_code for dist in limited_distributions}
+    investor_ids = {row.investor_id for row in rows}
+    fund_codes = {row.fund_code for row in rows}
     commitment_map = {}
     if investor_ids and fund_codes:
         commitments = (
@@ -177,38 +240,32 @@ async def get_results_preview(
     # Format for display
     preview_data = []
     results_mode = mode == "results"
-    for dist in limited_distributions:
-        fund = dist.fund
+    for row in rows:
         preview_entry = {
-            "investor_name": dist.investor.investor_name,
-            "entity_type": dist.investor.investor_entity_type.value,
-            "tax_state": dist.investor.investor_tax_state,
-            "jurisdiction": dist.jurisdiction.value,
-            "amount": float(dist.amount),
-            "fund_code": dist.fund_code,
-            "period": f"{fund.period_quarter} {fund.period_year}" if fund else None
+            "investor_name": row.investor_name,
+            "entity_type": row.investor_entity_type.value,
+            "tax_state": row.investor_tax_state.value,
+            "jurisdiction": row.jurisdiction.value,
+            "amount": money_float(row.amount),
+            "fund_code": row.fund_code,
+            "period": (
+                f"{row.period_quarter} {row.period_year}"
+                if row.period_quarter is not None else None
+            )
         }
 
-        commitment_key = (dist.investor_id, dist.fund_code)
+        commitment_key = (row.investor_id, row.fund_code)
         preview_entry["commitment_percentage"] = commitment_map.get(commitment_key)
 
         if results_mode:
-            preview_entry["composite_tax_amount"] = (
-                float(dist.composite_tax_amount)
-                if dist.composite_tax_amount is not None
-                else None
-            )
-            preview_entry["withholding_tax_amount"] = (
-                float(dist.withholding_tax_amount)
-                if dist.withholding_tax_amount is not None
-                else None
-            )
+            preview_entry["composite_tax_amount"] = money_float(row.composite_tax_amount)
+            preview_entry["withholding_tax_amount"] = money_float(row.withholding_tax_amount)
         else:
             preview_entry["composite_exemption"] = (
-                "Yes" if dist.composite_exemption else "No"
+                "Yes" if row.composite_exemption else "No"
             )
             preview_entry["withholding_exemption"] = (
-                "Yes" if dist.withholding_exemption else "No"
+                "Yes" if row.withholding_exemption else "No"
             )
 
         preview_data.append(preview_entry)
@@ -217,18 +274,60 @@ async def get_results_preview(
         "session_id": session_id,
         "status": session.status.value,
         "preview_data": preview_data,
-        "total_records": len(distributions),
+        "total_records": total_records,
         "preview_limit": limit,
         "showing_count": len(preview_data)
     }
 
 
+@router.get("/results/{session_id}/profile")
+async def get_processing_profile(
+    session_id: str,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get the processing profile recorded when the session was uploaded.
+
+    Returns per-stage durations in milliseconds alongside row counts and
+    peak memory, to help explain slow uploads.
+    """
+    session_service = SessionService(db)
+
+    session = session_service.get_session_by_id(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    profile = session_service.get_processing_profile(session_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="No processing profile recorded for session")
+
+    return {
+        "session_id": session_id,
+        "stages_ms": {
+            column[:-len("_ms")]: getattr(profile, column)
+            for column in PROFILE_STAGE_COLUMNS
+        },
+        "total_ms": profile.total_ms,
+        "file_size": profile.file_size,
+        "total_rows": profile.total_rows,
+        "valid_rows": profile.valid_rows,
+        "distribution_count": profile.distribution_count,
+        "peak_memory_kb": profile.peak_memory_kb,
+        "created_at": profile.created_at.isoformat(),
+    }
+
+
 @router.get("/results/{session_id}/report")
 async def download_results_report(
     session_id: str,
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|excel|xlsx)$"),
     db: Session = Depends(get_db)
 ):
-    """Download detailed tax calculation report for auditing."""
+    """Download detailed tax calculation report for auditing.
+
+    Format options: 'csv' (default), 'excel' (alias 'xlsx')
+    """
     session_service = SessionService(db)
     distribution_service = DistributionService(db)
     tax_service = TaxCalculationService(db)
@@ -237,11 +336,46 @@ async def download_results_report(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
+    if format in ("excel", "xlsx"):
+        if not distribution_service.session_has_distributions(session_id):
+            raise HTTPException(status_code=404, detail="No distributions found for session")
+
+        export_service = ExcelExportService(db)
+
+        def write_report(path: Path) -> None:
+            rule_context = tax_service.get_rule_context_for_session(session_id)
+            export_service.write_report_workbook(session_id, path, rule_context)
+
+        # Large sessions take a while to write; keep the event loop serving
+        export_path = await run_in_threadpool(build_xlsx_export, "report", write_report)
+        return xlsx_file_response(
+            export_path, f"tax_calculation_report_{session_id}.xlsx"
+        )
+
+    payload = await result_cache.get_or_compute(
+        ("report", session_id, "csv"),
+        _in_own_session(
+            db, lambda own_db: EncodedPayload(_build_report_csv(own_db, session_id), "text/csv")
+        ),
+    )
+    filename = f"tax_calculation_report_{session_id}.csv"
+    return payload_response(
+        request,
+        payload,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+def _build_report_csv(db: Session, session_id: str) -> bytes:
+    distribution_service = DistributionService(db)
+    tax_service = TaxCalculationService(db)
+
     distributions = distribution_service.get_distributions_by_session(session_id)
     if not distributions:
         raise HTTPException(status_code=404, detail="No distributions found for session")
 
-    rule_context = tax_service.get_rule_context()
+    export_start = time.perf_counter()
+    rule_context = tax_service.get_rule_context_for_session(session_id)
 
     output = io.StringIO()
     writer = csv.writer(output)
@@ -302,28 +436,23 @@ async def download_results_report(
             investor.investor_entity_type.value,
             investor_state,
             dist.jurisdiction.value,
-            f"{dist.amount:.2f}",
+            format_money(dist.amount),
             "Yes" if dist.composite_exemption else "No",
             "Yes" if dist.withholding_exemption else "No",
-            f"{dist.composite_tax_amount:.2f}" if dist.composite_tax_amount is not None else "",
-            f"{dist.withholding_tax_amount:.2f}" if dist.withholding_tax_amount is not None else "",
+            format_money(dist.composite_tax_amount),
+            format_money(dist.withholding_tax_amount),
             applied_tax,
             getattr(composite_rule, "id", ""),
             f"{composite_rule.tax_rate:.4f}" if composite_rule else "",
-            f"{composite_rule.income_threshold:.2f}" if composite_rule else "",
+            format_money(composite_rule.income_threshold) if composite_rule else "",
             getattr(composite_rule, "mandatory_filing", ""),
             getattr(withholding_rule, "id", ""),
             f"{withholding_rule.tax_rate:.4f}" if withholding_rule else "",
-            f"{withholding_rule.income_threshold:.2f}" if withholding_rule else "",
-            f"{withholding_rule.tax_threshold:.2f}" if withholding_rule else "",
+            format_money(withholding_rule.income_threshold) if withholding_rule else "",
+            format_money(withholding_rule.tax_threshold) if withholding_rule else "",
         ])
 
     output.seek(0)
-    filename = f"tax_calculation_report_{session_id}.csv"
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        },
-    )
+    payload = output.getvalue().encode("utf-8")
+    record_export("report", "csv", time.perf_counter() - export_start, len(payload))
+    return payload
@@ -1,27 +1,49 @@
 """SALT Rules API endpoints for upload, validation, preview, and publishing."""
 
 import logging
-import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, date
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
 from ..database.connection import get_db
-from ..services.excel_processor import ExcelProcessor
+from ..services.admission_control import AdmissionRejected, parse_gate
+from ..services.file_service import FileService, spool_to_temp_file
 from ..services.validation_service import ValidationService
-from ..services.file_service import FileService
+from ..services.rule_set_publisher import (
+    RuleSetPublisher,
+    RuleSetPublishError,
+    WorkbookValidationError,
+    resolve_publication_period,
+)
 from ..services.rule_set_service import RuleSetService
+from ..services.tax_calculation_service import invalidate_rule_caches
+from ..services.tax_simulation_service import CandidateRulesError, TaxSimulationService
 from ..models.salt_rule_set import SaltRuleSet, RuleSetStatus
 from ..models.source_file import SourceFile
+from ..models.user_session import UserSession
 from ..models.enums import Quarter
+from ..utils.encoded_payload import (
+    EncodedPayload,
+    PayloadCache,
+    not_modified,
+    payload_response,
+    version_etag,
+)
+from ..utils.fast_json import FastJSONResponse, dumps
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/salt-rules", tags=["SALT Rules"])
 
+# Largest SALT workbook accepted by direct uploads and simulations
+SALT_UPLOAD_MAX_BYTES = 10 * 1024 * 1024
+
+# Rule set detail bodies keyed by ETag; a key's content never changes
+rule_set_payloads = PayloadCache()
+
 
 # Request/Response Models
 class UploadResponse(BaseModel):
@@ -33,6 +55,7 @@ class UploadResponse(BaseModel):
     message: str
     validation_errors: Optional[List[Dict[str, Any]]] = Field(None, alias="validationErrors")
     rule_counts: Optional[Dict[str, int]] = Field(None, alias="ruleCounts")
+    rule_version: Optional[int] = Field(None, alias="ruleVersion")
 
     class Config:
         populate_by_name = True
@@ -55,10 +78,86 @@ class ErrorResponse(BaseModel):
 
 
 
+def publication_period(year: Optional[int], quarter: Optional[str]) -> Tuple[int, Quarter, date]:
+    """``resolve_publication_period`` with invalid periods answered with 400."""
+    try:
+        return resolve_publication_period(year, quarter)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def publish_rule_workbook(
+    db: Session,
+    file_path: Path,
+    filename: str,
+    content_type: str,
+    file_size: int,
+    year: int,
+    quarter: Quarter,
+    effective_date: date,
+    description: Optional[str] = None,
+    max_file_size: Optional[int] = None,
+) -> UploadResponse:
+    """
+    Validate a SALT workbook that is already on disk and publish its rules.
+
+    Shared by the direct upload and the finalize step of chunked uploads.
+    The caller owns ``file_path`` and removes it afterwards.
+    """
+    # Validates the file first and saves nothing when it is invalid, then
+    # stages the rules as a draft and swaps it in for the period's active set
+    publisher = RuleSetPublisher(db, FileService(db, max_file_size=max_file_size))
+    try:
+        published = publisher.publish_workbook(
+            file_path,
+            filename,
+            content_type,
+            year,
+            quarter,
+            effective_date,
+            description=description,
+            created_by="admin@fundflow.com",  # TODO: Get from auth
+        )
+    except WorkbookValidationError as exc:
+        return UploadResponse(
+            rule_set_id="",
+            status="validation_failed",
+            uploaded_file={
+                "filename": filename,
+                "fileSize": file_size,
+                "uploadTimestamp": datetime.now().isoformat() + "Z"
+            },
+            validation_started=False,
+            message="File validation failed",
+            validation_errors=exc.errors
+        )
+    except RuleSetPublishError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return UploadResponse(
+        rule_set_id=published.rule_set.id,
+        status="valid",
+        uploaded_file={
+            "filename": published.source_file.filename,
+            "fileSize": published.source_file.file_size,
+            "uploadTimestamp": published.source_file.upload_timestamp.isoformat() + "Z"
+        },
+        validation_started=True,
+        message="File uploaded and validated successfully",
+        rule_counts={
+            "withholding": published.withholding_count,
+            "composite": published.composite_count
+        },
+        rule_version=published.rule_version
+    )
+
+
 @router.post("/upload", response_model=UploadResponse, response_model_by_alias=True, status_code=201)
-async def upload_salt_rules(
+def upload_salt_rules(
     file: UploadFile = File(...),
     description: Optional[str] = Form(None),
+    year: Optional[int] = Form(None),
+    quarter: Optional[str] = Form(None),
     db: Session = Depends(get_db)
 ) -> UploadResponse:
     """
@@ -66,21 +165,12 @@ async def upload_salt_rules(
 
     Validates the file first, then saves to database only if validation passes.
     Returns validation errors immediately if file is invalid.
+
+    ``year``/``quarter`` publish the rules for a specific (e.g. past) period,
+    effective from the first day of that quarter; by default the current
+    quarter is used, effective today.
     """
-    # Auto-detect current year and quarter
-    current_date = datetime.now()
-    year = current_date.year
-
-    # Determine quarter based on current month
-    month = current_date.month
-    if month <= 3:
-        quarter_enum = Quarter.Q1
-    elif month <= 6:
-        quarter_enum = Quarter.Q2
-    elif month <= 9:
-        quarter_enum = Quarter.Q3
-    else:
-        quarter_enum = Quarter.Q4
+    year, quarter_enum, effective_date = publication_period(year, quarter)
 
     # Basic input validation
     if description and len(description) > 500:
@@ -102,7 +192,7 @@ async def upload_salt_rules(
         )
 
     # Check file size (10MB limit for prototype)
-    if file.size and file.size > 10 * 1024 * 1024:
+    if file.size and file.size > SALT_UPLOAD_MAX_BYTES:
         raise HTTPException(
             status_code=413,
             detail="File size exceeds 10MB limit"
@@ -110,119 +200,26 @@ async def upload_salt_rules(
 
     try:
         # Save uploaded file temporarily for validation
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = Path(temp_file.name)
+        temp_file_path, file_size = spool_to_temp_file(file.file, ".xlsx")
 
         try:
-            # STEP 1: Validate file first (before saving anything)
-            excel_processor = ExcelProcessor()
-            validation_result = excel_processor.validate_file(temp_file_path)
-
-            # If validation fails, return errors immediately without saving anything
-            if not validation_result.is_valid:
-                return UploadResponse(
-                    rule_set_id="",
-                    status="validation_failed",
-                    uploaded_file={
-                        "filename": file.filename,
-                        "fileSize": file.size or 0,
-                        "uploadTimestamp": datetime.now().isoformat() + "Z"
-                    },
-                    validation_started=False,
-                    message="File validation failed",
-                    validation_errors=validation_result.errors
-                )
-
-            # STEP 2: File is valid - archive any existing active rule set
-            # Archive any existing ACTIVE rule set for this year/quarter
-            existing_active_rule_set = db.query(SaltRuleSet).filter(
-                SaltRuleSet.year == year,
-                SaltRuleSet.quarter == quarter_enum,
-                SaltRuleSet.status == RuleSetStatus.ACTIVE
-            ).first()
-
-            if existing_active_rule_set:
-                logger.info(f"Found existing active rule set: {existing_active_rule_set.id}, archiving it")
-                existing_active_rule_set.status = RuleSetStatus.ARCHIVED
-                existing_active_rule_set.archived_at = datetime.now()
-                db.commit()
-                logger.info("Successfully archived existing active rule set")
-
-            # Store file (simple override if exists)
-            file_service = FileService(db)
-            storage_result = file_service.store_uploaded_file(
-                temp_file_path, file.filename, file.content_type or
+            return publish_rule_workbook(
+                db,
+                temp_file_path,
+                file.filename,
+                file.content_type or
                 "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                "admin@fundflow.com",  # TODO: Get from auth
-                year, quarter_enum.value
-            )
-
-            if storage_result.error_message:
-                raise HTTPException(status_code=400, detail=storage_result.error_message)
-
-            # Create new rule set with ACTIVE status
-            rule_set_id = str(uuid4())
-            rule_set = SaltRuleSet(
-                id=rule_set_id,
-                year=year,
-                quarter=quarter_enum,
-                version="1.0.0",
-                status=RuleSetStatus.ACTIVE,
-                effective_date=date.today(),
-                created_at=datetime.now(),
-                created_by="admin@fundflow.com",  # TODO: Get from auth
+                file_size,
+                year,
+                quarter_enum,
+                effective_date,
                 description=description,
-                source_file_id=storage_result.source_file.id,
-                published_at=datetime.now()
-            )
-
-            db.add(rule_set)
-            db.commit()
-            db.refresh(rule_set)
-
-            # Process Excel file and extract rules
-            processing_result = excel_processor.process_file(
-                Path(storage_result.source_file.filepath), rule_set_id
             )
-
-            # Save processed rules
-            for rule in processing_result.withholding_rules:
-                db.add(rule)
-            for rule in processing_result.composite_rules:
-                db.add(rule)
-            for issue in processing_result.validation_issues:
-                db.add(issue)
-
-            # Update rule counts
-            rule_set.rule_count_withholding = len(processing_result.withholding_rules)
-            rule_set.rule_count_composite = len(processing_result.composite_rules)
-
-            db.commit()
-
-            response = UploadResponse(
-                rule_set_id=rule_set_id,
-                status="valid",
-                uploaded_file={
-                    "filename": storage_result.source_file.filename,
-                    "fileSize": storage_result.source_file.file_size,
-                    "uploadTimestamp": storage_result.source_file.upload_timestamp.isoformat() + "Z"
-                },
-                validation_started=True,
-                message="File uploaded and validated successfully",
-                rule_counts={
-                    "withholding": len(processing_result.withholding_rules),
-                    "composite": len(processing_result.composite_rules)
-                }
-            )
-            return response
-
         finally:
             # Clean up temp file
             temp_file_path.unlink(missing_ok=True)
 
-    except HTTPException:
+    except (HTTPException, AdmissionRejected):
         raise
     except Exception as e:
         logger.error(f"Error uploading file: {str(e)}")
@@ -232,6 +229,83 @@ async def upload_salt_rules(
         )
 
 
+@router.post("/simulate")
+def simulate_salt_rules(
+    file: UploadFile = File(...),
+    session_ids: List[str] = Form(...),
+    investor_limit: Optional[int] = Form(None, ge=0),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    What-if run of a candidate SALT workbook against existing sessions.
+
+    The workbook is parsed in memory and the tax logic is run over the
+    sessions' distributions without writing anything; the response compares
+    the candidate amounts with the stored ones per jurisdiction and per
+    investor. ``session_ids`` may be repeated or comma separated.
+    """
+    if not file.filename or not file.filename.lower().endswith(('.xlsx', '.xlsm')):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be Excel format (.xlsx or .xlsm)"
+        )
+
+    if file.size and file.size > SALT_UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail="File size exceeds 10MB limit"
+        )
+
+    requested = list(dict.fromkeys(
+        session_id.strip()
+        for value in session_ids
+        for session_id in value.split(",")
+        if session_id.strip()
+    ))
+    if not requested:
+        raise HTTPException(status_code=400, detail="At least one session id is required")
+
+    found = {
+        session_id
+        for (session_id,) in db.query(UserSession.session_id)
+        .filter(UserSession.session_id.in_(requested))
+    }
+    missing = [session_id for session_id in requested if session_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Sessions not found: {', '.join(missing)}")
+
+    temp_file_path, file_size = spool_to_temp_file(file.file, ".xlsx")
+
+    simulation_service = TaxSimulationService(db)
+    try:
+        # The declared size may be missing; the spooled file's is not
+        if file_size > SALT_UPLOAD_MAX_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail="File size exceeds 10MB limit"
+            )
+        with parse_gate.slot():
+            candidate = simulation_service.load_candidate_rules(temp_file_path)
+    except CandidateRulesError as exc:
+        return {
+            "status": "validation_failed",
+            "message": "Candidate workbook validation failed",
+            "validation_errors": exc.errors,
+        }
+    finally:
+        temp_file_path.unlink(missing_ok=True)
+
+    return {
+        "status": "simulated",
+        "candidate": {
+            "filename": file.filename,
+            "withholding_rules": len(candidate.withholding_rules),
+            "composite_rules": len(candidate.composite_rules),
+        },
+        **simulation_service.simulate(requested, candidate, investor_limit),
+    }
+
+
 @router.get("")
 async def list_rule_sets(
     limit: int = Query(50, le=100),
@@ -288,19 +362,40 @@ async def list_rule_sets(
 
 
 
-@router.get("/{rule_set_id}")
+@router.get("/{rule_set_id}", response_class=FastJSONResponse)
 async def get_rule_set_detail(
     rule_set_id: str,
+    request: Request,
     include_rules: bool = Query(False, description="Include actual rule data in response"),
     db: Session = Depends(get_db)
-) -> Dict[str, Any]:
-    """Get detailed information about a specific rule set."""
+) -> Response:
+    """Get detailed information about a specific rule set.
+
+    Supports ``If-None-Match``; the ETag changes only with the rule set's status.
+    """
     try:
-        # Use RuleSetService to get detailed information
-        rule_set_service = RuleSetService(db)
-        result = rule_set_service.get_rule_set_detail(rule_set_id, include_rules)
+        rule_set = db.get(SaltRuleSet, rule_set_id)
+        if not rule_set:
+            raise ValueError(f"Rule set not found: {rule_set_id}")
+
+        # Rules are never edited after staging; publishing and archiving only
+        # change the status and publication time
+        etag = version_etag(
+            rule_set.id, rule_set.status.value, rule_set.published_at, include_rules
+        )
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        payload = rule_set_payloads.get(etag)
+        if payload is None:
+            # Use RuleSetService to get detailed information
+            rule_set_service = RuleSetService(db)
+            result = rule_set_service.get_rule_set_detail(rule_set_id, include_rules)
+            payload = EncodedPayload(dumps(result), FastJSONResponse.media_type, etag=etag)
+            rule_set_payloads.put(etag, payload)
 
-        return result
+        return payload_response(request, payload)
 
     except ValueError as e:
         raise HTTPException(
@@ -340,6 +435,7 @@ async def delete_rule_set(
         # Use RuleSetService to handle deletion
         rule_set_service = RuleSetService(db)
         rule_set_service.delete_rule_set(rule_set_id)
+        invalidate_rule_caches()
 
         return {
             "message": "Rule set deleted successfully",
@@ -1,14 +1,29 @@
 """Sessions API endpoint for retrieving and managing user upload sessions."""
 
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, Query, HTTPException
+import asyncio
+import os
+import time
+from typing import List, Dict, Any, AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from ..database.connection import get_db
-from ..services.session_service import SessionService
+from ..services.session_service import SessionDeleteError, SessionService
+from ..services.result_cache import result_cache
+from ..services.progress_events import TERMINAL_STATUSES, progress_bus
 from ..models.user_session import UploadStatus
+from ..utils.fast_json import dumps
 
 router = APIRouter()
 
+# Progress streams read the session row this often when no local event arrives
+PROGRESS_POLL_SECONDS = float(os.getenv("PROGRESS_POLL_SECONDS", "1"))
+# Comment lines keep idle streams open through proxies
+PROGRESS_HEARTBEAT_SECONDS = float(os.getenv("PROGRESS_HEARTBEAT_SECONDS", "15"))
+# Streams for a session that does not exist yet give up after this long
+PROGRESS_PENDING_TIMEOUT_SECONDS = float(os.getenv("PROGRESS_PENDING_TIMEOUT_SECONDS", "120"))
+
 
 @router.get("/sessions")
 async def get_sessions(
@@ -103,7 +118,8 @@ async def delete_session(
         Success message
 
     Raises:
-        HTTPException: 404 if session not found or not authorized to delete
+        HTTPException: 404 if session not found or not authorized to delete,
+            409 if a later delta upload superseded the session's distributions
     """
     # Initialize session service
     session_service = SessionService(db)
@@ -112,7 +128,10 @@ async def delete_session(
     user_id = 1
 
     # Attempt to delete the session
-    success = session_service.delete_session(session_id, user_id)
+    try:
+        success = session_service.delete_session(session_id, user_id)
+    except SessionDeleteError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc))
 
     if not success:
         raise HTTPException(
@@ -122,5 +141,95 @@ async def delete_session(
 
     # Commit the transaction
     db.commit()
+    # A deleted delta upload hands the fund's rows back to earlier sessions
+    result_cache.clear()
+
+    return {"message": "Session deleted successfully"}
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+
+def _newer_polled_snapshot(
+    last_sent: Optional[Dict[str, Any]], polled: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """The polled row when it is ahead of what the stream already sent.
+
+    Local events are finer grained than the row, which is only committed at
+    stage boundaries, so a row behind the last local event is ignored.
+    """
+    if polled is None:
+        return None
+    if last_sent is not None and polled["status"] == last_sent["status"] and (
+        polled["progress_percentage"] <= last_sent["progress_percentage"]
+    ):
+        return None
+    return {**(last_sent or {}), "stage": None, **polled}
+
 
-    return {"message": "Session deleted successfully"}
\ No newline at end of file
+async def _progress_events(session_id: str, db: Session, request: Request) -> AsyncIterator[str]:
+    session_service = SessionService(db)
+
+    def read_snapshot() -> Optional[Dict[str, Any]]:
+        try:
+            return session_service.get_progress_snapshot(session_id)
+        finally:
+            # Return the connection to the pool between polls
+            db.rollback()
+
+    started = last_write = time.monotonic()
+    last_sent: Optional[Dict[str, Any]] = None
+    yield f"retry: {int(PROGRESS_POLL_SECONDS * 1000)}\n\n"
+
+    with progress_bus.subscribe(session_id) as events:
+        snapshot = progress_bus.latest(session_id) or await run_in_threadpool(read_snapshot)
+        while True:
+            if snapshot is not None:
+                last_sent = snapshot
+                last_write = time.monotonic()
+                yield _sse("progress", snapshot)
+                if snapshot["status"] in TERMINAL_STATUSES:
+                    return
+            elif last_sent is None and time.monotonic() - started > PROGRESS_PENDING_TIMEOUT_SECONDS:
+                yield _sse("error", {"session_id": session_id, "detail": "Session not found"})
+                return
+            elif time.monotonic() - last_write >= PROGRESS_HEARTBEAT_SECONDS:
+                last_write = time.monotonic()
+                yield ": keep-alive\n\n"
+
+            if await request.is_disconnected():
+                return
+            try:
+                snapshot = await asyncio.wait_for(events.get(), PROGRESS_POLL_SECONDS)
+                # Only the latest snapshot matters to a client that fell behind
+                while not events.empty():
+                    snapshot = events.get_nowait()
+            except asyncio.TimeoutError:
+                # The upload may be running in another worker process
+                polled = await run_in_threadpool(read_snapshot)
+                snapshot = _newer_polled_snapshot(last_sent, polled)
+
+
+@router.get("/sessions/{session_id}/events")
+async def stream_session_events(
+    session_id: str,
+    request: Request,
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream a session's upload progress as server-sent events.
+
+    Each ``progress`` event carries the session's status, progress
+    percentage, row counts, rows processed and stage timings (ms); the stream
+    ends after a completed or failed status. Events come from the upload
+    pipeline in this process; otherwise the session row is polled, which
+    reports stage transitions only. The stream may be opened before the
+    upload starts, using the ``session_id`` passed to the upload.
+    Uploads turned away by admission control report ``queued`` until they
+    are retried under the same ``session_id``.
+    """
+    return StreamingResponse(
+        _progress_events(session_id, db, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
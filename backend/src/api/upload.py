@@ -1,39 +1,48 @@
 """Upload API endpoint for file processing."""
 
+import logging
 import os
-import tempfile
+import shutil
+import time
+import uuid
 from pathlib import Path
-from typing import Any, Dict
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..database.connection import get_db
 from ..services.user_service import UserService
 from ..services.session_service import SessionService
-from ..services.excel_service import ExcelService
+from ..services.excel_service import MAX_FILE_SIZE, ExcelService, ExcelValidationError
 from ..services.investor_service import InvestorService
 from ..services.distribution_service import DistributionService
 from ..services.fund_service import FundService
 from ..services.tax_calculation_service import TaxCalculationService
+from ..services.validation_service import ValidationService
+from ..services.file_service import spool_to_temp_file
+from ..services.result_cache import result_cache
+from ..services.admission_control import AdmissionRejected, parse_gate, persist_gate
+from ..services.progress_events import UploadProgress
 from ..models.user_session import UploadStatus
+from ..models.validation_error import ErrorSeverity
+from ..monitoring.instrumentation import StageAccumulator, timed_stage
+from ..monitoring.profiling import build_profile_fields
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Validate-only uploads stop checking rows after this many errors
+VALIDATION_MAX_ERRORS = int(os.getenv("VALIDATION_MAX_ERRORS", "100"))
 
-@router.post("/upload")
-async def upload_file(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
-) -> Dict[str, Any]:
-    """
-    Upload and process Excel file (v1.3 format).
+SESSION_ID_PATTERN = r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
 
-    Returns session information and processing status.
-    """
-    # Validate file type (Excel only)
-    if not file.filename or not file.filename.lower().endswith(('.xlsx', '.xls')):
+
+def _check_upload_file(file: UploadFile) -> None:
+    """Reject unsupported file types and oversized uploads."""
+    # Validate file type (Excel or CSV)
+    if not file.filename or not file.filename.lower().endswith(('.xlsx', '.xls', '.csv')):
         raise HTTPException(
             status_code=415,
-            detail="Unsupported file type. Only .xlsx and .xls files are allowed."
+            detail="Unsupported file type. Only .xlsx, .xls and .csv files are allowed."
         )
 
     # Validate file size (10MB limit)
@@ -43,97 +52,222 @@ async def upload_file(
             detail="File too large. Maximum size is 10MB."
         )
 
+
+def _format_error(error: ExcelValidationError) -> str:
+    """Render a validation error as a single user-facing line."""
+    error_detail = f"Row {error.row_number}, {error.column_name}: {error.error_message}"
+    if error.field_value:
+        error_detail += f" (Value: '{error.field_value}')"
+    return error_detail
+
+
+# Sync endpoints: parsing and saving block, so they run in the thread pool
+# where the admission gates bound how many uploads proceed at once
+@router.post("/upload")
+def upload_file(
+    file: UploadFile = File(...),
+    mode: str = Query("full", pattern="^(full|delta)$"),
+    session_id: Optional[str] = Query(None, pattern=SESSION_ID_PATTERN),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Upload and process an Excel or CSV file (v1.3 format).
+
+    ``mode=delta`` reconciles a re-uploaded fund period against its stored
+    distributions instead of inserting every row, and recalculates taxes only
+    for inserted or changed rows.
+
+    A client-generated ``session_id`` lets the client follow the upload on
+    ``/sessions/{session_id}/events`` while this request is processed.
+
+    Returns session information and processing status.
+    """
+    _check_upload_file(file)
+
+    upload_start = time.perf_counter()
+    temp_file_path, file_size = spool_to_temp_file(file.file, Path(file.filename).suffix)
+    try:
+        return process_distribution_upload(
+            db, temp_file_path, file.filename, file_size, mode,
+            upload_start=upload_start, session_id=session_id,
+        )
+    finally:
+        # Clean up temporary file
+        if temp_file_path.exists():
+            os.unlink(temp_file_path)
+
+
+def process_distribution_upload(
+    db: Session,
+    file_path: Path,
+    filename: str,
+    file_size: int,
+    mode: str = "full",
+    upload_start: Optional[float] = None,
+    max_file_size: int = MAX_FILE_SIZE,
+    session_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Parse, validate and save a distribution file that is already on disk.
+
+    Shared by the direct upload and the finalize step of chunked uploads.
+    The caller owns ``file_path`` and removes it afterwards. Progress is
+    published for ``session_id`` (generated when not given) as it advances.
+    """
+    if upload_start is None:
+        upload_start = time.perf_counter()
+    # Clients may be following a session id they chose on another worker
+    client_session_id = session_id is not None
+    if session_id is None:
+        session_id = str(uuid.uuid4())
+    else:
+        existing = SessionService(db).get_session_by_id(session_id)
+        if existing is not None:
+            if existing.status != UploadStatus.QUEUED:
+                raise HTTPException(status_code=409, detail=f"Session {session_id} already exists")
+            # Left by an attempt turned away by admission control; the
+            # retry takes over its id
+            db.delete(existing)
+            db.flush()
+
+    progress = UploadProgress(session_id)
+    persist_start = None
     try:
         # Initialize services
         user_service = UserService(db)
         session_service = SessionService(db)
-        excel_service = ExcelService()
+        excel_service = ExcelService(max_file_size)
         investor_service = InvestorService(db)
         fund_service = FundService(db)
         distribution_service = DistributionService(db)
         tax_calculation_service = TaxCalculationService(db)
+        validation_service = ValidationService(db)
 
-        # Save uploaded file temporarily for validation
-        file_extension = Path(file.filename).suffix
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = Path(temp_file.name)
-
-        try:
-            # Parse and validate Excel file BEFORE creating any database entries
+        # Parse and validate Excel file BEFORE creating any database entries
+        with parse_gate.slot():
+            progress.stage(UploadStatus.PARSING, 10, stage="parsing")
             parsing_result = excel_service.parse_excel_file(
-                temp_file_path, file.filename
+                file_path, filename
             )
+        progress.stage(
+            UploadStatus.VALIDATING,
+            40,
+            stage="validating",
+            stage_timings=parsing_result.stage_timings,
+            total_rows=parsing_result.total_rows,
+            valid_rows=parsing_result.valid_rows,
+        )
+
+        # Everything below writes to the database
+        persist_gate.acquire()
+        persist_start = time.perf_counter()
 
-            # Check for blocking validation errors
-            blocking_errors = [error for error in parsing_result.errors
-                             if error.severity.value == "ERROR"]
-
-            if blocking_errors:
-                # Clean up temp file
-                if temp_file_path.exists():
-                    os.unlink(temp_file_path)
-
-                # Return detailed error response without saving anything
-                error_details = []
-                for error in blocking_errors:
-                    error_detail = f"Row {error.row_number}, {error.column_name}: {error.error_message}"
-                    if error.field_value:
-                        error_detail += f" (Value: '{error.field_value}')"
-                    error_details.append(error_detail)
-
-                return {
-                    "status": "validation_failed",
-                    "message": "File validation failed. Please fix the following errors and try again:",
-                    "errors": error_details,
-                    "error_count": len(blocking_errors),
-                    "total_rows": parsing_result.total_rows
-                }
-
-            # File is valid - now proceed with saving and processing
-            # Get or create default user
+        # Check for blocking validation errors
+        errors = parsing_result.errors
+        blocking_count = errors.severity_counts[ErrorSeverity.ERROR]
+
+        if blocking_count:
+            # Record the failed session and its errors so they can be
+            # reviewed and downloaded; no investor data is saved
             user = user_service.get_or_create_default_user()
+            failed_session = session_service.create_session(
+                user_id=user.id,
+                upload_filename=file_path.name,
+                original_filename=filename,
+                file_size=file_size,
+                session_id=session_id,
+            )
+            validation_service.save_errors(failed_session.session_id, errors)
+            session_service.update_session_counts(
+                failed_session.session_id,
+                parsing_result.total_rows,
+                parsing_result.valid_rows
+            )
+            session_service.update_session_status(
+                failed_session.session_id,
+                UploadStatus.FAILED_VALIDATION,
+                error_message=f"{blocking_count} validation errors"
+            )
+            db.commit()
+            progress.stage(
+                UploadStatus.FAILED_VALIDATION,
+                100,
+                stage="done",
+                error_message=f"{blocking_count} validation errors",
+            )
 
+            # Only the first errors of each code are listed, counts are exact
+            error_details = [
+                _format_error(error) for error in errors.of_severity(ErrorSeverity.ERROR)
+            ]
 
-            # TODO: Configure S3 storage for production
-            # Save raw uploaded file permanently (local storage for now)
-            upload_dir = Path("data/uploads")
-            upload_dir.mkdir(parents=True, exist_ok=True)
-            saved_file_path = upload_dir / f"{user.id}_{file.filename}"
+            return {
+                "session_id": failed_session.session_id,
+                "status": "validation_failed",
+                "message": "File validation failed. Please fix the following errors and try again:",
+                "errors": error_details,
+                "error_count": blocking_count,
+                "error_counts": dict(errors.counts),
+                "truncated": errors.truncated,
+                "total_rows": parsing_result.total_rows
+            }
 
-            # Save the raw file content permanently
-            with open(saved_file_path, 'wb') as saved_file:
-                saved_file.write(content)
+        # File is valid - now proceed with saving and processing
+        # Get or create default user
+        user = user_service.get_or_create_default_user()
 
-            # Create session in database
-            session = session_service.create_session(
-                user_id=user.id,
-                upload_filename=temp_file_path.name,
-                original_filename=file.filename,
-                file_size=file.size or 0
-            )
 
-            # Process valid data
-            distributions_created = 0
-            try:
-                fund = fund_service.get_or_create_fund(
-                    parsing_result.fund_info['fund_code'],
-                    parsing_result.fund_info['period_quarter'],
-                    int(parsing_result.fund_info['period_year']),
-                )
-            except ValueError as exc:
-                raise HTTPException(status_code=400, detail=str(exc)) from exc
+        # TODO: Configure S3 storage for production
+        # Save raw uploaded file permanently (local storage for now)
+        upload_dir = Path("data/uploads")
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        saved_file_path = upload_dir / f"{user.id}_{filename}"
+
+        # Save the raw file permanently
+        shutil.copyfile(file_path, saved_file_path)
 
-            for row_data in parsing_result.data:
+        # Create session in database; committed before any data so other
+        # workers streaming its progress see the SAVING stage
+        session = session_service.create_session(
+            user_id=user.id,
+            upload_filename=file_path.name,
+            original_filename=filename,
+            file_size=file_size,
+            session_id=session_id,
+        )
+        session_service.update_session_counts(
+            session.session_id,
+            parsing_result.total_rows,
+            parsing_result.valid_rows
+        )
+        session_service.update_session_status(session.session_id, UploadStatus.SAVING, 50)
+        db.commit()
+        progress.stage(UploadStatus.SAVING, 50, stage="investor_rows")
+
+        # Process valid data
+        distributions_created = 0
+        try:
+            fund = fund_service.get_or_create_fund(
+                parsing_result.fund_info['fund_code'],
+                parsing_result.fund_info['period_quarter'],
+                int(parsing_result.fund_info['period_year']),
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        stages = StageAccumulator()
+        investor_rows = []
+        for row_number, row_data in enumerate(parsing_result.data, 1):
+            progress.rows(row_number, len(parsing_result.data), 50, 80)
+            with stages.track("investor_resolution"):
                 # Find or create investor
                 investor = investor_service.find_or_create_investor(
-                    row_data['investor_name'],
-                    row_data['investor_entity_type'],
-                    row_data['investor_tax_state']
+                    row_data.investor_name,
+                    row_data.investor_entity_type,
+                    row_data.investor_tax_state
                 )
 
-                commitment_percentage = row_data.get('commitment_percentage')
+                commitment_percentage = row_data.commitment_percentage
                 if commitment_percentage is not None:
                     investor_service.upsert_commitment(
                         investor=investor,
@@ -141,6 +275,11 @@ async def upload_file(
                         commitment_percentage=commitment_percentage,
                     )
 
+            if mode == "delta":
+                investor_rows.append((investor.id, row_data))
+                continue
+
+            with stages.track("distribution_insert"):
                 # Create distributions
                 distributions = distribution_service.create_distributions_for_investor(
                     investor=investor,
@@ -148,47 +287,96 @@ async def upload_file(
                     fund=fund,
                     parsed_row=row_data
                 )
-                distributions_created += len(distributions)
+            distributions_created += len(distributions)
 
-            # Apply SALT tax calculations before finalizing
+        delta = None
+        with stages.track("distribution_insert"):
+            if mode == "delta":
+                delta = distribution_service.apply_delta(fund, session.session_id, investor_rows)
+                distributions_created = len(delta.inserted_ids)
             db.flush()
-            tax_calculation_service.apply_for_session(session.session_id)
 
-            # Commit all changes
-            db.commit()
+        # Keep the file's warnings with the session
+        validation_service.save_errors(session.session_id, errors)
 
-            # Update session counts and mark as completed
-            session_service.update_session_counts(
-                session.session_id,
-                parsing_result.total_rows,
-                parsing_result.valid_rows
-            )
-            session_service.update_session_status(
-                session.session_id, UploadStatus.COMPLETED, 100
-            )
+        # Apply SALT tax calculations before finalizing
+        stage_seconds = {**parsing_result.stage_timings, **stages.flush()}
+        progress.stage(UploadStatus.SAVING, 80, stage="tax_calculation", stage_timings=stage_seconds)
+        tax_start = time.perf_counter()
+        if delta is not None:
+            tax_calculation_service.apply_for_distributions(delta.touched_ids)
+        else:
+            tax_calculation_service.apply_for_session(session.session_id)
+        stage_seconds["tax_apply_for_session"] = time.perf_counter() - tax_start
+
+        # Commit all changes
+        commit_start = time.perf_counter()
+        with timed_stage("upload_commit"):
             db.commit()
+        stage_seconds["upload_commit"] = time.perf_counter() - commit_start
 
-            return {
-                "session_id": session.session_id,
-                "status": UploadStatus.COMPLETED.value,
-                "message": "File processed successfully",
-                "total_rows": parsing_result.total_rows,
-                "valid_rows": parsing_result.valid_rows,
-                "distributions_created": distributions_created,
-                "fund_info": parsing_result.fund_info,
-                "warning_count": len([e for e in parsing_result.errors if e.severity.value == "WARNING"])
-            }
+        # Update session counts and mark as completed
+        session_service.update_session_counts(
+            session.session_id,
+            parsing_result.total_rows,
+            parsing_result.valid_rows
+        )
+        session_service.update_session_status(
+            session.session_id, UploadStatus.COMPLETED, 100
+        )
+        session_service.save_processing_profile(
+            session.session_id,
+            build_profile_fields(
+                stage_seconds,
+                time.perf_counter() - upload_start,
+                file_size=file_size,
+                total_rows=parsing_result.total_rows,
+                valid_rows=parsing_result.valid_rows,
+                distribution_count=distributions_created,
+            ),
+        )
+        db.commit()
+        if delta is not None:
+            # Rows of earlier sessions for this fund moved to the new session
+            result_cache.clear()
+        else:
+            result_cache.invalidate_session(session.session_id)
+        progress.stage(
+            UploadStatus.COMPLETED,
+            100,
+            stage="done",
+            stage_timings=stage_seconds,
+            distributions_created=distributions_created,
+        )
 
-        finally:
-            # Clean up temporary file
-            if temp_file_path.exists():
-                os.unlink(temp_file_path)
+        response = {
+            "session_id": session.session_id,
+            "status": UploadStatus.COMPLETED.value,
+            "message": "File processed successfully",
+            "total_rows": parsing_result.total_rows,
+            "valid_rows": parsing_result.valid_rows,
+            "distributions_created": distributions_created,
+            "fund_info": parsing_result.fund_info,
+            "warning_count": parsing_result.errors.severity_counts[ErrorSeverity.WARNING]
+        }
+        if delta is not None:
+            response["delta"] = delta.summary()
+        return response
 
+    except AdmissionRejected as exc:
+        # Not terminal: the client may retry with the same session id
+        progress.stage(UploadStatus.QUEUED, 0, stage="admission_rejected", error_message=str(exc))
+        if client_session_id:
+            _record_early_status(
+                db, session_id, file_path, filename, file_size, UploadStatus.QUEUED, str(exc)
+            )
+        raise
     except Exception as e:
         db.rollback()
         # Try to update session status if session was created
+        session_created = 'session' in locals()
         try:
-            if 'session' in locals():
+            if session_created:
                 session_service.update_session_status(
                     session.session_id,
                     UploadStatus.FAILED_SAVING,
@@ -197,8 +385,98 @@ async def upload_file(
                 db.commit()
         except:
             pass
+        if not session_created and client_session_id:
+            _record_early_status(
+                db, session_id, file_path, filename, file_size, UploadStatus.FAILED_PARSING, str(e)
+            )
+        progress.stage(
+            UploadStatus.FAILED_SAVING if session_created else UploadStatus.FAILED_PARSING,
+            100,
+            stage="done",
+            error_message=str(e),
+        )
 
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
+    finally:
+        if persist_start is not None:
+            persist_gate.release(time.perf_counter() - persist_start)
+
+
+def _record_early_status(
+    db: Session,
+    session_id: str,
+    file_path: Path,
+    filename: str,
+    file_size: int,
+    status: UploadStatus,
+    error_message: str,
+) -> None:
+    """Save the status of an upload that ended before its session row existed.
+
+    Progress streams served by other workers only see the session row; without
+    it they would wait for a session that never appears.
+    """
+    try:
+        # Also restores a queued row left by an earlier attempt
+        db.rollback()
+        session_service = SessionService(db)
+        if session_service.get_session_by_id(session_id) is None:
+            user = UserService(db).get_or_create_default_user()
+            session_service.create_session(
+                user_id=user.id,
+                upload_filename=file_path.name,
+                original_filename=filename,
+                file_size=file_size,
+                session_id=session_id,
+            )
+        session_service.update_session_status(
+            session_id,
+            status,
+            0 if status == UploadStatus.QUEUED else 100,
+            error_message=error_message,
+        )
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.warning(f"Could not record status {status.value} for session {session_id}: {exc}")
+
+
+@router.post("/upload/validate")
+def validate_upload(
+    file: UploadFile = File(...),
+    max_errors: int = Query(VALIDATION_MAX_ERRORS, ge=1, le=10000),
+) -> Dict[str, Any]:
+    """
+    Dry-run validation of an upload without saving anything.
+
+    Header problems are reported without reading the data rows, and row
+    checks stop after ``max_errors`` errors. Errors are summarized as
+    per-code counts plus the first ``max_errors`` messages.
+    """
+    _check_upload_file(file)
+
+    start = time.perf_counter()
+    temp_file_path, _ = spool_to_temp_file(file.file, Path(file.filename).suffix)
+
+    try:
+        with parse_gate.slot():
+            result = ExcelService().validate_file(temp_file_path, file.filename, max_errors)
+    finally:
+        if temp_file_path.exists():
+            os.unlink(temp_file_path)
+
+    errors = result.errors
+    return {
+        "status": "validation_failed" if errors.severity_counts[ErrorSeverity.ERROR] else "valid",
+        "fund_info": result.fund_info,
+        "total_rows": result.total_rows,
+        "valid_rows": result.valid_rows,
+        "error_count": errors.total,
+        "error_counts": dict(errors.counts),
+        "truncated": errors.limit_reached,
+        "errors": [_format_error(error) for error in errors],
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
@@ -0,0 +1 @@
+"""Command-line entry points run against the configured database."""
@@ -0,0 +1,528 @@
+"""Offline batch processing of quarter-end distribution workbooks.
+
+Usage (from ``backend/``)::
+
+    python -m src.cli.batch ../data/quarter-end --salt-matrix "SALT Matrix_v1.2.xlsx"
+    python -m src.cli.batch ../data/quarter-end --workers 8 --resume
+
+Every "(Input Data) ..." workbook in the directory is parsed in a process
+pool with ``ExcelService``. The main process saves each file as an upload
+session through bulk inserts and applies taxes to batches of sessions, each
+fund period with one shared rule context. A SALT matrix, when given, is
+published first for the period of the input files (or ``--year``/``--quarter``).
+Runs directly against the configured ``DATABASE_URL``.
+
+Progress is appended to a manifest in the input directory. With ``--resume``
+files already processed with the same content are skipped, and a file whose
+session was saved but not yet taxed is taxed without being saved again.
+
+Exits with status 1 when any file failed.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..database.connection import SessionLocal, init_db
+from ..models.user_session import UploadStatus
+from ..models.validation_error import ErrorSeverity
+from ..monitoring.instrumentation import StageAccumulator
+from ..monitoring.profiling import build_profile_fields
+from ..services.distribution_service import DistributionService
+from ..services.excel_service import (
+    FILENAME_PATTERN,
+    MAX_FILE_SIZE,
+    ExcelParsingResult,
+    ExcelService,
+)
+from ..services.fund_service import FundService
+from ..services.investor_service import InvestorService
+from ..services.rule_set_publisher import (
+    RuleSetPublisher,
+    RuleSetPublishError,
+    WorkbookValidationError,
+    resolve_publication_period,
+)
+from ..services.session_service import SessionService
+from ..services.tax_calculation_service import TaxCalculationService
+from ..services.user_service import UserService
+from ..services.validation_service import ValidationService
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".fundflow-batch.jsonl"
+HASH_BLOCK_BYTES = 1024 * 1024
+
+SALT_CONTENT_TYPES = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".xlsm": "application/vnd.ms-excel.sheet.macroEnabled.12",
+}
+
+# Manifest statuses of a file that needs no more work
+DONE_STATUSES = frozenset({"completed", "failed_validation"})
+
+
+@dataclass
+class ParsedFile:
+    """A workbook parsed in a worker process."""
+
+    path: Path
+    result: Optional[ExcelParsingResult]
+    error: Optional[str]
+    parse_seconds: float
+
+
+@dataclass
+class BatchSummary:
+    """Counts and timings of one batch run."""
+
+    files: int = 0
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    rows: int = 0
+    distributions: int = 0
+    wall_seconds: float = 0.0
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_file(path: Path, max_file_size: int = MAX_FILE_SIZE) -> ParsedFile:
+    """Parse one workbook; runs in the worker processes."""
+    start = time.perf_counter()
+    try:
+        result = ExcelService(max_file_size=max_file_size).parse_excel_file(path, path.name)
+        error = None
+    except Exception as exc:
+        result, error = None, str(exc) or exc.__class__.__name__
+    return ParsedFile(path, result, error, time.perf_counter() - start)
+
+
+def parse_files(
+    paths: Sequence[Path], workers: int, max_file_size: int = MAX_FILE_SIZE
+) -> Iterator[ParsedFile]:
+    """Parse ``paths`` in a process pool, yielding results in input order.
+
+    At most two files per worker are in flight, so parsed files do not pile
+    up in memory while the caller saves them.
+    """
+    if workers <= 1:
+        for path in paths:
+            yield parse_file(path, max_file_size)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        remaining = iter(paths)
+        pending = deque(
+            pool.submit(parse_file, path, max_file_size)
+            for path in islice(remaining, workers * 2)
+        )
+        while pending:
+            parsed = pending.popleft().result()
+            for path in islice(remaining, 1):
+                pending.append(pool.submit(parse_file, path, max_file_size))
+            yield parsed
+
+
+class Manifest:
+    """Append-only JSON lines record of processed files; the last entry per file wins."""
+
+    def __init__(self, path: Path, resume: bool) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if resume and path.exists():
+            for line in path.read_text().splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by the interruption
+                    continue
+                self.entries[entry["file"]] = entry
+        self._file = open(path, "a" if resume else "w")
+
+    def get(self, name: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """The entry for ``name`` if it was recorded for the same content."""
+        entry = self.entries.get(name)
+        if entry is None or entry.get("sha256") != sha256:
+            return None
+        return entry
+
+    def record(self, name: str, sha256: str, status: str, **fields: Any) -> None:
+        entry = {"file": name, "sha256": sha256, "status": status, **fields}
+        self.entries[name] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BatchProcessor:
+    """Saves parsed workbooks as sessions and taxes them in batches."""
+
+    def __init__(
+        self,
+        db: Session,
+        manifest: Manifest,
+        stages: StageAccumulator,
+        summary: BatchSummary,
+        tax_batch_size: int,
+    ) -> None:
+        self.db = db
+        self.manifest = manifest
+        self.stages = stages
+        self.summary = summary
+        self.tax_batch_size = tax_batch_size
+        self.session_service = SessionService(db)
+        self.validation_service = ValidationService(db)
+        self.user_id = UserService(db).get_or_create_default_user().id
+        db.commit()
+        # session id -> (file name, sha256, profile fields) awaiting taxes
+        self._untaxed: Dict[str, Tuple[str, str, Dict[str, Any]]] = {}
+
+    def resume_saved(self, name: str, sha256: str, session_id: str) -> bool:
+        """Pick up a file whose session was saved before the interruption.
+
+        Returns False when the session never reached the database and the
+        file has to be saved again.
+        """
+        session = self.session_service.get_session_by_id(session_id)
+        if session is None:
+            return False
+        if session.status == UploadStatus.COMPLETED:
+            # Interrupted between the commit and the manifest entry
+            self.manifest.record(name, sha256, "completed", session_id=session_id)
+            self.summary.skipped += 1
+        else:
+            self._queue_for_taxes(session_id, name, sha256, {})
+        return True
+
+    def save(self, parsed: ParsedFile, sha256: str) -> None:
+        """Save one parsed file as an upload session."""
+        name = parsed.path.name
+        result = parsed.result
+        if result is None:
+            logger.error(f"Could not parse {name}: {parsed.error}")
+            self.manifest.record(name, sha256, "failed", error=parsed.error)
+            self.summary.failed += 1
+            return
+
+        self.summary.rows += result.total_rows
+        file_size = parsed.path.stat().st_size
+        session = self.session_service.create_session(
+            user_id=self.user_id,
+            upload_filename=name,
+            original_filename=name,
+            file_size=file_size,
+        )
+        session_id = session.session_id
+        self.session_service.update_session_counts(session_id, result.total_rows, result.valid_rows)
+
+        blocking_count = result.errors.severity_counts[ErrorSeverity.ERROR]
+        if blocking_count:
+            # Keep the failed session and its errors for review, as uploads do
+            self.validation_service.save_errors(session_id, result.errors)
+            self.session_service.update_session_status(
+                session_id,
+                UploadStatus.FAILED_VALIDATION,
+                error_message=f"{blocking_count} validation errors",
+            )
+            self.db.commit()
+            logger.warning(f"{name}: {blocking_count} validation errors")
+            self.manifest.record(name, sha256, "failed_validation", session_id=session_id)
+            self.summary.failed += 1
+            return
+
+        # Recorded before the commit: a resumed run finds the session in the
+        # database, or knows the file was never saved
+        self.manifest.record(name, sha256, "saved", session_id=session_id)
+        try:
+            self.session_service.update_session_status(session_id, UploadStatus.SAVING, 50)
+            distribution_count, save_seconds = self._save_rows(session_id, result)
+            self.validation_service.save_errors(session_id, result.errors)
+            with self.stages.track("upload_commit"):
+                self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            logger.error(f"Could not save {name}: {exc}")
+            self.manifest.record(name, sha256, "failed", error=str(exc))
+            self.summary.failed += 1
+            return
+
+        self.summary.distributions += distribution_count
+        profile = build_profile_fields(
+            {**result.stage_timings, **save_seconds},
+            parsed.parse_seconds + sum(save_seconds.values()),
+            file_size=file_size,
+            total_rows=result.total_rows,
+            valid_rows=result.valid_rows,
+            distribution_count=distribution_count,
+        )
+        self._queue_for_taxes(session_id, name, sha256, profile)
+
+    def _save_rows(self, session_id: str, result: ExcelParsingResult) -> Tuple[int, Dict[str, float]]:
+        """Bulk insert a file's investors, commitments and distributions."""
+        investor_service = InvestorService(self.db)
+        file_stages = StageAccumulator()
+        fund = FundService(self.db).get_or_create_fund(
+            result.fund_info["fund_code"],
+            result.fund_info["period_quarter"],
+            int(result.fund_info["period_year"]),
+        )
+
+        with file_stages.track("investor_resolution"):
+            investor_ids = investor_service.resolve_investor_ids(
+                (row.investor_name, row.investor_entity_type, row.investor_tax_state)
+                for row in result.data
+            )
+            investor_rows = [
+                (
+                    investor_ids[(row.investor_name, row.investor_entity_type, row.investor_tax_state)],
+                    row,
+                )
+                for row in result.data
+            ]
+            investor_service.bulk_upsert_commitments(
+                fund,
+                {
+                    investor_id: row.commitment_percentage
+                    for investor_id, row in investor_rows
+                    if row.commitment_percentage is not None
+                },
+            )
+
+        with file_stages.track("distribution_insert"):
+            distribution_count = DistributionService(self.db).bulk_create_distributions(
+                fund, session_id, investor_rows
+            )
+
+        for stage, seconds in file_stages.totals.items():
+            self.stages.add(stage, seconds)
+        return distribution_count, file_stages.totals
+
+    def _queue_for_taxes(
+        self, session_id: str, name: str, sha256: str, profile: Dict[str, Any]
+    ) -> None:
+        self._untaxed[session_id] = (name, sha256, profile)
+        if len(self._untaxed) >= self.tax_batch_size:
+            self.apply_taxes()
+
+    def apply_taxes(self) -> None:
+        """Tax the saved sessions together and mark them completed."""
+        if not self._untaxed:
+            return
+        session_ids = list(self._untaxed)
+        with self.stages.track("tax_apply_for_sessions"):
+            TaxCalculationService(self.db).apply_for_sessions(session_ids)
+        for session_id, (_, _, profile) in self._untaxed.items():
+            self.session_service.update_session_status(session_id, UploadStatus.COMPLETED, 100)
+            if profile:
+                self.session_service.save_processing_profile(session_id, profile)
+        with self.stages.track("upload_commit"):
+            self.db.commit()
+
+        for session_id, (name, sha256, _) in self._untaxed.items():
+            self.manifest.record(name, sha256, "completed", session_id=session_id)
+        self.summary.completed += len(session_ids)
+        self._untaxed.clear()
+
+
+def publish_salt_matrix(
+    db: Session,
+    path: Path,
+    manifest: Manifest,
+    year: int,
+    quarter: str,
+) -> bool:
+    """Publish the SALT matrix for the period unless this content already was."""
+    sha256 = file_sha256(path)
+    if manifest.get(path.name, sha256) is not None:
+        logger.info(f"{path.name} already published; skipping")
+        return True
+    if path.suffix.lower() not in SALT_CONTENT_TYPES:
+        logger.error(f"{path.name}: SALT matrices must be .xlsx or .xlsm files")
+        return False
+
+    try:
+        year, quarter_enum, effective_date = resolve_publication_period(year, quarter)
+        published = RuleSetPublisher(db).publish_workbook(
+            path,
+            path.name,
+            SALT_CONTENT_TYPES[path.suffix.lower()],
+            year,
+            quarter_enum,
+            effective_date,
+            description=f"Batch publish of {path.name}",
+        )
+    except WorkbookValidationError as exc:
+        for error in exc.errors:
+            logger.error(f"{path.name}: {error}")
+        return False
+    except (RuleSetPublishError, ValueError) as exc:
+        logger.error(f"Could not publish {path.name}: {exc}")
+        return False
+
+    manifest.record(path.name, sha256, "published", rule_set_id=published.rule_set.id)
+    return True
+
+
+def input_files(directory: Path) -> List[Path]:
+    """Workbooks in ``directory`` named like distribution inputs, in name order."""
+    return sorted(
+        path for path in directory.iterdir()
+        if path.is_file() and FILENAME_PATTERN.match(path.name)
+    )
+
+
+def input_period(paths: Sequence[Path]) -> Optional[Tuple[int, str]]:
+    """The one (year, quarter) of the input file names, if they share one."""
+    periods = set()
+    for path in paths:
+        _, quarter, year, _ = FILENAME_PATTERN.match(path.name).groups()
+        periods.add((int(year), f"Q{quarter}"))
+    return periods.pop() if len(periods) == 1 else None
+
+
+def run_batch(
+    args: argparse.Namespace,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> Tuple[BatchSummary, Dict[str, float]]:
+    """Process the input directory; returns the summary and per-stage seconds."""
+    start = time.perf_counter()
+    summary = BatchSummary()
+    stages = StageAccumulator()
+    paths = input_files(args.directory)
+    summary.files = len(paths)
+    manifest = Manifest(args.manifest or args.directory / MANIFEST_NAME, args.resume)
+    db = session_factory()
+    try:
+        if args.salt_matrix is not None:
+            if args.year is not None:
+                period = (args.year, args.quarter)
+            else:
+                period = input_period(paths)
+            if period is None:
+                logger.error("Input files span several periods; pass --year and --quarter")
+                summary.failed += 1
+                return summary, stages.totals
+            with stages.track("salt_publish"):
+                published = publish_salt_matrix(db, args.salt_matrix, manifest, *period)
+            if not published:
+                summary.failed += 1
+                return summary, stages.totals
+
+        processor = BatchProcessor(db, manifest, stages, summary, args.tax_batch_size)
+        pending: List[Path] = []
+        hashes: Dict[Path, str] = {}
+        with stages.track("hash"):
+            for path in paths:
+                sha256 = hashes[path] = file_sha256(path)
+                entry = manifest.get(path.name, sha256)
+                if entry is not None and entry["status"] in DONE_STATUSES:
+                    summary.skipped += 1
+                elif entry is not None and entry["status"] == "saved" and processor.resume_saved(
+                    path.name, sha256, entry["session_id"]
+                ):
+                    continue
+                else:
+                    pending.append(path)
+        if summary.skipped:
+            logger.info(f"Resuming: {summary.skipped} of {len(paths)} files already processed")
+
+        parsed_files = parse_files(pending, args.workers, args.max_file_size)
+        while True:
+            wait_start = time.perf_counter()
+            parsed = next(parsed_files, None)
+            stages.add("parse_wait", time.perf_counter() - wait_start)
+            if parsed is None:
+                break
+            stages.add("parse", parsed.parse_seconds)
+            processor.save(parsed, hashes[parsed.path])
+        processor.apply_taxes()
+    finally:
+        db.close()
+        manifest.close()
+        summary.wall_seconds = time.perf_counter() - start
+    return summary, stages.totals
+
+
+def format_summary(summary: BatchSummary, stage_seconds: Dict[str, float]) -> str:
+    processed = summary.completed + summary.failed
+    wall = max(summary.wall_seconds, 1e-9)
+    lines = [
+        f"{'files':30s} {summary.files:10d}",
+        f"{'skipped (already processed)':30s} {summary.skipped:10d}",
+        f"{'completed':30s} {summary.completed:10d}",
+        f"{'failed':30s} {summary.failed:10d}",
+        f"{'rows':30s} {summary.rows:10d}",
+        f"{'distributions':30s} {summary.distributions:10d}",
+        f"{'wall time':30s} {summary.wall_seconds:10.2f} s",
+        f"{'files/s':30s} {processed / wall:10.2f}",
+        f"{'rows/s':30s} {summary.rows / wall:10.2f}",
+        "",
+    ]
+    # parse is summed over the worker processes; parse_wait is the time the
+    # main process waited for them
+    for stage, seconds in sorted(stage_seconds.items(), key=lambda item: -item[1]):
+        lines.append(f"{stage:30s} {seconds * 1000:10.2f} ms")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory", type=Path, help="Directory of (Input Data) workbooks")
+    parser.add_argument("--salt-matrix", type=Path, help="SALT matrix to publish first")
+    parser.add_argument("--year", type=int,
+                        help="Period to publish the SALT matrix for (default: the input files' period)")
+    parser.add_argument("--quarter", choices=["Q1", "Q2", "Q3", "Q4"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Parsing processes (1 parses in the main process)")
+    parser.add_argument("--tax-batch-size", type=int, default=20,
+                        help="Sessions taxed and committed together")
+    parser.add_argument("--max-file-size", type=int, default=MAX_FILE_SIZE,
+                        help="Largest workbook accepted, in bytes")
+    parser.add_argument("--manifest", type=Path,
+                        help=f"Progress manifest (default: DIRECTORY/{MANIFEST_NAME})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip files the manifest records as processed")
+    args = parser.parse_args(argv)
+    if (args.year is None) != (args.quarter is None):
+        parser.error("--year and --quarter must be given together")
+    if not args.directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+    if args.salt_matrix is not None and not args.salt_matrix.is_file():
+        parser.error(f"{args.salt_matrix} is not a file")
+    args.tax_batch_size = max(1, args.tax_batch_size)
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    init_db(skip_if_current=True)
+    summary, stage_seconds = run_batch(args)
+    print(format_summary(summary, stage_seconds))
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
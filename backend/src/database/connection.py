@@ -1,50 +1,75 @@
 """Database connection and session management."""
 
+import hashlib
 import os
-from sqlalchemy import create_engine, text
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from ..monitoring.instrumentation import DB_POOL_CHECKOUT_WAIT
+
+
+# Columns added to distributions after the table was first created
+DISTRIBUTION_ADDED_COLUMNS = {
+    "composite_tax_amount": "NUMERIC(12,2)",
+    "withholding_tax_amount": "NUMERIC(12,2)",
+}
 
 
-def _ensure_distribution_tax_columns(engine, database_url: str) -> None:
-    """Ensure new tax columns exist on the distributions table for legacy databases."""
+def _ensure_distribution_columns(engine, database_url: str) -> None:
+    """Ensure newer columns exist on the distributions table for legacy databases."""
     with engine.connect() as connection:
         if "sqlite" in database_url:
             existing_columns = {
                 row[1] for row in connection.execute(text("PRAGMA table_info(distributions);"))
             }
 
-            if "composite_tax_amount" not in existing_columns:
-                connection.execute(
-                    text("ALTER TABLE distributions ADD COLUMN composite_tax_amount NUMERIC(12,2)")
-                )
-
-            if "withholding_tax_amount" not in existing_columns:
-                connection.execute(
-                    text("ALTER TABLE distributions ADD COLUMN withholding_tax_amount NUMERIC(12,2)")
-                )
+            for column, definition in DISTRIBUTION_ADDED_COLUMNS.items():
+                if column not in existing_columns:
+                    connection.execute(
+                        text(f"ALTER TABLE distributions ADD COLUMN {column} {definition}")
+                    )
         else:
-            connection.execute(
-                text(
-                    "ALTER TABLE IF EXISTS distributions ADD COLUMN IF NOT EXISTS composite_tax_amount NUMERIC(12,2)"
-                )
-            )
-            connection.execute(
-                text(
-                    "ALTER TABLE IF EXISTS distributions ADD COLUMN IF NOT EXISTS withholding_tax_amount NUMERIC(12,2)"
+            for column, definition in DISTRIBUTION_ADDED_COLUMNS.items():
+                connection.execute(
+                    text(
+                        f"ALTER TABLE IF EXISTS distributions ADD COLUMN IF NOT EXISTS {column} {definition}"
+                    )
                 )
-            )
 
         connection.commit()
 
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/fundflow.db")
 
-# Create engine
+
+class TimedQueuePool(QueuePool):
+    """Queue pool that records how long each checkout waits for a connection.
+
+    The pool emits no event before a checkout starts, so the wait, including
+    opening a new connection, is timed around the checkout itself. Sessions
+    check out lazily, on their first statement.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        connection = super().connect()
+        DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+        return connection
+
+
+# Create engine; in-memory SQLite keeps its single-connection pool
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    echo=os.getenv("DEBUG", "false").lower() == "true"
+    echo=os.getenv("DEBUG", "false").lower() == "true",
+    **({} if ":memory:" in DATABASE_URL else {"poolclass": TimedQueuePool}),
 )
 
 # Create SessionLocal class
@@ -63,7 +88,66 @@ def get_db():
         db.close()
 
 
-def init_db():
-    """Initialize database tables."""
+# Tracks the model fingerprint the schema was last synchronised with. Kept on
+# its own MetaData so it is not part of the fingerprint it stores.
+_schema_metadata = MetaData()
+schema_version_table = Table(
+    "fundflow_schema_version",
+    _schema_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def schema_fingerprint() -> str:
+    """Hash table, column and index definitions of all registered models."""
+    digest = hashlib.sha256()
+    for table in sorted(Base.metadata.tables.values(), key=lambda table: table.name):
+        digest.update(table.name.encode())
+        for column in table.columns:
+            digest.update(f"|{column.name}:{column.type!r}:{column.nullable}".encode())
+        for index_name in sorted(index.name or "" for index in table.indexes):
+            digest.update(f"|index:{index_name}".encode())
+    return digest.hexdigest()[:32]
+
+
+def _stored_schema_version(bind) -> Optional[str]:
+    """Return the stored fingerprint, or None when it has never been written."""
+    try:
+        with bind.connect() as connection:
+            return connection.execute(
+                schema_version_table.select()
+                .with_only_columns(schema_version_table.c.version)
+                .where(schema_version_table.c.id == 1)
+            ).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def _store_schema_version(bind, version: str) -> None:
+    _schema_metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        connection.execute(schema_version_table.delete())
+        connection.execute(
+            schema_version_table.insert().values(
+                id=1, version=version, applied_at=datetime.utcnow()
+            )
+        )
+
+
+def init_db(skip_if_current: bool = False) -> bool:
+    """Initialize database tables.
+
+    With ``skip_if_current`` the ``create_all`` and column probes are skipped
+    when the stored schema fingerprint matches the loaded models. Returns
+    True when DDL was run.
+    """
+    version = schema_fingerprint()
+    if skip_if_current and _stored_schema_version(engine) == version:
+        return False
+
     Base.metadata.create_all(bind=engine)
-    _ensure_distribution_tax_columns(engine, DATABASE_URL)
+    _ensure_distribution_columns(engine, DATABASE_URL)
+    _store_schema_version(engine, version)
+    return True
@@ -5,14 +5,18 @@ from .user_session import UserSession, UploadStatus
 from .investor import Investor
 from .enums import InvestorEntityType, USJurisdiction, RuleSetStatus, Quarter, IssueSeverity
 from .distribution import Distribution
+from .distribution_version import DistributionVersion
 from .fund import Fund
 from .fund_source_data import FundSourceData
 from .investor_fund_commitment import InvestorFundCommitment
 from .validation_error import ValidationError, ErrorSeverity
+from .session_processing_profile import SessionProcessingProfile
+from .session_error_count import SessionErrorCount
 
 # SALT models
 from .source_file import SourceFile
 from .salt_rule_set import SaltRuleSet
+from .salt_rule_version import SaltRuleVersion
 from .withholding_rule import WithholdingRule
 from .composite_rule import CompositeRule
 from .validation_issue import ValidationIssue
@@ -26,11 +30,14 @@ __all__ = [
     "InvestorEntityType",
     "USJurisdiction",
     "Distribution",
+    "DistributionVersion",
     "Fund",
     "FundSourceData",
     "InvestorFundCommitment",
     "ValidationError",
     "ErrorSeverity",
+    "SessionProcessingProfile",
+    "SessionErrorCount",
     # SALT enums
     "RuleSetStatus",
     "Quarter",
@@ -38,6 +45,7 @@ __all__ = [
     # SALT models
     "SourceFile",
     "SaltRuleSet",
+    "SaltRuleVersion",
     "WithholdingRule",
     "CompositeRule",
     "ValidationIssue",
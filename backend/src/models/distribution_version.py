@@ -0,0 +1,53 @@
+"""DistributionVersion model for distribution rows superseded by a delta upload."""
+
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Boolean,
+    Numeric,
+    Enum as SQLEnum,
+    Index,
+)
+from ..database.connection import Base
+from .enums import USJurisdiction
+
+
+class DistributionVersion(Base):
+    """A distribution row as it was before a delta upload updated, moved or removed it.
+
+    ``superseded_by_session_id`` is the delta session; deleting it puts these
+    versions back in place of its rows.
+    """
+
+    __tablename__ = "distribution_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    superseded_by_session_id = Column(
+        String(36), ForeignKey("user_sessions.session_id"), nullable=False
+    )
+
+    # The distribution row's columns before the delta
+    distribution_id = Column(Integer, nullable=False)
+    investor_id = Column(Integer, ForeignKey("investors.id"), nullable=False)
+    session_id = Column(String(36), ForeignKey("user_sessions.session_id"), nullable=False)
+    fund_code = Column(String(50), ForeignKey("funds.fund_code"), nullable=False)
+    jurisdiction = Column(SQLEnum(USJurisdiction), nullable=False)
+    amount = Column(Numeric(precision=12, scale=2), nullable=False, default=Decimal('0.00'))
+    composite_exemption = Column(Boolean, nullable=False, default=False)
+    withholding_exemption = Column(Boolean, nullable=False, default=False)
+    composite_tax_amount = Column(Numeric(precision=12, scale=2), nullable=True)
+    withholding_tax_amount = Column(Numeric(precision=12, scale=2), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_distribution_versions_superseded_by", superseded_by_session_id),
+        Index("idx_distribution_versions_session_id", session_id),
+    )
+
+    def __repr__(self) -> str:
+        return f"<DistributionVersion(distribution_id={self.distribution_id}, session_id='{self.session_id}', superseded_by='{self.superseded_by_session_id}')>"
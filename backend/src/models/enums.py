@@ -112,6 +112,7 @@ class USJurisdiction(Enum):
 
 class RuleSetStatus(Enum):
     """SALT rule set status enumeration."""
+    DRAFT = "draft"  # Rules staged by a publish that has not been activated yet
     ACTIVE = "active"
     ARCHIVED = "archived"
 
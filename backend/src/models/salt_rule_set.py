@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Integer, DateTime, Date, ForeignKey, Text, CheckConstraint, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, Date, ForeignKey, Text, CheckConstraint, Index, Enum as SQLEnum, text
 from sqlalchemy.orm import relationship
 from ..database.connection import Base
 from .enums import RuleSetStatus, Quarter
@@ -60,10 +60,14 @@ class SaltRuleSet(Base):
             "rule_count_composite >= 0",
             name="ck_salt_rule_set_composite_count_positive"
         ),
-        # Unique constraint: only one active rule set per year/quarter
-        UniqueConstraint(
-            "year", "quarter", "status",
-            name="uq_salt_rule_set_active_year_quarter"
+        # Only one active rule set per year/quarter; drafts and archived
+        # sets may accumulate
+        Index(
+            "uq_salt_rule_set_active_year_quarter",
+            "year", "quarter",
+            unique=True,
+            sqlite_where=text("status = 'ACTIVE'"),
+            postgresql_where=text("status = 'ACTIVE'"),
         ),
     )
 
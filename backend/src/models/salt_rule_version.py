@@ -0,0 +1,22 @@
+"""SaltRuleVersion model: counter bumped whenever the active rule sets change."""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, DateTime
+from ..database.connection import Base
+
+
+class SaltRuleVersion(Base):
+    """Single-row counter of rule set publications.
+
+    Calculation workers compare it with the version their caches were built
+    at, which is a primary-key lookup instead of re-reading the rule sets.
+    """
+
+    __tablename__ = "salt_rule_versions"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SaltRuleVersion(version={self.version})>"
@@ -0,0 +1,32 @@
+"""SessionErrorCount model for exact validation error counts per session."""
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from ..database.connection import Base
+from .validation_error import ErrorSeverity
+
+
+class SessionErrorCount(Base):
+    """Number of validation errors a session's file had for one code and severity.
+
+    Only a capped sample of each code's errors is kept in ``validation_errors``;
+    these counts cover all of them.
+    """
+
+    __tablename__ = "session_error_counts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String(36), ForeignKey("user_sessions.session_id"), nullable=False)
+    error_code = Column(String(50), nullable=False)
+    severity = Column(SQLEnum(ErrorSeverity), nullable=False)
+    error_count = Column(Integer, nullable=False)
+
+    # Relationships
+    session = relationship("UserSession", back_populates="error_counts")
+
+    __table_args__ = (
+        Index("idx_session_error_counts_session_id", session_id),
+    )
+
+    def __repr__(self) -> str:
+        return f"<SessionErrorCount(session_id='{self.session_id}', code='{self.error_code}', count={self.error_count})>"
@@ -0,0 +1,42 @@
+"""SessionProcessingProfile model for per-upload timing and resource data."""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from ..database.connection import Base
+
+
+class SessionProcessingProfile(Base):
+    """Timing profile recorded by the upload pipeline for a single session."""
+
+    __tablename__ = "session_processing_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(
+        String(36), ForeignKey("user_sessions.session_id"), nullable=False, unique=True
+    )
+
+    # Stage durations in milliseconds
+    read_file_ms = Column(Float, nullable=True)
+    validate_headers_ms = Column(Float, nullable=True)
+    parse_rows_ms = Column(Float, nullable=True)
+    resolve_investors_ms = Column(Float, nullable=True)
+    insert_distributions_ms = Column(Float, nullable=True)
+    calculate_tax_ms = Column(Float, nullable=True)
+    commit_ms = Column(Float, nullable=True)
+    total_ms = Column(Float, nullable=True)
+
+    # Volume and resources
+    file_size = Column(Integer, nullable=True)
+    total_rows = Column(Integer, nullable=True)
+    valid_rows = Column(Integer, nullable=True)
+    distribution_count = Column(Integer, nullable=True)
+    peak_memory_kb = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    session = relationship("UserSession", back_populates="processing_profile")
+
+    def __repr__(self) -> str:
+        return f"<SessionProcessingProfile(session_id='{self.session_id}', total_ms={self.total_ms})>"
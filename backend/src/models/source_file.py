@@ -31,7 +31,7 @@ class SourceFile(Base):
     # Table constraints
     __table_args__ = (
         CheckConstraint(
-            "file_size > 0 AND file_size <= 10485760",
+            "file_size > 0",
             name="ck_source_file_size_valid"
         ),
         CheckConstraint(
@@ -44,6 +44,10 @@ class UserSession(Base):
     user = relationship("User", back_populates="sessions")
     distributions = relationship("Distribution", back_populates="session")
     validation_errors = relationship("ValidationError", back_populates="session")
+    error_counts = relationship("SessionErrorCount", back_populates="session")
+    processing_profile = relationship(
+        "SessionProcessingProfile", back_populates="session", uselist=False
+    )
 
     def __repr__(self) -> str:
         return f"<UserSession(id='{self.session_id}', status='{self.status.value}', filename='{self.original_filename}')>"
\ No newline at end of file
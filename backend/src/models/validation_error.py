@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from ..database.connection import Base
 
@@ -31,5 +31,11 @@ class ValidationError(Base):
     # Relationships
     session = relationship("UserSession", back_populates="validation_errors")
 
+    __table_args__ = (
+        # Keyset pagination and per-code summaries within one session
+        Index("idx_validation_errors_session_id", session_id, id),
+        Index("idx_validation_errors_session_code", session_id, error_code),
+    )
+
     def __repr__(self) -> str:
         return f"<ValidationError(id={self.id}, session_id='{self.session_id}', row={self.row_number}, code='{self.error_code}', severity='{self.severity.value}')>"
\ No newline at end of file
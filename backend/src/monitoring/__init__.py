@@ -0,0 +1,11 @@
+"""Runtime monitoring helpers for FundFlow application."""
+
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry, registry
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "registry",
+]
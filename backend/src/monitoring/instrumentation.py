@@ -0,0 +1,119 @@
+"""Lightweight stage timing helpers used by services at phase boundaries."""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from .metrics import registry
+
+STAGE_DURATION = registry.histogram(
+    "fundflow_stage_duration_seconds",
+    "Duration of pipeline stages",
+    labelnames=("stage",),
+)
+STAGE_ITEMS = registry.counter(
+    "fundflow_stage_items_total",
+    "Items (rows, distributions, rules) processed by pipeline stages",
+    labelnames=("stage",),
+)
+EXCEL_PARSE_THROUGHPUT = registry.histogram(
+    "fundflow_excel_parse_rows_per_second",
+    "Row throughput of ExcelService.parse_excel_file",
+    buckets=(100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000),
+)
+EXPORT_DURATION = registry.histogram(
+    "fundflow_export_duration_seconds",
+    "Time spent generating export payloads",
+    labelnames=("kind", "format"),
+)
+EXPORT_BYTES = registry.counter(
+    "fundflow_export_bytes_total",
+    "Bytes produced by export endpoints",
+    labelnames=("kind", "format"),
+)
+RESULT_CACHE_REQUESTS = registry.counter(
+    "fundflow_result_cache_requests_total",
+    "Read endpoint requests served from cache, joined to an in-flight computation, or computed",
+    labelnames=("endpoint", "outcome"),
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "fundflow_db_pool_checkout_wait_seconds",
+    "Time spent waiting to check out a database connection",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+
+ADMISSION_QUEUE_DEPTH = registry.gauge(
+    "fundflow_admission_queue_depth",
+    "Upload work waiting for a parse or persist slot",
+    labelnames=("gate",),
+)
+ADMISSION_ACTIVE = registry.gauge(
+    "fundflow_admission_active",
+    "Upload work currently holding a parse or persist slot",
+    labelnames=("gate",),
+)
+ADMISSION_WAIT = registry.histogram(
+    "fundflow_admission_wait_seconds",
+    "Time upload work waited for a parse or persist slot",
+    labelnames=("gate",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+ADMISSION_REJECTIONS = registry.counter(
+    "fundflow_admission_rejections_total",
+    "Upload work turned away because the wait queue was full or the wait timed out",
+    labelnames=("gate", "reason"),
+)
+
+
+def observe_stage(stage: str, seconds: float, items: int = 0) -> None:
+    """Record a completed stage duration and optional item count."""
+    STAGE_DURATION.labels(stage).observe(seconds)
+    if items:
+        STAGE_ITEMS.labels(stage).inc(items)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """Time the enclosed block and record it under ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+class StageAccumulator:
+    """Accumulate time for stages that are interleaved inside a row loop.
+
+    Durations are summed locally and recorded once via :meth:`flush`, so the
+    per-row overhead is two ``perf_counter`` calls.
+    """
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = {}
+
+    @contextmanager
+    def track(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[stage] = self.totals.get(stage, 0.0) + (
+                time.perf_counter() - start
+            )
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time measured elsewhere, e.g. in another process."""
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+
+    def flush(self) -> Dict[str, float]:
+        """Record accumulated totals and return them."""
+        for stage, seconds in self.totals.items():
+            observe_stage(stage, seconds)
+        return dict(self.totals)
+
+
+def record_export(kind: str, export_format: str, seconds: float, size_bytes: int) -> None:
+    """Record export generation time and payload size."""
+    EXPORT_DURATION.labels(kind, export_format).observe(seconds)
+    EXPORT_BYTES.labels(kind, export_format).inc(size_bytes)
@@ -0,0 +1,52 @@
+"""Helpers for building per-session processing profiles."""
+
+import sys
+from typing import Any, Dict, Mapping, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+# Maps profile columns to the stage names recorded by the pipeline
+PROFILE_STAGE_COLUMNS = {
+    "read_file_ms": "read_file",
+    "validate_headers_ms": "validate_headers",
+    "parse_rows_ms": "parse_rows",
+    "resolve_investors_ms": "investor_resolution",
+    "insert_distributions_ms": "distribution_insert",
+    "calculate_tax_ms": "tax_apply_for_session",
+    "commit_ms": "upload_commit",
+}
+
+
+def peak_memory_kb() -> Optional[int]:
+    """Return the process resident set high-water mark in kilobytes.
+
+    This is process-wide, so concurrent uploads in the same worker share it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    if sys.platform == "darwin":
+        peak //= 1024
+    return int(peak)
+
+
+def build_profile_fields(
+    stage_seconds: Mapping[str, float],
+    total_seconds: float,
+    **counts: Any,
+) -> Dict[str, Any]:
+    """Convert stage durations and counts into SessionProcessingProfile fields."""
+    fields: Dict[str, Any] = {
+        column: round(stage_seconds[stage] * 1000, 3)
+        for column, stage in PROFILE_STAGE_COLUMNS.items()
+        if stage in stage_seconds
+    }
+    fields["total_ms"] = round(total_seconds * 1000, 3)
+    fields["peak_memory_kb"] = peak_memory_kb()
+    fields.update(counts)
+    return fields
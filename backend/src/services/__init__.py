@@ -1,19 +1,44 @@
-"""Services for FundFlow application."""
-
-from .excel_service import ExcelService, ExcelValidationError, ExcelParsingResult
-from .investor_service import InvestorService
-from .distribution_service import DistributionService
-from .validation_service import ValidationService
-from .tax_calculation_service import TaxCalculationService
-from .session_service import SessionService
-
-__all__ = [
-    "ExcelService",
-    "ExcelValidationError",
-    "ExcelParsingResult",
-    "InvestorService",
-    "DistributionService",
-    "ValidationService",
-    "SessionService",
-    "TaxCalculationService",
-]
+"""Services for FundFlow application.
+
+Exports are resolved lazily (PEP 562) so importing one service, or the API
+routers, does not import every service module and its dependencies.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+_EXPORTS = {
+    "ExcelService": ".excel_service",
+    "ExcelValidationError": ".excel_service",
+    "ExcelParsingResult": ".excel_service",
+    "InvestorService": ".investor_service",
+    "DistributionService": ".distribution_service",
+    "ValidationService": ".validation_service",
+    "SessionService": ".session_service",
+    "TaxCalculationService": ".tax_calculation_service",
+    "FundAllocationService": ".allocation_service",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .excel_service import ExcelService, ExcelValidationError, ExcelParsingResult
+    from .investor_service import InvestorService
+    from .distribution_service import DistributionService
+    from .validation_service import ValidationService
+    from .tax_calculation_service import TaxCalculationService
+    from .session_service import SessionService
+    from .allocation_service import FundAllocationService
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,144 @@
+"""Admission control for upload parsing and persistence.
+
+Uploads pass two gates: workbook parsing (CPU and memory bound) and
+persistence (database bound), each with its own concurrency limit. Work
+beyond the limit waits in a bounded queue; when the queue is full the
+request is turned away at once (429) and when the wait times out it gives
+up (503), both with a ``Retry-After`` estimated from recent slot hold times.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from ..monitoring.instrumentation import (
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTIONS,
+    ADMISSION_WAIT,
+)
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_PARSE_CONCURRENCY = int(os.getenv("UPLOAD_PARSE_CONCURRENCY", "2"))
+UPLOAD_PERSIST_CONCURRENCY = int(os.getenv("UPLOAD_PERSIST_CONCURRENCY", "2"))
+# Requests allowed to wait for a slot per gate; more are rejected with 429
+UPLOAD_QUEUE_LIMIT = int(os.getenv("UPLOAD_QUEUE_LIMIT", "8"))
+# Longest wait for a slot before giving up with 503
+UPLOAD_QUEUE_TIMEOUT_SECONDS = float(os.getenv("UPLOAD_QUEUE_TIMEOUT_SECONDS", "30"))
+# Smallest Retry-After sent with a rejection
+UPLOAD_RETRY_AFTER_SECONDS = int(os.getenv("UPLOAD_RETRY_AFTER_SECONDS", "5"))
+
+# Weight of the latest hold time in the moving average
+HOLD_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when upload work cannot get a slot; maps to 429 or 503."""
+
+    def __init__(self, gate: str, status_code: int, retry_after: int, message: str):
+        super().__init__(message)
+        self.gate = gate
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """Bounded concurrency with a bounded, time-limited wait queue.
+
+    Slots are taken from worker threads, so waiting blocks the caller's
+    thread; the queue limit caps how many threads can be parked here.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        queue_limit: int = UPLOAD_QUEUE_LIMIT,
+        timeout_seconds: float = UPLOAD_QUEUE_TIMEOUT_SECONDS,
+        min_retry_after: int = UPLOAD_RETRY_AFTER_SECONDS,
+    ) -> None:
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue_limit = max(0, queue_limit)
+        self.timeout_seconds = timeout_seconds
+        self.min_retry_after = min_retry_after
+        self.active = 0
+        self.waiting = 0
+        self._avg_hold_seconds = 0.0
+        self._condition = threading.Condition()
+        ADMISSION_ACTIVE.labels(name).set(0)
+        ADMISSION_QUEUE_DEPTH.labels(name).set(0)
+
+    def acquire(self) -> None:
+        """Take a slot, waiting in the queue when all slots are busy."""
+        start = time.perf_counter()
+        with self._condition:
+            if self.active >= self.limit:
+                if self.waiting >= self.queue_limit:
+                    raise self._reject(
+                        "queue_full", 429, f"Too many {self.name} requests queued; retry later"
+                    )
+                self._set_waiting(self.waiting + 1)
+                try:
+                    deadline = start + self.timeout_seconds
+                    while self.active >= self.limit:
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            raise self._reject(
+                                "timeout",
+                                503,
+                                f"Timed out after {self.timeout_seconds:g}s waiting for a "
+                                f"{self.name} slot; retry later",
+                            )
+                        self._condition.wait(remaining)
+                finally:
+                    self._set_waiting(self.waiting - 1)
+            self.active += 1
+            ADMISSION_ACTIVE.labels(self.name).set(self.active)
+        ADMISSION_WAIT.labels(self.name).observe(time.perf_counter() - start)
+
+    def release(self, held_seconds: float = 0.0) -> None:
+        """Give a slot back and wake the next waiter."""
+        with self._condition:
+            self.active -= 1
+            ADMISSION_ACTIVE.labels(self.name).set(self.active)
+            if held_seconds:
+                self._avg_hold_seconds += HOLD_TIME_SMOOTHING * (
+                    held_seconds - self._avg_hold_seconds
+                )
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a slot for the enclosed block."""
+        self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    def retry_after(self) -> int:
+        """Seconds until the queue ahead of a new request has likely drained."""
+        estimate = self._avg_hold_seconds * (self.waiting + 1) / self.limit
+        return max(self.min_retry_after, math.ceil(estimate))
+
+    def _set_waiting(self, waiting: int) -> None:
+        self.waiting = waiting
+        ADMISSION_QUEUE_DEPTH.labels(self.name).set(waiting)
+
+    def _reject(self, reason: str, status_code: int, message: str) -> AdmissionRejected:
+        ADMISSION_REJECTIONS.labels(self.name, reason).inc()
+        logger.warning(
+            f"Rejected {self.name} work ({reason}): {self.active} active, {self.waiting} waiting"
+        )
+        return AdmissionRejected(self.name, status_code, self.retry_after(), message)
+
+
+parse_gate = AdmissionGate("parse", UPLOAD_PARSE_CONCURRENCY)
+persist_gate = AdmissionGate("persist", UPLOAD_PERSIST_CONCURRENCY)
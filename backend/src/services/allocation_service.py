@@ -0,0 +1,208 @@
+"""Allocate fund source distributions to investors by commitment percentage."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..models.distribution import Distribution
+from ..models.enums import USJurisdiction
+from ..models.fund import Fund
+from ..models.fund_source_data import FundSourceData
+from ..models.investor_fund_commitment import InvestorFundCommitment
+from ..monitoring.instrumentation import observe_stage
+from ..utils.money import (
+    MAX_VECTOR_CENTS,
+    RATE_SCALE,
+    from_cents,
+    mul_rate,
+    mul_rate_array,
+    to_cents_array,
+    to_rate_units,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def percentage_units(percentage: Decimal) -> int:
+    """Convert a 0-100 percentage (four places) to units of 1/RATE_SCALE."""
+    return to_rate_units(Decimal(percentage).scaleb(-2))
+
+
+def allocate_cents(commitment_units: "np.ndarray", pool_cents: "np.ndarray") -> "np.ndarray":
+    """Split each jurisdiction pool across investors in proportion to commitments.
+
+    ``commitment_units`` (one per investor, in units of 1/RATE_SCALE) and
+    ``pool_cents`` (one per jurisdiction) form an investor x jurisdiction
+    outer product. Each cell is floored to whole cents and the pennies left
+    over in a column are handed out by largest remainder, ties going to the
+    earlier investor, so every column sums to the pool scaled by the total
+    commitment (rounded half-up) - exactly the pool when commitments total
+    100%.
+    """
+    import numpy as np
+
+    commitment_units = np.asarray(commitment_units, dtype=np.int64)
+    pool_cents = np.asarray(pool_cents, dtype=np.int64)
+    if commitment_units.size == 0 or pool_cents.size == 0:
+        return np.zeros((commitment_units.size, pool_cents.size), dtype=np.int64)
+
+    total_units = int(commitment_units.sum())
+    if (commitment_units < 0).any() or total_units > RATE_SCALE:
+        raise ValueError("Commitment percentages must be non-negative and total at most 100")
+    if (pool_cents < 0).any() or int(pool_cents.max()) > MAX_VECTOR_CENTS:
+        raise ValueError("Jurisdiction pools must be non-negative and within range")
+
+    shares, remainders = np.divmod(np.multiply.outer(commitment_units, pool_cents), RATE_SCALE)
+    targets = np.fromiter(
+        (mul_rate(int(pool), total_units) for pool in pool_cents),
+        dtype=np.int64,
+        count=pool_cents.size,
+    )
+    shortfall = targets - shares.sum(axis=0)
+
+    # Rank investors within each column by remainder (descending); the stable
+    # sort keeps investor order for equal remainders.
+    order = np.argsort(-remainders, axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(order.shape[0])[:, None], axis=0)
+    return shares + (ranks < shortfall)
+
+
+@dataclass
+class AllocationResult:
+    """Investor x jurisdiction allocation for one fund, in integer cents."""
+
+    fund_code: str
+    investor_ids: List[int]
+    jurisdictions: List[USJurisdiction]
+    pool_cents: Any
+    amounts: Any
+
+    def total_cents(self) -> int:
+        return int(self.amounts.sum())
+
+    def iter_allocations(self) -> Iterator[Tuple[int, USJurisdiction, int]]:
+        """Yield ``(investor_id, jurisdiction, cents)`` for each non-zero cell."""
+        rows, cols = self.amounts.nonzero()
+        for row, col, cents in zip(rows.tolist(), cols.tolist(), self.amounts[rows, cols].tolist()):
+            yield self.investor_ids[row], self.jurisdictions[col], cents
+
+
+class FundAllocationService:
+    """Combine fund source data and investor commitments into distributions."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def compute_allocation(self, fund_code: str) -> AllocationResult:
+        """Compute every investor x jurisdiction amount for a fund."""
+        import numpy as np
+
+        start = time.perf_counter()
+        commitments = (
+            self.db.query(
+                InvestorFundCommitment.investor_id,
+                InvestorFundCommitment.commitment_percentage,
+            )
+            .filter(InvestorFundCommitment.fund_code == fund_code)
+            .order_by(InvestorFundCommitment.investor_id)
+            .all()
+        )
+        source_rows = (
+            self.db.query(
+                FundSourceData.state_jurisdiction,
+                FundSourceData.total_distribution_amount,
+                FundSourceData.fund_share_percentage,
+            )
+            .filter(FundSourceData.fund_code == fund_code)
+            .all()
+        )
+
+        present = {row[0] for row in source_rows}
+        jurisdictions = [jurisdiction for jurisdiction in USJurisdiction if jurisdiction in present]
+        pool_cents = self._jurisdiction_pools(source_rows, jurisdictions)
+        commitment_units = np.fromiter(
+            (percentage_units(percentage) for _, percentage in commitments),
+            dtype=np.int64,
+            count=len(commitments),
+        )
+
+        result = AllocationResult(
+            fund_code=fund_code,
+            investor_ids=[investor_id for investor_id, _ in commitments],
+            jurisdictions=jurisdictions,
+            pool_cents=pool_cents,
+            amounts=allocate_cents(commitment_units, pool_cents),
+        )
+        observe_stage("fund_allocation", time.perf_counter() - start, result.amounts.size)
+        return result
+
+    def _jurisdiction_pools(
+        self,
+        source_rows: Sequence[Tuple[USJurisdiction, Decimal, Decimal]],
+        jurisdictions: List[USJurisdiction],
+    ) -> "np.ndarray":
+        """Sum each company's fund share (rounded to cents) per jurisdiction."""
+        import numpy as np
+
+        column = {jurisdiction: index for index, jurisdiction in enumerate(jurisdictions)}
+        company_cents = mul_rate_array(
+            to_cents_array([amount for _, amount, _ in source_rows]),
+            np.fromiter(
+                (percentage_units(share) for _, _, share in source_rows),
+                dtype=np.int64,
+                count=len(source_rows),
+            ),
+        )
+        pools = np.zeros(len(jurisdictions), dtype=np.int64)
+        np.add.at(
+            pools,
+            np.fromiter((column[row[0]] for row in source_rows), dtype=np.intp, count=len(source_rows)),
+            company_cents,
+        )
+        return pools
+
+    def create_distributions(
+        self,
+        fund: Fund,
+        session_id: str,
+        allocation: Optional[AllocationResult] = None,
+    ) -> int:
+        """Bulk insert one distribution per non-zero allocation cell.
+
+        Exemption flags default to False. Returns the number of rows inserted.
+        """
+        if allocation is None:
+            allocation = self.compute_allocation(fund.fund_code)
+
+        start = time.perf_counter()
+        rows = [
+            {
+                "investor_id": investor_id,
+                "session_id": session_id,
+                "fund_code": fund.fund_code,
+                "jurisdiction": jurisdiction,
+                "amount": from_cents(cents),
+                "composite_exemption": False,
+                "withholding_exemption": False,
+            }
+            for investor_id, jurisdiction, cents in allocation.iter_allocations()
+        ]
+        if rows:
+            self.db.execute(insert(Distribution), rows)
+        observe_stage("distribution_insert", time.perf_counter() - start, len(rows))
+        logger.info(
+            f"Allocated fund {fund.fund_code} to {len(allocation.investor_ids)} investors "
+            f"across {len(allocation.jurisdictions)} jurisdictions ({len(rows)} distributions)"
+        )
+        return len(rows)
@@ -0,0 +1,341 @@
+"""Resumable chunked uploads staged on disk until they are finalized.
+
+A client initiates an upload with the file name and total size, appends the
+bytes in chunks at explicit offsets and finalizes with the SHA-256 of the
+whole file. Chunks are appended straight to a part file, so the file is never
+held in memory, and the part file's size is the upload's offset: after a
+dropped connection the client asks for the offset and resumes from there.
+
+Uploads live in a directory shared by all workers, so writes, finalize and
+cancel take an exclusive ``flock`` on the upload's lock file; a request that
+finds the upload locked, in any process, is answered with 409.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Type
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows; locks then only hold within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CHUNKED_UPLOAD_DIR = Path(os.getenv("CHUNKED_UPLOAD_DIR", "data/uploads/chunked"))
+# Largest file accepted through the chunked protocol
+CHUNKED_UPLOAD_MAX_BYTES = int(os.getenv("CHUNKED_UPLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+# Chunk size suggested to clients
+CHUNKED_UPLOAD_CHUNK_BYTES = int(os.getenv("CHUNKED_UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024)))
+# Unfinished uploads untouched for this long are removed
+CHUNKED_UPLOAD_TTL_HOURS = float(os.getenv("CHUNKED_UPLOAD_TTL_HOURS", "24"))
+
+# Accepted file extensions per processing target
+UPLOAD_TARGETS = {
+    "distributions": (".xlsx", ".xls", ".csv"),
+    "salt-rules": (".xlsx", ".xlsm"),
+}
+
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+HASH_BLOCK_BYTES = 1024 * 1024
+LOCK_FILENAME = ".lock"
+
+
+class ChunkedUploadError(Exception):
+    """Raised when an upload request cannot be applied.
+
+    ``status_code`` is the HTTP status the API answers with and ``offset``
+    the upload's current offset when the client is out of step with it.
+    """
+
+    def __init__(self, message: str, status_code: int = 400, offset: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.offset = offset
+
+
+@dataclass
+class UploadState:
+    """Metadata of an upload in progress."""
+
+    upload_id: str
+    filename: str
+    target: str
+    total_size: int
+    created_at: float
+    offset: int = 0
+    # Distribution uploads reserve their session id so progress can be
+    # streamed while finalize processes the file
+    session_id: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "upload_id": self.upload_id,
+            "filename": self.filename,
+            "target": self.target,
+            "total_size": self.total_size,
+            "offset": self.offset,
+            "complete": self.offset == self.total_size,
+            "session_id": self.session_id,
+        }
+
+
+class UploadLock:
+    """Exclusive lock on one upload, held across processes through ``flock``."""
+
+    # Fallback without fcntl: one lock per upload within this process
+    _local_locks: Dict[str, threading.Lock] = {}
+    _local_guard = threading.Lock()
+
+    def __init__(self, upload_dir: Path) -> None:
+        self._local: Optional[threading.Lock] = None
+        try:
+            self._fd = os.open(upload_dir / LOCK_FILENAME, os.O_RDWR | os.O_CREAT, 0o600)
+        except FileNotFoundError:
+            raise ChunkedUploadError(f"Upload {upload_dir.name} not found", status_code=404)
+
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                pass
+        else:
+            with self._local_guard:
+                local = self._local_locks.setdefault(upload_dir.name, threading.Lock())
+            if local.acquire(blocking=False):
+                self._local = local
+                return
+        os.close(self._fd)
+        raise ChunkedUploadError(
+            f"Upload {upload_dir.name} is busy with another request", status_code=409
+        )
+
+    def release(self) -> None:
+        # Closing the descriptor drops the flock
+        os.close(self._fd)
+        if self._local is not None:
+            self._local.release()
+
+
+class ChunkWriter:
+    """Appends one chunk's bytes to an upload's part file."""
+
+    def __init__(self, service: "ChunkedUploadService", state: UploadState, lock: UploadLock):
+        self.service = service
+        self.state = state
+        self._lock = lock
+        self._file = open(service.part_path(state), "ab")
+
+    def write(self, data: bytes) -> None:
+        if self.state.offset + len(data) > self.state.total_size:
+            raise ChunkedUploadError(
+                f"Chunk runs past the declared size of {self.state.total_size} bytes",
+                status_code=413,
+                offset=self.state.offset,
+            )
+        self._file.write(data)
+        self.state.offset += len(data)
+
+    def close(self) -> UploadState:
+        """Flush the received bytes and release the upload for the next chunk."""
+        try:
+            self._file.close()
+        finally:
+            # Bytes written before a dropped connection count; the client
+            # resumes from whatever offset reached the disk
+            self.state.offset = self.service.part_path(self.state).stat().st_size
+            self._lock.release()
+        return self.state
+
+
+class ChunkedUploadService:
+    """Service for staging resumable uploads on local disk."""
+
+    def __init__(self, root: Optional[Path] = None, max_size: int = CHUNKED_UPLOAD_MAX_BYTES):
+        self.root = Path(root or CHUNKED_UPLOAD_DIR)
+        self.max_size = max_size
+
+    def initiate(self, filename: str, total_size: int, target: str) -> UploadState:
+        """Register a new upload and create its empty part file."""
+        if target not in UPLOAD_TARGETS:
+            raise ChunkedUploadError(
+                f"Unknown upload target '{target}'. Expected one of: {', '.join(UPLOAD_TARGETS)}"
+            )
+        filename = Path(filename or "").name
+        if not filename.lower().endswith(UPLOAD_TARGETS[target]):
+            raise ChunkedUploadError(
+                f"Unsupported file type. Allowed: {', '.join(UPLOAD_TARGETS[target])}",
+                status_code=415,
+            )
+        if total_size <= 0:
+            raise ChunkedUploadError("File size must be greater than zero")
+        if total_size > self.max_size:
+            raise ChunkedUploadError(
+                f"File size {total_size} exceeds maximum allowed size {self.max_size}",
+                status_code=413,
+            )
+
+        self.purge_expired()
+        state = UploadState(
+            upload_id=uuid.uuid4().hex,
+            filename=filename,
+            target=target,
+            total_size=total_size,
+            created_at=time.time(),
+            session_id=str(uuid.uuid4()) if target == "distributions" else None,
+        )
+        upload_dir = self._upload_dir(state.upload_id)
+        upload_dir.mkdir(parents=True)
+        (upload_dir / "meta.json").write_text(json.dumps(asdict(state)))
+        self.part_path(state).touch()
+        logger.info(f"Initiated {target} upload {state.upload_id} for {filename} ({total_size} bytes)")
+        return state
+
+    def get(self, upload_id: str) -> UploadState:
+        """Load an upload's metadata with its current offset."""
+        meta_path = self._upload_dir(upload_id) / "meta.json"
+        try:
+            state = UploadState(**json.loads(meta_path.read_text()))
+        except FileNotFoundError:
+            raise ChunkedUploadError(f"Upload {upload_id} not found", status_code=404)
+        part_path = self.part_path(state)
+        state.offset = part_path.stat().st_size if part_path.exists() else 0
+        return state
+
+    def open_chunk(self, upload_id: str, offset: int) -> ChunkWriter:
+        """Start appending a chunk that begins at ``offset``.
+
+        The offset must equal the bytes already received; otherwise the
+        client is told the current offset and resends from there. Only one
+        chunk per upload is written at a time, across all workers.
+        """
+        lock = self._acquire(upload_id)
+        try:
+            state = self.get(upload_id)
+            if offset != state.offset:
+                raise ChunkedUploadError(
+                    f"Chunk offset {offset} does not match upload offset {state.offset}",
+                    status_code=409,
+                    offset=state.offset,
+                )
+            return ChunkWriter(self, state, lock)
+        except BaseException:
+            lock.release()
+            raise
+
+    @contextmanager
+    def finalize(
+        self,
+        upload_id: str,
+        sha256: str,
+        keep_on: Tuple[Type[BaseException], ...] = (),
+    ) -> Iterator[UploadState]:
+        """Check that the upload is whole and matches the client's checksum.
+
+        Yields the upload for processing its file at ``part_path``; it stays
+        locked against further chunks and finalizes meanwhile and is removed
+        once processing ends. A failed check, or processing that raises one
+        of ``keep_on``, keeps the upload so the client can retry or discard it.
+        """
+        lock = self._acquire(upload_id)
+        try:
+            state = self.get(upload_id)
+            if state.offset != state.total_size:
+                raise ChunkedUploadError(
+                    f"Upload incomplete: received {state.offset} of {state.total_size} bytes",
+                    status_code=409,
+                    offset=state.offset,
+                )
+
+            digest = hashlib.sha256()
+            with open(self.part_path(state), "rb") as part_file:
+                for block in iter(lambda: part_file.read(HASH_BLOCK_BYTES), b""):
+                    digest.update(block)
+            if digest.hexdigest() != sha256.strip().lower():
+                raise ChunkedUploadError(
+                    "Checksum mismatch: the received file differs from the sent file",
+                    status_code=422,
+                )
+
+            try:
+                yield state
+            except keep_on:
+                raise
+            except BaseException:
+                self.discard(upload_id)
+                raise
+            self.discard(upload_id)
+            logger.info(f"Finalized {state.target} upload {upload_id}")
+        finally:
+            lock.release()
+
+    def cancel(self, upload_id: str) -> None:
+        """Abandon an upload that no chunk is being written to."""
+        lock = self._acquire(upload_id)
+        try:
+            self.get(upload_id)
+            self.discard(upload_id)
+        finally:
+            lock.release()
+        logger.info(f"Cancelled upload {upload_id}")
+
+    def discard(self, upload_id: str) -> None:
+        """Remove an upload and its received bytes."""
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+    def purge_expired(self, ttl_hours: float = CHUNKED_UPLOAD_TTL_HOURS) -> int:
+        """Remove uploads without activity for ``ttl_hours``."""
+        if not self.root.exists():
+            return 0
+        cutoff = time.time() - ttl_hours * 3600
+        purged = 0
+        for upload_dir in self.root.iterdir():
+            if not UPLOAD_ID_PATTERN.match(upload_dir.name):
+                continue
+            try:
+                # Uploads busy in any worker are left alone
+                lock = self._acquire(upload_dir.name)
+            except ChunkedUploadError:
+                continue
+            try:
+                last_activity = max(
+                    (path.stat().st_mtime for path in upload_dir.iterdir()),
+                    default=upload_dir.stat().st_mtime,
+                )
+                if last_activity < cutoff:
+                    self.discard(upload_dir.name)
+                    purged += 1
+            except FileNotFoundError:
+                # Removed by another worker meanwhile
+                pass
+            finally:
+                lock.release()
+        if purged:
+            logger.info(f"Purged {purged} expired chunked uploads")
+        return purged
+
+    def part_path(self, state: UploadState) -> Path:
+        """Path of the received bytes, keeping the file's extension for parsers."""
+        return self._upload_dir(state.upload_id) / f"data{Path(state.filename).suffix.lower()}"
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            raise ChunkedUploadError(f"Upload {upload_id} not found", status_code=404)
+        return self.root / upload_id
+
+    def _acquire(self, upload_id: str) -> UploadLock:
+        return UploadLock(self._upload_dir(upload_id))
+
+
+chunked_upload_service = ChunkedUploadService()
@@ -1,12 +1,57 @@
 """Distribution processing service with exemptions."""
 
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from sqlalchemy import Row, delete, func, insert, literal, select, update
 from sqlalchemy.orm import Session, joinedload
 from ..models.distribution import Distribution
+from ..models.distribution_version import DistributionVersion
 from ..models.fund import Fund
 from ..models.enums import USJurisdiction
 from ..models.investor import Investor
+from ..utils.money import from_cents, to_cents
+from .excel_service import ParsedRow
+
+RowData = Union[ParsedRow, Dict[str, Any]]
+
+
+# Columns copied between a distribution row and its superseded versions
+VERSIONED_COLUMNS = (
+    "investor_id",
+    "session_id",
+    "fund_code",
+    "jurisdiction",
+    "amount",
+    "composite_exemption",
+    "withholding_exemption",
+    "composite_tax_amount",
+    "withholding_tax_amount",
+    "created_at",
+)
+
+
+@dataclass
+class DistributionDelta:
+    """Outcome of reconciling stored distributions with a re-uploaded file."""
+
+    inserted_ids: List[int] = field(default_factory=list)
+    updated_ids: List[int] = field(default_factory=list)
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def touched_ids(self) -> List[int]:
+        """Rows whose tax amounts need recalculating."""
+        return self.inserted_ids + self.updated_ids
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "inserted": len(self.inserted_ids),
+            "updated": len(self.updated_ids),
+            "deleted": self.deleted,
+            "unchanged": self.unchanged,
+        }
 
 
 class DistributionService:
@@ -20,7 +65,7 @@ class DistributionService:
         investor: Investor,
         session_id: str,
         fund: Fund,
-        parsed_row: Dict[str, Any]
+        parsed_row: RowData
     ) -> List[Distribution]:
         """
         Create distribution records for an investor based on parsed Excel row.
@@ -30,6 +75,70 @@ class DistributionService:
         """
         distributions = []
 
+        for jurisdiction, amount, composite_exemption, withholding_exemption in (
+            self._iter_row_distributions(parsed_row)
+        ):
+            distribution = Distribution(
+                investor_id=investor.id,
+                session_id=session_id,
+                fund_code=fund.fund_code,
+                jurisdiction=jurisdiction,
+                amount=amount,
+                composite_exemption=composite_exemption,
+                withholding_exemption=withholding_exemption,
+            )
+            distribution.fund = fund
+            distributions.append(distribution)
+
+        # Add to database
+        for distribution in distributions:
+            self.db.add(distribution)
+
+        return distributions
+
+    def bulk_create_distributions(
+        self,
+        fund: Fund,
+        session_id: str,
+        investor_rows: Iterable[Tuple[int, RowData]],
+    ) -> int:
+        """
+        Insert the distributions of many parsed rows with one executemany INSERT.
+
+        Same rows as ``create_distributions_for_investor`` per (investor id,
+        row) pair, without building ORM instances. Returns the number inserted.
+        """
+        inserts: List[Dict[str, Any]] = [
+            {
+                "investor_id": investor_id,
+                "session_id": session_id,
+                "fund_code": fund.fund_code,
+                "jurisdiction": jurisdiction,
+                "amount": amount,
+                "composite_exemption": composite,
+                "withholding_exemption": withholding,
+            }
+            for investor_id, parsed_row in investor_rows
+            for jurisdiction, amount, composite, withholding in self._iter_row_distributions(parsed_row)
+        ]
+        if inserts:
+            self.db.execute(insert(Distribution), inserts)
+        return len(inserts)
+
+    def _iter_row_distributions(
+        self, parsed_row: RowData
+    ) -> Iterator[Tuple[USJurisdiction, Decimal, bool, bool]]:
+        """Yield (jurisdiction, amount, composite, withholding) for amounts > 0."""
+        if isinstance(parsed_row, ParsedRow):
+            for state_code, cents, composite, withholding in parsed_row.iter_entries():
+                if cents > 0:
+                    try:
+                        jurisdiction = USJurisdiction(state_code)
+                    except ValueError:
+                        continue
+                    yield jurisdiction, from_cents(cents), composite, withholding
+            return
+
         # Process each state that has distribution data
         distributions_data = parsed_row.get('distributions', {})
         withholding_exemptions = parsed_row.get('withholding_exemptions', {})
@@ -44,27 +153,155 @@ class DistributionService:
                     # Skip invalid state codes
                     continue
 
-                # Get exemption flags for this state
-                withholding_exemption = withholding_exemptions.get(state_code, False)
-                composite_exemption = composite_exemptions.get(state_code, False)
-
-                distribution = Distribution(
-                    investor_id=investor.id,
-                    session_id=session_id,
-                    fund_code=fund.fund_code,
-                    jurisdiction=jurisdiction,
-                    amount=amount,
-                    composite_exemption=composite_exemption,
-                    withholding_exemption=withholding_exemption,
+                yield (
+                    jurisdiction,
+                    amount,
+                    composite_exemptions.get(state_code, False),
+                    withholding_exemptions.get(state_code, False),
                 )
-                distribution.fund = fund
-                distributions.append(distribution)
 
-        # Add to database
-        for distribution in distributions:
-            self.db.add(distribution)
+    def apply_delta(
+        self,
+        fund: Fund,
+        session_id: str,
+        investor_rows: Iterable[Tuple[int, RowData]],
+    ) -> DistributionDelta:
+        """
+        Reconcile a fund's stored distributions with a re-uploaded file.
 
-        return distributions
+        Existing rows are loaded with one keyed query on (investor, jurisdiction);
+        new rows are bulk inserted, rows whose amount or exemption flags changed
+        are bulk updated and rows missing from the file are bulk deleted. All
+        remaining rows of the fund move to ``session_id`` so the new session
+        owns the fund's current distributions. The rows as they were before
+        are kept as versions superseded by ``session_id``, which
+        :meth:`restore_superseded` puts back when that session is deleted.
+        """
+        existing = {
+            (investor_id, jurisdiction): (distribution_id, to_cents(amount), composite, withholding)
+            for distribution_id, investor_id, jurisdiction, amount, composite, withholding in self.db.execute(
+                select(
+                    Distribution.id,
+                    Distribution.investor_id,
+                    Distribution.jurisdiction,
+                    Distribution.amount,
+                    Distribution.composite_exemption,
+                    Distribution.withholding_exemption,
+                ).where(Distribution.fund_code == fund.fund_code)
+            )
+        }
+
+        delta = DistributionDelta()
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        seen = set()
+
+        for investor_id, parsed_row in investor_rows:
+            for jurisdiction, amount, composite, withholding in self._iter_row_distributions(parsed_row):
+                key = (investor_id, jurisdiction)
+                seen.add(key)
+                current = existing.get(key)
+                if current is None:
+                    inserts.append({
+                        "investor_id": investor_id,
+                        "session_id": session_id,
+                        "fund_code": fund.fund_code,
+                        "jurisdiction": jurisdiction,
+                        "amount": amount,
+                        "composite_exemption": composite,
+                        "withholding_exemption": withholding,
+                    })
+                elif current[1:] != (to_cents(amount), composite, withholding):
+                    updates.append({
+                        "id": current[0],
+                        "session_id": session_id,
+                        "amount": amount,
+                        "composite_exemption": composite,
+                        "withholding_exemption": withholding,
+                    })
+                else:
+                    delta.unchanged += 1
+
+        # Every earlier row of the fund is updated, moved or removed below
+        self.db.execute(
+            insert(DistributionVersion).from_select(
+                ["superseded_by_session_id", "distribution_id", *VERSIONED_COLUMNS],
+                select(
+                    literal(session_id),
+                    Distribution.id,
+                    *(getattr(Distribution, column) for column in VERSIONED_COLUMNS),
+                ).where(
+                    Distribution.fund_code == fund.fund_code,
+                    Distribution.session_id != session_id,
+                ),
+            )
+        )
+
+        removed_ids = [current[0] for key, current in existing.items() if key not in seen]
+        if removed_ids:
+            self.db.execute(
+                delete(Distribution)
+                .where(Distribution.id.in_(removed_ids))
+                .execution_options(synchronize_session=False)
+            )
+        if updates:
+            self.db.execute(update(Distribution), updates)
+        if inserts:
+            delta.inserted_ids = list(
+                self.db.scalars(insert(Distribution).returning(Distribution.id), inserts)
+            )
+        if delta.unchanged:
+            self.db.execute(
+                update(Distribution)
+                .where(
+                    Distribution.fund_code == fund.fund_code,
+                    Distribution.session_id != session_id,
+                )
+                .values(session_id=session_id)
+                .execution_options(synchronize_session=False)
+            )
+
+        delta.updated_ids = [row["id"] for row in updates]
+        delta.deleted = len(removed_ids)
+        return delta
+
+    def superseding_session_ids(self, session_id: str) -> List[str]:
+        """Sessions whose delta upload superseded rows of ``session_id``."""
+        return list(
+            self.db.scalars(
+                select(DistributionVersion.superseded_by_session_id)
+                .where(DistributionVersion.session_id == session_id)
+                .distinct()
+            )
+        )
+
+    def restore_superseded(self, session_id: str) -> int:
+        """Replace a delta session's rows with the versions it superseded.
+
+        The session's own rows are deleted and the fund's rows are restored,
+        under their ids, with the amounts, flags and taxes they had before
+        the delta. Returns the number of restored rows. The caller commits.
+        """
+        self.db.execute(
+            delete(Distribution)
+            .where(Distribution.session_id == session_id)
+            .execution_options(synchronize_session=False)
+        )
+        restored = self.db.execute(
+            insert(Distribution).from_select(
+                ["id", *VERSIONED_COLUMNS],
+                select(
+                    DistributionVersion.distribution_id,
+                    *(getattr(DistributionVersion, column) for column in VERSIONED_COLUMNS),
+                ).where(DistributionVersion.superseded_by_session_id == session_id),
+            )
+        ).rowcount
+        self.db.execute(
+            delete(DistributionVersion)
+            .where(DistributionVersion.superseded_by_session_id == session_id)
+            .execution_options(synchronize_session=False)
+        )
+        return restored
 
     def get_distributions_by_session(self, session_id: str) -> List[Distribution]:
         """Get all distributions for a session."""
@@ -78,6 +315,53 @@ class DistributionService:
             .all()
         )
 
+    def get_result_rows(self, session_id: str, limit: Optional[int] = None) -> List[Row]:
+        """Get a session's distributions with investor and fund period columns.
+
+        Returns plain row tuples in id order rather than ORM instances, for
+        read-only listings that serialize every row.
+        """
+        query = (
+            select(
+                Distribution.id,
+                Distribution.investor_id,
+                Investor.investor_name,
+                Investor.investor_entity_type,
+                Investor.investor_tax_state,
+                Distribution.fund_code,
+                Fund.period_quarter,
+                Fund.period_year,
+                Distribution.jurisdiction,
+                Distribution.amount,
+                Distribution.composite_exemption,
+                Distribution.withholding_exemption,
+                Distribution.composite_tax_amount,
+                Distribution.withholding_tax_amount,
+                Distribution.created_at,
+            )
+            .join(Investor, Distribution.investor_id == Investor.id)
+            .outerjoin(Fund, Distribution.fund_code == Fund.fund_code)
+            .where(Distribution.session_id == session_id)
+            .order_by(Distribution.id)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return self.db.execute(query).all()
+
+    def count_by_session(self, session_id: str) -> int:
+        """Count a session's distributions."""
+        return self.db.scalar(
+            select(func.count(Distribution.id)).where(Distribution.session_id == session_id)
+        )
+
+    def session_has_distributions(self, session_id: str) -> bool:
+        """Return True when at least one distribution exists for the session."""
+        return (
+            self.db.query(Distribution.id)
+            .filter(Distribution.session_id == session_id)
+            .first()
+            is not None
+        )
 
     def get_distributions_by_fund_period(
         self,
@@ -97,6 +381,24 @@ class DistributionService:
             .all()
         )
 
+    def _fund_period_rows(
+        self,
+        fund_code: str,
+        period_quarter: str,
+        period_year: int,
+        *columns: Any
+    ) -> List[Row]:
+        """Select only ``columns`` of a fund period's distributions."""
+        return self.db.execute(
+            select(*columns)
+            .join(Fund, Distribution.fund_code == Fund.fund_code)
+            .where(
+                Fund.fund_code == fund_code,
+                Fund.period_quarter == period_quarter,
+                Fund.period_year == period_year,
+            )
+        ).all()
+
     def calculate_total_distributions(
         self,
         fund_code: str,
@@ -104,20 +406,21 @@ class DistributionService:
         period_year: int
     ) -> Dict[str, Decimal]:
         """Calculate total distribution amounts by jurisdiction."""
-        distributions = self.get_distributions_by_fund_period(
-            fund_code, period_quarter, period_year
+        distributions = self._fund_period_rows(
+            fund_code, period_quarter, period_year,
+            Distribution.jurisdiction, Distribution.amount,
         )
 
-        totals = {"TOTAL": Decimal('0.00')}
+        # Sum in integer cents and convert once at the end
+        cents_totals = {"TOTAL": 0}
 
         for dist in distributions:
             jurisdiction_key = dist.jurisdiction.value
-            if jurisdiction_key not in totals:
-                totals[jurisdiction_key] = Decimal('0.00')
-            totals[jurisdiction_key] += dist.amount
-            totals["TOTAL"] += dist.amount
+            amount_cents = to_cents(dist.amount)
+            cents_totals[jurisdiction_key] = cents_totals.get(jurisdiction_key, 0) + amount_cents
+            cents_totals["TOTAL"] += amount_cents
 
-        return totals
+        return {key: from_cents(cents) for key, cents in cents_totals.items()}
 
     def get_exemption_summary(
         self,
@@ -126,8 +429,11 @@ class DistributionService:
         period_year: int
     ) -> Dict[str, Dict[str, int]]:
         """Get summary of exemptions by jurisdiction."""
-        distributions = self.get_distributions_by_fund_period(
-            fund_code, period_quarter, period_year
+        distributions = self._fund_period_rows(
+            fund_code, period_quarter, period_year,
+            Distribution.jurisdiction,
+            Distribution.composite_exemption,
+            Distribution.withholding_exemption,
         )
 
         summary = {}
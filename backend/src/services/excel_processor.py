@@ -1,15 +1,20 @@
 """Excel processing service for SALT rule workbooks with pandas/openpyxl."""
 
+from __future__ import annotations
+
 import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 from decimal import Decimal, InvalidOperation
-import pandas as pd
 
 from ..models.validation_issue import ValidationIssue, IssueSeverity
 from ..models.withholding_rule import WithholdingRule
 from ..models.composite_rule import CompositeRule
 from ..models.enums import USJurisdiction, InvestorEntityType
+from ..utils.lazy import lazy_import
+
+# pandas is imported on first use so API startup does not pay for it
+pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -193,8 +198,13 @@ class ExcelProcessor:
         return issues
 
 
-    def validate_state_codes(self, sheet_name: str, df: pd.DataFrame) -> List[ValidationIssue]:
-        """Validate state abbreviations against USJurisdiction enum."""
+    def validate_state_codes(
+        self, sheet_name: str, df: pd.DataFrame, limit: Optional[int] = None
+    ) -> List[ValidationIssue]:
+        """Validate state abbreviations against USJurisdiction enum.
+
+        Stops after ``limit`` issues when given.
+        """
         issues = []
 
         if "State Abbrev" not in df.columns:
@@ -216,6 +226,8 @@ class ExcelProcessor:
                     message=f"Invalid state abbreviation '{state_str}'. Must be valid US state abbreviation.",
                     field_value=state_str
                 ))
+                if limit is not None and len(issues) >= limit:
+                    break
 
         return issues
 
@@ -325,17 +337,24 @@ class ExcelProcessor:
 
         return rules
 
-    def validate_file(self, file_path: Union[str, Path]) -> ExcelValidationResult:
+    def validate_file(
+        self,
+        file_path: Union[str, Path],
+        dataframes: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> ExcelValidationResult:
         """Validate Excel file structure and basic content without processing rules.
 
         Fails fast - returns immediately upon first validation error.
+        Pass ``dataframes`` from :meth:`load_excel_file` to avoid reading the
+        workbook again.
         """
         self.validation_issues = []
         self.rule_set_id = "validation"  # Temporary ID for validation
 
         try:
             # Load Excel file
-            dataframes = self.load_excel_file(file_path)
+            if dataframes is None:
+                dataframes = self.load_excel_file(file_path)
 
             # Check for missing required sheets first - fail immediately if any are missing
             missing_sheets = set(self.REQUIRED_SHEETS) - set(dataframes.keys())
@@ -374,7 +393,7 @@ class ExcelProcessor:
                     return ExcelValidationResult(is_valid=False, errors=[error])
 
                 # Check state codes
-                state_issues = self.validate_state_codes(sheet_name, df)
+                state_issues = self.validate_state_codes(sheet_name, df, limit=1)
                 if state_issues:
                     # Return immediately on first state code error
                     issue = state_issues[0]
@@ -407,13 +426,22 @@ class ExcelProcessor:
                 }]
             )
 
-    def process_file(self, file_path: Union[str, Path], rule_set_id: str = None) -> ExcelProcessingResult:
-        """Process complete Excel file and return structured results."""
+    def process_file(
+        self,
+        file_path: Union[str, Path],
+        rule_set_id: str = None,
+        dataframes: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> ExcelProcessingResult:
+        """Process complete Excel file and return structured results.
+
+        ``dataframes`` may be passed as for :meth:`validate_file`.
+        """
         self.rule_set_id = rule_set_id
 
         try:
             # Load Excel file
-            dataframes = self.load_excel_file(file_path)
+            if dataframes is None:
+                dataframes = self.load_excel_file(file_path)
 
             withholding_rules = []
             composite_rules = []
@@ -1,17 +1,40 @@
 """Excel file validation and parsing service."""
 
+from __future__ import annotations
+
+import os
 import re
+import sys
+import time
+from array import array
+from collections import Counter
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-import pandas as pd
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Any
+from ..utils.lazy import lazy_import
 from ..models.validation_error import ErrorSeverity
 from ..models.enums import USJurisdiction, InvestorEntityType
+from ..utils.money import from_cents, parse_cents
+from ..monitoring.instrumentation import EXCEL_PARSE_THROUGHPUT, StageAccumulator, observe_stage
+
+# pandas is imported on first use so API startup does not pay for it
+pd = lazy_import("pandas")
+
+# v1.3 format pattern - uploaded as XLSX or CSV
+FILENAME_PATTERN = re.compile(
+    r"^\(Input Data\) (.+)_Q([1-4]) (\d{4}) distribution data_v[\d\.]+\.(xlsx|xls|csv)$"
+)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+THOUSANDS_SEPARATOR_PATTERN = re.compile(r'[,\s]')
 
 
 class ExcelValidationError:
     """Represents a validation error found in Excel processing."""
 
+    __slots__ = (
+        "row_number", "column_name", "error_code", "error_message", "severity", "field_value"
+    )
+
     def __init__(
         self,
         row_number: int,
@@ -29,22 +52,285 @@ class ExcelValidationError:
         self.field_value = field_value
 
 
+# Messages of value-dependent row errors, rendered only for errors that are
+# kept in detail and actually read
+ERROR_MESSAGE_TEMPLATES = {
+    "NEGATIVE_AMOUNT": "Negative amount {value} is not allowed",
+    "INVALID_NUMBER_FORMAT": "Invalid number format: {value}",
+    "INVALID_PERCENTAGE_FORMAT": "Invalid percentage format: {value}",
+    "INVALID_ENTITY_TYPE": "Invalid entity type: {value}",
+    "INVALID_STATE_CODE": "Invalid state code: {value}",
+}
+
+# Errors kept in full per error code; further errors of a code are only counted
+ERROR_DETAIL_PER_CODE = int(os.getenv("VALIDATION_ERRORS_PER_CODE", "50"))
+
+# Largest file accepted by a direct upload; chunked uploads pass their own limit
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+class ErrorStore:
+    """Compact, capped accumulator of validation errors.
+
+    Errors are stored column-wise in ``array``s of small integers: row
+    number, column id, kind id (code and severity), value id and message id,
+    where the ids index tables of distinct strings. Only the first
+    ``detail_per_code`` errors of each code are stored; counts per code and
+    per severity stay exact for all of them. Messages of template-based
+    errors are rendered when the errors are iterated.
+
+    With ``limit`` (validate-only runs) :attr:`limit_reached` tells the
+    caller to stop checking once that many errors were seen.
+    """
+
+    def __init__(
+        self,
+        detail_per_code: Optional[int] = None,
+        limit: Optional[int] = None,
+    ):
+        self.detail_per_code = (
+            ERROR_DETAIL_PER_CODE if detail_per_code is None else detail_per_code
+        )
+        self.limit = limit
+        self.counts: Counter = Counter()
+        self.severity_counts: Counter = Counter()
+        # Exact counts per (code, severity), saved with the session
+        self.kind_counts: Counter = Counter()
+        self.total = 0
+
+        self._rows = array("i")
+        self._columns = array("H")
+        self._kinds = array("H")
+        self._values = array("i")
+        self._messages = array("i")
+
+        self._column_ids: Dict[str, int] = {}
+        self._column_names: List[str] = []
+        self._kind_ids: Dict[Tuple[str, ErrorSeverity], int] = {}
+        self._kind_list: List[Tuple[str, ErrorSeverity]] = []
+        self._value_list: List[str] = []
+        self._message_ids: Dict[str, int] = {}
+        self._message_list: List[str] = []
+
+    def add(
+        self,
+        row_number: int,
+        column_name: str,
+        error_code: str,
+        severity: ErrorSeverity = ErrorSeverity.ERROR,
+        field_value: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Record an error; ``message`` defaults to the code's template."""
+        self.total += 1
+        self.counts[error_code] += 1
+        self.severity_counts[severity] += 1
+        self.kind_counts[(error_code, severity)] += 1
+        if self.counts[error_code] > self.detail_per_code:
+            return
+
+        column_id = self._column_ids.get(column_name)
+        if column_id is None:
+            column_id = self._column_ids[column_name] = len(self._column_names)
+            self._column_names.append(column_name)
+        kind = (error_code, severity)
+        kind_id = self._kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self._kind_ids[kind] = len(self._kind_list)
+            self._kind_list.append(kind)
+        if field_value is None:
+            value_id = -1
+        else:
+            value_id = len(self._value_list)
+            self._value_list.append(field_value)
+        if message is None:
+            message_id = -1
+        else:
+            message_id = self._message_ids.get(message)
+            if message_id is None:
+                message_id = self._message_ids[message] = len(self._message_list)
+                self._message_list.append(message)
+
+        self._rows.append(row_number)
+        self._columns.append(column_id)
+        self._kinds.append(kind_id)
+        self._values.append(value_id)
+        self._messages.append(message_id)
+
+    def append(self, error: ExcelValidationError) -> None:
+        """Record an already built error (list-compatible)."""
+        self.add(
+            error.row_number,
+            error.column_name,
+            error.error_code,
+            error.severity,
+            error.field_value,
+            error.error_message,
+        )
+
+    def _render(self, position: int) -> ExcelValidationError:
+        error_code, severity = self._kind_list[self._kinds[position]]
+        value_id = self._values[position]
+        field_value = self._value_list[value_id] if value_id >= 0 else None
+        message_id = self._messages[position]
+        if message_id >= 0:
+            message = self._message_list[message_id]
+        else:
+            message = ERROR_MESSAGE_TEMPLATES[error_code].format(value=field_value)
+        return ExcelValidationError(
+            row_number=self._rows[position],
+            column_name=self._column_names[self._columns[position]],
+            error_code=error_code,
+            error_message=message,
+            severity=severity,
+            field_value=field_value,
+        )
+
+    def __iter__(self) -> Iterator[ExcelValidationError]:
+        for position in range(len(self._rows)):
+            yield self._render(position)
+
+    def __len__(self) -> int:
+        """Number of errors kept in detail (see :attr:`total` for all)."""
+        return len(self._rows)
+
+    def of_severity(self, severity: ErrorSeverity) -> List[ExcelValidationError]:
+        """Kept errors of one severity, rendered."""
+        return [error for error in self if error.severity == severity]
+
+    @property
+    def truncated(self) -> bool:
+        """True when some errors were counted but not kept in detail."""
+        return self.total > len(self._rows)
+
+    @property
+    def limit_reached(self) -> bool:
+        return self.limit is not None and self.total >= self.limit
+
+
+class ParsedRow:
+    """A valid investor row holding only the jurisdictions with a non-zero amount.
+
+    Amounts are kept as integer cents in an ``array`` and exemption flags as
+    one byte per jurisdiction, so a row costs a few hundred bytes instead of
+    three dicts over every detected state. Read access by key mirrors the
+    former dict layout (``row["distributions"]`` etc.); the derived dicts
+    are built on demand and only cover the kept jurisdictions.
+    """
+
+    __slots__ = (
+        "investor_name",
+        "investor_entity_type",
+        "investor_tax_state",
+        "row_number",
+        "commitment_percentage",
+        "states",
+        "amounts_cents",
+        "flags",
+    )
+
+    COMPOSITE_EXEMPT = 1
+    WITHHOLDING_EXEMPT = 2
+
+    _FIELDS = frozenset(__slots__[:5])
+    _VIEWS = ("distributions", "withholding_exemptions", "composite_exemptions")
+
+    def __init__(
+        self,
+        investor_name: str,
+        investor_entity_type: str,
+        investor_tax_state: str,
+        row_number: int,
+        commitment_percentage: Optional[Decimal] = None,
+        states: Sequence[str] = (),
+        amounts_cents: Optional[array] = None,
+        flags: bytes = b"",
+    ):
+        self.investor_name = investor_name
+        self.investor_entity_type = investor_entity_type
+        self.investor_tax_state = investor_tax_state
+        self.row_number = row_number
+        self.commitment_percentage = commitment_percentage
+        self.states = tuple(states)
+        self.amounts_cents = amounts_cents if amounts_cents is not None else array("q")
+        self.flags = bytes(flags)
+
+    def iter_entries(self) -> Iterator[Tuple[str, int, bool, bool]]:
+        """Yield (state, amount_cents, composite_exemption, withholding_exemption)."""
+        for state, cents, flag in zip(self.states, self.amounts_cents, self.flags):
+            yield (
+                state,
+                cents,
+                bool(flag & self.COMPOSITE_EXEMPT),
+                bool(flag & self.WITHHOLDING_EXEMPT),
+            )
+
+    @property
+    def distributions(self) -> Dict[str, Decimal]:
+        return {state: from_cents(cents) for state, cents in zip(self.states, self.amounts_cents)}
+
+    @property
+    def withholding_exemptions(self) -> Dict[str, bool]:
+        return {
+            state: bool(flag & self.WITHHOLDING_EXEMPT)
+            for state, flag in zip(self.states, self.flags)
+        }
+
+    @property
+    def composite_exemptions(self) -> Dict[str, bool]:
+        return {
+            state: bool(flag & self.COMPOSITE_EXEMPT)
+            for state, flag in zip(self.states, self.flags)
+        }
+
+    def keys(self) -> Tuple[str, ...]:
+        return (*self.__slots__[:5], *self._VIEWS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS or key in self._VIEWS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELDS or key in self._VIEWS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ParsedRow):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ParsedRow(row={self.row_number}, investor='{self.investor_name}', "
+            f"states={list(self.states)})>"
+        )
+
+
 class ExcelParsingResult:
     """Result of Excel parsing operation."""
 
     def __init__(
         self,
-        data: List[Dict[str, Any]],
-        errors: List[ExcelValidationError],
+        data: List[ParsedRow],
+        errors: ErrorStore,
         fund_info: Dict[str, str],
         total_rows: int,
-        valid_rows: int
+        valid_rows: int,
+        stage_timings: Optional[Dict[str, float]] = None
     ):
         self.data = data
         self.errors = errors
         self.fund_info = fund_info
         self.total_rows = total_rows
         self.valid_rows = valid_rows
+        # Seconds spent in each parsing stage (read_file, validate_headers, parse_rows)
+        self.stage_timings = stage_timings or {}
 
 
 class ExcelService:
@@ -64,21 +350,27 @@ class ExcelService:
     # Valid US state codes
     VALID_STATE_CODES = {state.value for state in USJurisdiction}
 
-    def __init__(self):
-        self.errors: List[ExcelValidationError] = []
+    # Rows per chunk when streaming CSV input
+    CSV_CHUNK_ROWS = 10000
+
+    # Largest number of investor rows accepted in one file
+    MAX_ROWS = 50000
+
+    def __init__(self, max_file_size: int = MAX_FILE_SIZE):
+        self.max_file_size = max_file_size
+        self.errors = ErrorStore()
         self.detected_columns: Dict[str, Dict[str, str]] = {
             'distribution': {},
             'withholding_exemption': {},
             'composite_exemption': {}
         }
         self._seen_investors = set()
+        self._stages = StageAccumulator()
 
 
     def extract_fund_info_from_filename(self, filename: str) -> Optional[Dict[str, str]]:
         """Extract fund code, quarter, and year from filename."""
-        # v1.3 format pattern - uploaded as XLSX but following CSV naming convention
-        pattern = r"^\(Input Data\) (.+)_Q([1-4]) (\d{4}) distribution data_v[\d\.]+\.(xlsx|xls)$"
-        match = re.match(pattern, filename)
+        match = FILENAME_PATTERN.match(filename)
 
         if match:
             fund_code, quarter, year, extension = match.groups()
@@ -92,16 +384,15 @@ class ExcelService:
         return None
 
     def validate_file_size(self, file_path: Path) -> bool:
-        """Validate file size (max 10MB)."""
+        """Validate file size against ``max_file_size``."""
         file_size = file_path.stat().st_size
-        max_size = 10 * 1024 * 1024  # 10MB
 
-        if file_size > max_size:
+        if file_size > self.max_file_size:
             self.errors.append(ExcelValidationError(
                 row_number=0,
                 column_name="file",
                 error_code="FILE_SIZE_EXCEEDED",
-                error_message=f"File size {file_size} bytes exceeds 10MB limit",
+                error_message=f"File size {file_size} bytes exceeds {self.max_file_size // (1024 * 1024)}MB limit",
                 severity=ErrorSeverity.ERROR
             ))
             return False
@@ -109,7 +400,7 @@ class ExcelService:
 
     def normalize_header(self, header: str) -> str:
         """Normalize header by trimming and collapsing whitespace."""
-        return re.sub(r'\s+', ' ', str(header).strip())
+        return WHITESPACE_PATTERN.sub(' ', str(header).strip())
 
     def detect_dynamic_columns(self, df: pd.DataFrame) -> bool:
         """Detect distribution, withholding exemption, and composite exemption columns by pattern."""
@@ -189,39 +480,29 @@ class ExcelService:
         return True
 
     def parse_numeric_value(self, value: Any, column_name: str, row_num: int) -> Decimal:
-        """Parse numeric value with thousands separators and parentheses."""
+        """Parse numeric value with thousands separators and parentheses, rounded to cents."""
+        return from_cents(self.parse_amount_cents(value, column_name, row_num))
+
+    def parse_amount_cents(self, value: Any, column_name: str, row_num: int) -> int:
+        """Parse an amount cell to integer cents (0 when empty or invalid, with an error)."""
         if pd.isna(value) or value == "":
-            return Decimal('0.00')
+            return 0
 
         str_value = str(value).strip()
 
         # Handle parentheses (negative values - which are invalid)
         if str_value.startswith('(') and str_value.endswith(')'):
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name=column_name,
-                error_code="NEGATIVE_AMOUNT",
-                error_message=f"Negative amount {str_value} is not allowed",
-                severity=ErrorSeverity.ERROR,
-                field_value=str_value
-            ))
-            return Decimal('0.00')
+            self.errors.add(row_num, column_name, "NEGATIVE_AMOUNT", field_value=str_value)
+            return 0
 
         # Remove thousands separators and spaces
-        cleaned_value = re.sub(r'[,\s]', '', str_value)
+        cleaned_value = THOUSANDS_SEPARATOR_PATTERN.sub('', str_value)
 
-        try:
-            return Decimal(cleaned_value)
-        except (InvalidOperation, ValueError):
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name=column_name,
-                error_code="INVALID_NUMBER_FORMAT",
-                error_message=f"Invalid number format: {str_value}",
-                severity=ErrorSeverity.ERROR,
-                field_value=str_value
-            ))
-            return Decimal('0.00')
+        cents = parse_cents(cleaned_value)
+        if cents is None:
+            self.errors.add(row_num, column_name, "INVALID_NUMBER_FORMAT", field_value=str_value)
+            return 0
+        return cents
 
     def parse_exemption_value(self, value: Any) -> bool:
         """Parse exemption field value to boolean."""
@@ -238,13 +519,10 @@ class ExcelService:
     ) -> Optional[Decimal]:
         """Parse commitment percentage ensuring required format and bounds."""
         if pd.isna(value) or str(value).strip() == "":
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name='Commitment Percentage',
-                error_code="EMPTY_FIELD",
-                error_message="Commitment Percentage is required",
-                severity=ErrorSeverity.ERROR
-            ))
+            self.errors.add(
+                row_num, 'Commitment Percentage', "EMPTY_FIELD",
+                message="Commitment Percentage is required",
+            )
             return None
 
         str_value = str(value).strip().replace('%', '')
@@ -252,27 +530,19 @@ class ExcelService:
         try:
             decimal_value = Decimal(str_value)
         except (InvalidOperation, ValueError):
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name='Commitment Percentage',
-                error_code="INVALID_PERCENTAGE_FORMAT",
-                error_message=f"Invalid percentage format: {str_value}",
-                severity=ErrorSeverity.ERROR,
-                field_value=str_value
-            ))
+            self.errors.add(
+                row_num, 'Commitment Percentage', "INVALID_PERCENTAGE_FORMAT", field_value=str_value
+            )
             return None
 
         normalized_value = decimal_value.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
 
         if normalized_value < Decimal('0') or normalized_value > Decimal('100'):
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name='Commitment Percentage',
-                error_code="PERCENTAGE_OUT_OF_RANGE",
-                error_message="Commitment Percentage must be between 0 and 100",
-                severity=ErrorSeverity.ERROR,
-                field_value=str(normalized_value)
-            ))
+            self.errors.add(
+                row_num, 'Commitment Percentage', "PERCENTAGE_OUT_OF_RANGE",
+                field_value=str(normalized_value),
+                message="Commitment Percentage must be between 0 and 100",
+            )
             return None
 
         return normalized_value
@@ -284,39 +554,21 @@ class ExcelService:
         # Validate investor name
         investor_name = str(row_data.get('Investor Name', '')).strip()
         if not investor_name:
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name='Investor Name',
-                error_code="EMPTY_FIELD",
-                error_message="Investor Name cannot be empty",
-                severity=ErrorSeverity.ERROR
-            ))
+            self.errors.add(
+                row_num, 'Investor Name', "EMPTY_FIELD", message="Investor Name cannot be empty"
+            )
             is_valid = False
 
         # Validate entity type
         entity_type = str(row_data.get('Investor Entity Type', '')).strip()
         if entity_type not in self.VALID_ENTITY_TYPES:
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name='Investor Entity Type',
-                error_code="INVALID_ENTITY_TYPE",
-                error_message=f"Invalid entity type: {entity_type}",
-                severity=ErrorSeverity.ERROR,
-                field_value=entity_type
-            ))
+            self.errors.add(row_num, 'Investor Entity Type', "INVALID_ENTITY_TYPE", field_value=entity_type)
             is_valid = False
 
         # Validate tax state
         tax_state = str(row_data.get('Investor Tax State', '')).strip().upper()
         if tax_state not in self.VALID_STATE_CODES:
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name='Investor Tax State',
-                error_code="INVALID_STATE_CODE",
-                error_message=f"Invalid state code: {tax_state}",
-                severity=ErrorSeverity.ERROR,
-                field_value=tax_state
-            ))
+            self.errors.add(row_num, 'Investor Tax State', "INVALID_STATE_CODE", field_value=tax_state)
             is_valid = False
 
         parsed_commitment = self._parse_and_validate_commitment_percentage(
@@ -341,13 +593,10 @@ class ExcelService:
                 str(row_data.get('Investor Tax State', '')).strip().upper()
             )
             if investor_key in self._seen_investors:
-                self.errors.append(ExcelValidationError(
-                    row_number=row_num,
-                    column_name='Investor Name',
-                    error_code="DUPLICATE_INVESTOR",
-                    error_message="Duplicate investor rows detected in upload",
-                    severity=ErrorSeverity.ERROR
-                ))
+                self.errors.add(
+                    row_num, 'Investor Name', "DUPLICATE_INVESTOR",
+                    message="Duplicate investor rows detected in upload",
+                )
                 is_valid = False
             else:
                 self._seen_investors.add(investor_key)
@@ -361,51 +610,143 @@ class ExcelService:
                 break
 
         if not has_distribution:
-            self.errors.append(ExcelValidationError(
-                row_number=row_num,
-                column_name='Distribution Amounts',
-                error_code="ZERO_DISTRIBUTIONS",
-                error_message="At least one distribution amount must be greater than 0",
-                severity=ErrorSeverity.ERROR
-            ))
+            self.errors.add(
+                row_num, 'Distribution Amounts', "ZERO_DISTRIBUTIONS",
+                message="At least one distribution amount must be greater than 0",
+            )
             is_valid = False
 
         return is_valid
 
-    def parse_row(self, row_data: Dict[str, Any], row_num: int) -> Dict[str, Any]:
-        """Parse row data for v1.3 format."""
-        parsed_row = {
-            'investor_name': str(row_data['Investor Name']).strip(),
-            'investor_entity_type': str(row_data['Investor Entity Type']).strip(),
-            'investor_tax_state': str(row_data['Investor Tax State']).strip().upper(),
-            'row_number': row_num
-        }
+    def parse_row(self, row_data: Dict[str, Any], row_num: int) -> ParsedRow:
+        """Parse row data for v1.3 format, keeping only non-zero amounts.
 
-        parsed_row['commitment_percentage'] = row_data.get('_parsed_commitment_percentage')
+        Every amount cell is still parsed so format errors are reported;
+        exemption cells are read only for the jurisdictions that are kept.
+        """
+        states: List[str] = []
+        amounts_cents = array("q")
+        flags = bytearray()
+        withholding_columns = self.detected_columns['withholding_exemption']
+        composite_columns = self.detected_columns['composite_exemption']
 
-        # Parse distribution amounts by state
-        parsed_row['distributions'] = {}
         for state, col_name in self.detected_columns['distribution'].items():
-            amount = self.parse_numeric_value(row_data.get(col_name), col_name, row_num)
-            parsed_row['distributions'][state] = amount
-
-        # Parse withholding exemptions by state
-        parsed_row['withholding_exemptions'] = {}
-        for state, col_name in self.detected_columns['withholding_exemption'].items():
-            exemption = self.parse_exemption_value(row_data.get(col_name))
-            parsed_row['withholding_exemptions'][state] = exemption
-
-        # Parse composite exemptions by state
-        parsed_row['composite_exemptions'] = {}
-        for state, col_name in self.detected_columns['composite_exemption'].items():
-            exemption = self.parse_exemption_value(row_data.get(col_name))
-            parsed_row['composite_exemptions'][state] = exemption
+            cents = self.parse_amount_cents(row_data.get(col_name), col_name, row_num)
+            if not cents:
+                continue
+            flag = 0
+            composite_column = composite_columns.get(state)
+            if composite_column and self.parse_exemption_value(row_data.get(composite_column)):
+                flag |= ParsedRow.COMPOSITE_EXEMPT
+            withholding_column = withholding_columns.get(state)
+            if withholding_column and self.parse_exemption_value(row_data.get(withholding_column)):
+                flag |= ParsedRow.WITHHOLDING_EXEMPT
+            states.append(state)
+            amounts_cents.append(cents)
+            flags.append(flag)
+
+        return ParsedRow(
+            investor_name=str(row_data['Investor Name']).strip(),
+            # Few distinct values across rows; share one string object each
+            investor_entity_type=sys.intern(str(row_data['Investor Entity Type']).strip()),
+            investor_tax_state=sys.intern(str(row_data['Investor Tax State']).strip().upper()),
+            row_number=row_num,
+            commitment_percentage=row_data.get('_parsed_commitment_percentage'),
+            states=states,
+            amounts_cents=amounts_cents,
+            flags=flags,
+        )
 
-        return parsed_row
+    def _drop_blank_investor_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove rows where Investor Name is empty."""
+        df = df.dropna(subset=['Investor Name'])
+        return df[df['Investor Name'].astype(str).str.strip() != '']
+
+    def iter_csv_chunks(self, file_path: Path) -> Iterator[pd.DataFrame]:
+        """Read a v1.3 CSV export in frames of ``CSV_CHUNK_ROWS`` rows.
+
+        Uses the C parser with every column read as text (amounts keep their
+        thousands separators for ``parse_numeric_value``), skips unnamed
+        trailing columns and drops blank investor rows. The index continues
+        across chunks in file order, so row numbers match the Excel path.
+        Only one chunk is held at a time.
+        """
+        reader = pd.read_csv(
+            file_path,
+            engine="c",
+            encoding="utf-8-sig",
+            dtype=str,
+            usecols=lambda name: not str(name).startswith("Unnamed:"),
+            skip_blank_lines=False,
+            chunksize=self.CSV_CHUNK_ROWS,
+        )
+        with reader:
+            for chunk in reader:
+                yield self._drop_blank_investor_rows(chunk)
+
+    def _iter_excel_frames(self, file_path: Path) -> Iterator[pd.DataFrame]:
+        # The first worksheet is read whole
+        yield self._drop_blank_investor_rows(pd.read_excel(file_path, sheet_name=0))
+
+    def read_header_frame(self, file_path: Path, file_extension: str) -> pd.DataFrame:
+        """Read only the header row, as an empty frame with the file's columns."""
+        if file_extension == "csv":
+            return pd.read_csv(
+                file_path,
+                encoding="utf-8-sig",
+                dtype=str,
+                usecols=lambda name: not str(name).startswith("Unnamed:"),
+                nrows=0,
+            )
+        return pd.read_excel(file_path, sheet_name=0, nrows=0)
+
+    def validate_file(
+        self, file_path: Path, original_filename: str, max_errors: int
+    ) -> ExcelParsingResult:
+        """Validate a file without keeping parsed rows (dry run).
+
+        Header problems are reported from the header row alone, before the
+        data rows are read. Row validation stops once ``max_errors`` errors
+        have been seen; ``result.errors`` is an :class:`ErrorStore` holding
+        at most ``max_errors`` errors in detail and exact per-code counts.
+        """
+        start = time.perf_counter()
+        self._stages = StageAccumulator()
+        result = self._parse_excel_file(file_path, original_filename, max_errors=max_errors)
+        result.stage_timings = self._stages.flush()
+        observe_stage("excel_validate", time.perf_counter() - start, items=result.total_rows)
+        return result
 
     def parse_excel_file(self, file_path: Path, original_filename: str) -> ExcelParsingResult:
-        """Parse Excel file and validate data (v1.3 format)."""
-        self.errors = []  # Reset errors
+        """Parse an Excel or CSV file and validate data (v1.3 format)."""
+        start = time.perf_counter()
+        self._stages = StageAccumulator()
+        result = self._parse_excel_file(file_path, original_filename)
+        elapsed = time.perf_counter() - start
+
+        result.stage_timings = self._stages.flush()
+        observe_stage("excel_parse", elapsed, items=result.total_rows)
+        if result.total_rows and elapsed > 0:
+            EXCEL_PARSE_THROUGHPUT.observe(result.total_rows / elapsed)
+        return result
+
+    def _parse_excel_file(
+        self,
+        file_path: Path,
+        original_filename: str,
+        max_errors: Optional[int] = None,
+    ) -> ExcelParsingResult:
+        """Run file, header and row validation and build the parsing result.
+
+        With ``max_errors`` (validate-only mode) headers are checked before
+        the rows are read, rows stop being checked once the error limit is
+        reached and parsed rows are not kept.
+        """
+        validate_only = max_errors is not None
+        # Reset errors
+        self.errors = (
+            ErrorStore(detail_per_code=max_errors, limit=max_errors) if validate_only else ErrorStore()
+        )
         self._seen_investors = set()
 
         # Validate file size
@@ -424,49 +765,87 @@ class ExcelService:
             ))
             return ExcelParsingResult([], self.errors, {}, 0, 0)
 
+        file_kind = "CSV" if fund_info["file_extension"] == "csv" else "Excel"
         try:
-            # Read Excel file (first worksheet)
-            df = pd.read_excel(file_path, sheet_name=0)
-            # Remove rows where Investor Name is empty
-            df = df.dropna(subset=['Investor Name'])
-            df = df[df['Investor Name'].astype(str).str.strip() != '']
-
-            # Check row limit
-            if len(df) > 50000:
+            # CSV headers are checked from the header row before streaming
+            # the rows; a full Excel parse checks them on the loaded sheet
+            headers_checked = validate_only or file_kind == "CSV"
+            if headers_checked:
+                with self._stages.track("validate_headers"):
+                    header_frame = self.read_header_frame(file_path, fund_info["file_extension"])
+                    if not self.validate_headers(header_frame):
+                        return ExcelParsingResult([], self.errors, fund_info, 0, 0)
+
+            frames = (
+                self.iter_csv_chunks(file_path)
+                if file_kind == "CSV"
+                else self._iter_excel_frames(file_path)
+            )
+            normalized_columns = None
+            valid_data = []
+            valid_row_count = 0
+            total_rows = 0
+            # Rows are still counted once checking stops, for total_rows
+            checking = True
+
+            while True:
+                with self._stages.track("read_file"):
+                    df = next(frames, None)
+                if df is None:
+                    break
+                total_rows += len(df)
+                if total_rows > self.MAX_ROWS:
+                    checking = False
+                    valid_data = []
+                if not checking:
+                    continue
+
+                if not headers_checked:
+                    with self._stages.track("validate_headers"):
+                        if not self.validate_headers(df):
+                            return ExcelParsingResult([], self.errors, fund_info, len(df), 0)
+                    headers_checked = True
+
+                # Normalize column names
+                if normalized_columns is None:
+                    normalized_columns = [self.normalize_header(col) for col in df.columns]
+                df.columns = normalized_columns
+
+                with self._stages.track("parse_rows"):
+                    for idx, row in df.iterrows():
+                        row_num = idx + 2  # Excel row number (1-indexed + header)
+                        row_data = row.to_dict()
+
+                        if self.validate_row_data(row_data, row_num):
+                            # Parsing also reports amount format errors
+                            parsed_row = self.parse_row(row_data, row_num)
+                            valid_row_count += 1
+                            if not validate_only:
+                                valid_data.append(parsed_row)
+
+                        if validate_only and self.errors.limit_reached:
+                            checking = False
+                            break
+
+            # Check row limit; errors of the rows checked so far are dropped
+            if total_rows > self.MAX_ROWS:
+                self.errors = ErrorStore(
+                    detail_per_code=self.errors.detail_per_code, limit=self.errors.limit
+                )
                 self.errors.append(ExcelValidationError(
                     row_number=0,
                     column_name="file",
                     error_code="ROW_LIMIT_EXCEEDED",
-                    error_message=f"File has {len(df)} rows, exceeding 50,000 row limit",
+                    error_message=f"File has {total_rows} rows, exceeding {self.MAX_ROWS:,} row limit",
                     severity=ErrorSeverity.ERROR
                 ))
-                return ExcelParsingResult([], self.errors, fund_info, len(df), 0)
-
-            # Validate headers
-            if not self.validate_headers(df):
-                return ExcelParsingResult([], self.errors, fund_info, len(df), 0)
-
-            # Normalize column names
-            df.columns = [self.normalize_header(col) for col in df.columns]
-
-            # Process each row
-            valid_data = []
-            valid_row_count = 0
-
-            for idx, row in df.iterrows():
-                row_num = idx + 2  # Excel row number (1-indexed + header)
-                row_data = row.to_dict()
-
-                if self.validate_row_data(row_data, row_num):
-                    parsed_row = self.parse_row(row_data, row_num)
-                    valid_data.append(parsed_row)
-                    valid_row_count += 1
+                return ExcelParsingResult([], self.errors, fund_info, total_rows, 0)
 
             return ExcelParsingResult(
                 data=valid_data,
                 errors=self.errors,
                 fund_info=fund_info,
-                total_rows=len(df),
+                total_rows=total_rows,
                 valid_rows=valid_row_count
             )
 
@@ -475,7 +854,7 @@ class ExcelService:
                 row_number=0,
                 column_name="file",
                 error_code="FAILED_PARSING",
-                error_message=f"Failed to parse Excel file: {str(e)}",
+                error_message=f"Failed to parse {file_kind} file: {str(e)}",
                 severity=ErrorSeverity.ERROR
             ))
             return ExcelParsingResult([], self.errors, fund_info or {}, 0, 0)
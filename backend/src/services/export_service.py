@@ -0,0 +1,310 @@
+"""Streaming Excel export service for session results and tax reports."""
+
+import logging
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models.distribution import Distribution
+from ..models.enums import InvestorEntityType
+from ..models.fund import Fund
+from ..models.investor import Investor
+from .tax_calculation_service import RuleContext
+
+logger = logging.getLogger(__name__)
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Number formats applied to numeric cells
+MONEY_FORMAT = "#,##0.00"
+RATE_FORMAT = "0.0000"
+COUNT_FORMAT = "#,##0"
+
+# Rows fetched per database round trip while streaming
+FETCH_BATCH_SIZE = 2000
+
+RESULTS_COLUMNS: List[Tuple[str, Optional[str], int]] = [
+    ("Investor Name", None, 36),
+    ("Entity Type", None, 28),
+    ("Tax State", None, 10),
+    ("Fund Code", None, 14),
+    ("Period", None, 10),
+    ("Jurisdiction", None, 12),
+    ("Distribution Amount", MONEY_FORMAT, 20),
+    ("Composite Exemption", None, 20),
+    ("Withholding Exemption", None, 22),
+    ("Composite Tax Amount", MONEY_FORMAT, 20),
+    ("Withholding Tax Amount", MONEY_FORMAT, 22),
+    ("Created Date", None, 20),
+]
+
+REPORT_COLUMNS: List[Tuple[str, Optional[str], int]] = [
+    ("Investor Name", None, 36),
+    ("Entity Type", None, 28),
+    ("Investor Tax State", None, 18),
+    ("Jurisdiction", None, 12),
+    ("Distribution Amount", MONEY_FORMAT, 20),
+    ("Composite Exemption", None, 20),
+    ("Withholding Exemption", None, 22),
+    ("Composite Tax Amount", MONEY_FORMAT, 20),
+    ("Withholding Tax Amount", MONEY_FORMAT, 22),
+    ("Applied Tax", None, 12),
+    ("Composite Rule ID", None, 38),
+    ("Composite Rate", RATE_FORMAT, 14),
+    ("Composite Income Threshold", MONEY_FORMAT, 26),
+    ("Composite Mandatory Filing", None, 26),
+    ("Withholding Rule ID", None, 38),
+    ("Withholding Rate", RATE_FORMAT, 16),
+    ("Withholding Income Threshold", MONEY_FORMAT, 28),
+    ("Withholding Tax Threshold", MONEY_FORMAT, 26),
+]
+
+SUMMARY_COLUMNS: List[Tuple[str, Optional[str], int]] = [
+    ("Jurisdiction", None, 12),
+    ("Distributions", COUNT_FORMAT, 14),
+    ("Distribution Amount", MONEY_FORMAT, 20),
+    ("Composite Tax Amount", MONEY_FORMAT, 20),
+    ("Withholding Tax Amount", MONEY_FORMAT, 22),
+]
+
+
+class ExcelExportService:
+    """Build xlsx exports with openpyxl's write-only workbook.
+
+    Rows are streamed from the database in batches and appended directly to
+    per-jurisdiction worksheets, so memory stays bounded regardless of the
+    number of distributions in a session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def write_results_workbook(self, session_id: str, destination: Path) -> int:
+        """Write session results to ``destination`` and return the row count."""
+        workbook, styles = self._new_workbook()
+        self._write_summary_sheet(workbook, styles, session_id)
+
+        row_count = 0
+        for _, sheet_rows in self._rows_by_jurisdiction(session_id):
+            worksheet = None
+            for row in sheet_rows:
+                if worksheet is None:
+                    worksheet = self._create_sheet(
+                        workbook, styles, row.jurisdiction.value, RESULTS_COLUMNS
+                    )
+                worksheet.append(self._format_results_row(row, worksheet))
+                row_count += 1
+
+        workbook.save(destination)
+        logger.info(f"Wrote {row_count} result rows to {destination}")
+        return row_count
+
+    def write_report_workbook(
+        self,
+        session_id: str,
+        destination: Path,
+        rule_context: Optional[RuleContext],
+    ) -> int:
+        """Write the tax calculation report to ``destination`` and return the row count."""
+        workbook, styles = self._new_workbook()
+        self._write_summary_sheet(workbook, styles, session_id)
+
+        row_count = 0
+        for _, sheet_rows in self._rows_by_jurisdiction(session_id):
+            worksheet = None
+            for row in sheet_rows:
+                if worksheet is None:
+                    worksheet = self._create_sheet(
+                        workbook, styles, row.jurisdiction.value, REPORT_COLUMNS
+                    )
+                worksheet.append(
+                    self._format_report_row(row, rule_context, worksheet)
+                )
+                row_count += 1
+
+        workbook.save(destination)
+        logger.info(f"Wrote {row_count} report rows to {destination}")
+        return row_count
+
+    def _new_workbook(self):
+        """Create a write-only workbook along with reusable cell styles."""
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+
+        workbook = Workbook(write_only=True)
+        styles = {"header_font": Font(bold=True)}
+        return workbook, styles
+
+    def _create_sheet(
+        self,
+        workbook,
+        styles: dict,
+        title: str,
+        columns: Sequence[Tuple[str, Optional[str], int]],
+    ):
+        """Create a worksheet with column widths, frozen header and header row."""
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+
+        worksheet = workbook.create_sheet(title=title)
+        worksheet.freeze_panes = "A2"
+        for index, (_, _, width) in enumerate(columns, start=1):
+            worksheet.column_dimensions[get_column_letter(index)].width = width
+
+        header = []
+        for name, _, _ in columns:
+            cell = WriteOnlyCell(worksheet, value=name)
+            cell.font = styles["header_font"]
+            header.append(cell)
+        worksheet.append(header)
+
+        return worksheet
+
+    def _numeric_cell(self, worksheet, value: Any, number_format: str):
+        """Build a typed numeric cell, leaving missing values blank."""
+        from openpyxl.cell import WriteOnlyCell
+
+        if value is None:
+            return None
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.number_format = number_format
+        return cell
+
+    def _write_summary_sheet(self, workbook, styles: dict, session_id: str) -> None:
+        """Write per-jurisdiction totals computed with a single aggregate query."""
+        worksheet = self._create_sheet(workbook, styles, "Summary", SUMMARY_COLUMNS)
+        totals = self.db.execute(
+            select(
+                Distribution.jurisdiction,
+                func.count(Distribution.id),
+                func.sum(Distribution.amount),
+                func.sum(Distribution.composite_tax_amount),
+                func.sum(Distribution.withholding_tax_amount),
+            )
+            .where(Distribution.session_id == session_id)
+            .group_by(Distribution.jurisdiction)
+            .order_by(Distribution.jurisdiction)
+        )
+        for jurisdiction, count, amount, composite, withholding in totals:
+            worksheet.append([
+                jurisdiction.value,
+                self._numeric_cell(worksheet, count, COUNT_FORMAT),
+                self._numeric_cell(worksheet, amount, MONEY_FORMAT),
+                self._numeric_cell(worksheet, composite, MONEY_FORMAT),
+                self._numeric_cell(worksheet, withholding, MONEY_FORMAT),
+            ])
+
+    def _rows_by_jurisdiction(self, session_id: str) -> Iterator[Tuple[str, Iterator[Any]]]:
+        """Stream session rows ordered by jurisdiction, grouped lazily per jurisdiction."""
+        from itertools import groupby
+
+        statement = (
+            select(
+                Investor.investor_name,
+                Investor.investor_entity_type,
+                Investor.investor_tax_state,
+                Distribution.fund_code,
+                Fund.period_quarter,
+                Fund.period_year,
+                Distribution.jurisdiction,
+                Distribution.amount,
+                Distribution.composite_exemption,
+                Distribution.withholding_exemption,
+                Distribution.composite_tax_amount,
+                Distribution.withholding_tax_amount,
+                Distribution.created_at,
+            )
+            .join(Investor, Distribution.investor_id == Investor.id)
+            .outerjoin(Fund, Distribution.fund_code == Fund.fund_code)
+            .where(Distribution.session_id == session_id)
+            .order_by(Distribution.jurisdiction, Distribution.id)
+            .execution_options(yield_per=FETCH_BATCH_SIZE)
+        )
+        result = self.db.execute(statement)
+        try:
+            yield from groupby(result, key=lambda row: row.jurisdiction.value)
+        finally:
+            result.close()
+
+    def _format_results_row(self, row: Any, worksheet) -> list:
+        """Map a result tuple to worksheet cells."""
+        period = (
+            f"{row.period_quarter} {row.period_year}" if row.period_quarter else ""
+        )
+        return [
+            row.investor_name,
+            row.investor_entity_type.value,
+            _state_value(row.investor_tax_state),
+            row.fund_code,
+            period,
+            row.jurisdiction.value,
+            self._numeric_cell(worksheet, row.amount, MONEY_FORMAT),
+            "Yes" if row.composite_exemption else "No",
+            "Yes" if row.withholding_exemption else "No",
+            self._numeric_cell(worksheet, row.composite_tax_amount, MONEY_FORMAT),
+            self._numeric_cell(worksheet, row.withholding_tax_amount, MONEY_FORMAT),
+            row.created_at.strftime("%Y-%m-%d %H:%M:%S") if row.created_at else "",
+        ]
+
+    def _format_report_row(
+        self, row: Any, rule_context: Optional[RuleContext], worksheet
+    ) -> list:
+        """Map a result tuple plus its applicable rules to report cells."""
+        entity_type = row.investor_entity_type
+        entity_code = (
+            entity_type.coding
+            if isinstance(entity_type, InvestorEntityType)
+            else str(entity_type)
+        )
+        rule_key = (row.jurisdiction.value, entity_code)
+
+        composite_rule = None
+        withholding_rule = None
+        if rule_context:
+            composite_rule = rule_context.composite_rules.get(rule_key)
+            withholding_rule = rule_context.withholding_rules.get(rule_key)
+
+        applied_tax = "None"
+        if row.composite_tax_amount:
+            applied_tax = "Composite"
+        elif row.withholding_tax_amount:
+            applied_tax = "Withholding"
+
+        return [
+            row.investor_name,
+            entity_type.value,
+            _state_value(row.investor_tax_state),
+            row.jurisdiction.value,
+            self._numeric_cell(worksheet, row.amount, MONEY_FORMAT),
+            "Yes" if row.composite_exemption else "No",
+            "Yes" if row.withholding_exemption else "No",
+            self._numeric_cell(worksheet, row.composite_tax_amount, MONEY_FORMAT),
+            self._numeric_cell(worksheet, row.withholding_tax_amount, MONEY_FORMAT),
+            applied_tax,
+            getattr(composite_rule, "id", None),
+            self._numeric_cell(
+                worksheet, getattr(composite_rule, "tax_rate", None), RATE_FORMAT
+            ),
+            self._numeric_cell(
+                worksheet, getattr(composite_rule, "income_threshold", None), MONEY_FORMAT
+            ),
+            getattr(composite_rule, "mandatory_filing", None),
+            getattr(withholding_rule, "id", None),
+            self._numeric_cell(
+                worksheet, getattr(withholding_rule, "tax_rate", None), RATE_FORMAT
+            ),
+            self._numeric_cell(
+                worksheet, getattr(withholding_rule, "income_threshold", None), MONEY_FORMAT
+            ),
+            self._numeric_cell(
+                worksheet, getattr(withholding_rule, "tax_threshold", None), MONEY_FORMAT
+            ),
+        ]
+
+
+def _state_value(state: Any) -> str:
+    """Return the string code for a state enum or raw value."""
+    return state.value if hasattr(state, "value") else str(state)
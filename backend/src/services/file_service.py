@@ -2,8 +2,9 @@
 
 import logging
 import shutil
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import BinaryIO, Dict, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -12,6 +13,20 @@ from ..models.source_file import SourceFile
 
 logger = logging.getLogger(__name__)
 
+# Bytes copied per read when spooling uploads to disk
+COPY_BUFFER_BYTES = 1024 * 1024
+
+
+def spool_to_temp_file(source: BinaryIO, suffix: str) -> Tuple[Path, int]:
+    """Copy an uploaded stream to a named temp file in fixed-size reads.
+
+    Returns the temp file's path and size; the caller removes the file.
+    """
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        shutil.copyfileobj(source, temp_file, COPY_BUFFER_BYTES)
+        return Path(temp_file.name), temp_file.tell()
+
 
 class FileStorageResult:
     """Result of file storage operation."""
@@ -28,14 +43,14 @@ class FileStorageResult:
 class FileService:
     """Service for secure file storage."""
 
-    def __init__(self, db: Session, storage_root: Path = None):
+    def __init__(self, db: Session, storage_root: Path = None, max_file_size: Optional[int] = None):
         """Initialize file service with storage configuration."""
         self.db = db
         self.storage_root = storage_root or Path("backend/data/uploads")
         self.storage_root.mkdir(parents=True, exist_ok=True)
 
-        # File size limit: 10MB for prototype
-        self.max_file_size = 10 * 1024 * 1024  # 10,485,760 bytes
+        # File size limit: 10MB for direct uploads, chunked uploads pass their own
+        self.max_file_size = max_file_size or 10 * 1024 * 1024  # 10,485,760 bytes
 
         # Allowed content types
         self.allowed_content_types = {
@@ -50,7 +65,8 @@ class FileService:
         content_type: str,
         uploaded_by: str,
         year: int,
-        quarter: str
+        quarter: str,
+        storage_name: Optional[str] = None
     ) -> FileStorageResult:
         """
         Store uploaded file, overriding any existing file.
@@ -62,6 +78,8 @@ class FileService:
             uploaded_by: User identifier
             year: Tax year
             quarter: Tax quarter
+            storage_name: File name to store under (defaults to the original
+                filename, replacing a file previously stored under it)
 
         Returns:
             FileStorageResult with storage outcome
@@ -83,7 +101,7 @@ class FileService:
                 )
 
             # Generate storage path and copy file
-            secure_path = self._generate_storage_path(year, quarter, original_filename)
+            secure_path = self._generate_storage_path(year, quarter, storage_name or original_filename)
             secure_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Check for existing SourceFile with same filepath and delete it
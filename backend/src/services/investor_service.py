@@ -2,16 +2,23 @@
 
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Optional, TYPE_CHECKING, Union
+from typing import Dict, Iterable, Mapping, Optional, Tuple, TYPE_CHECKING, Union
 
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
 
+from ..models.enums import USJurisdiction
 from ..models.investor import Investor, InvestorEntityType
 from ..models.investor_fund_commitment import InvestorFundCommitment
 
 if TYPE_CHECKING:
     from ..models.fund import Fund
 
+InvestorKey = Tuple[str, str, str]
+
+# Names per IN (...) lookup when resolving investors in bulk
+LOOKUP_BATCH_SIZE = 500
+
 
 class InvestorService:
     """Service for managing investor entities with persistence logic."""
@@ -57,6 +64,62 @@ class InvestorService:
         self.db.flush()  # Get the ID without committing
         return new_investor
 
+    def resolve_investor_ids(self, keys: Iterable[InvestorKey]) -> Dict[InvestorKey, int]:
+        """
+        Find or create many investors at once, keyed by (name, entity type, tax state).
+
+        Matches like ``find_or_create_investor`` (name and state case-insensitive)
+        but loads existing investors with one IN query per batch of names and
+        bulk inserts the missing ones.
+        """
+        identities: Dict[InvestorKey, Tuple[str, InvestorEntityType, str]] = {}
+        for key in keys:
+            if key in identities:
+                continue
+            investor_name, investor_entity_type, investor_tax_state = key
+            try:
+                entity_type_enum = InvestorEntityType(investor_entity_type)
+            except ValueError:
+                raise ValueError(f"Invalid investor entity type: {investor_entity_type}")
+            identities[key] = (
+                investor_name.strip().lower(),
+                entity_type_enum,
+                investor_tax_state.upper(),
+            )
+
+        names = sorted({identity[0] for identity in identities.values()})
+        ids_by_identity: Dict[Tuple[str, InvestorEntityType, str], int] = {}
+        for start in range(0, len(names), LOOKUP_BATCH_SIZE):
+            for investor_id, name, entity_type, tax_state in self.db.execute(
+                select(
+                    Investor.id,
+                    Investor.investor_name,
+                    Investor.investor_entity_type,
+                    Investor.investor_tax_state,
+                ).where(func.lower(Investor.investor_name).in_(names[start:start + LOOKUP_BATCH_SIZE]))
+            ):
+                ids_by_identity.setdefault((name.lower(), entity_type, tax_state.value), investor_id)
+
+        missing: Dict[Tuple[str, InvestorEntityType, str], InvestorKey] = {}
+        for key, identity in identities.items():
+            if identity not in ids_by_identity:
+                missing.setdefault(identity, key)
+        if missing:
+            inserted = self.db.scalars(
+                insert(Investor).returning(Investor.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "investor_name": key[0].strip(),
+                        "investor_entity_type": identity[1],
+                        "investor_tax_state": USJurisdiction(identity[2]),
+                    }
+                    for identity, key in missing.items()
+                ],
+            )
+            ids_by_identity.update(zip(missing, inserted))
+
+        return {key: ids_by_identity[identity] for key, identity in identities.items()}
+
     def get_investor_by_id(self, investor_id: int) -> Optional[Investor]:
         """Get investor by ID."""
         return self.db.query(Investor).filter(Investor.id == investor_id).first()
@@ -99,3 +162,62 @@ class InvestorService:
         commitment.fund = fund
         self.db.add(commitment)
         return commitment
+
+    def bulk_upsert_commitments(
+        self,
+        fund: "Fund",
+        commitments: Mapping[int, Union[Decimal, float, int]],
+    ) -> int:
+        """Create or update commitment percentages of many investors in a fund.
+
+        ``commitments`` maps investor id to percentage. Existing commitments
+        are loaded with one query; changes are written with one bulk UPDATE
+        and one bulk INSERT. Returns the number of commitments written.
+        """
+        percentages: Dict[int, Decimal] = {}
+        for investor_id, commitment_percentage in commitments.items():
+            commitment_decimal = Decimal(str(commitment_percentage)).quantize(
+                Decimal("0.0001"), rounding=ROUND_HALF_UP
+            )
+            if commitment_decimal < Decimal("0") or commitment_decimal > Decimal("100"):
+                raise ValueError("Commitment percentage must be between 0 and 100")
+            percentages[investor_id] = commitment_decimal
+        if not percentages:
+            return 0
+
+        existing = {
+            investor_id: (commitment_percentage, effective_date)
+            for investor_id, commitment_percentage, effective_date in self.db.execute(
+                select(
+                    InvestorFundCommitment.investor_id,
+                    InvestorFundCommitment.commitment_percentage,
+                    InvestorFundCommitment.effective_date,
+                ).where(InvestorFundCommitment.fund_code == fund.fund_code)
+            )
+        }
+
+        now = datetime.utcnow()
+        inserts = []
+        updates = []
+        for investor_id, commitment_decimal in percentages.items():
+            current = existing.get(investor_id)
+            if current is None:
+                inserts.append({
+                    "investor_id": investor_id,
+                    "fund_code": fund.fund_code,
+                    "commitment_percentage": commitment_decimal,
+                    "effective_date": now,
+                })
+            elif current[0] != commitment_decimal or current[1] is None:
+                updates.append({
+                    "investor_id": investor_id,
+                    "fund_code": fund.fund_code,
+                    "commitment_percentage": commitment_decimal,
+                    "effective_date": current[1] or now,
+                })
+
+        if updates:
+            self.db.execute(update(InvestorFundCommitment), updates)
+        if inserts:
+            self.db.execute(insert(InvestorFundCommitment), inserts)
+        return len(inserts) + len(updates)
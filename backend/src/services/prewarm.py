@@ -0,0 +1,56 @@
+"""Background warm-up of parser tables and the active rule context."""
+
+import logging
+import time
+from importlib import import_module
+from typing import Callable, Dict
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+WARMUP_FILENAME = "(Input Data) Warmup_Q1 2025 distribution data_v1.3.xlsx"
+
+
+def _warm_parsers() -> None:
+    """Import the parser modules, compiling their regexes and enum lookup sets."""
+    excel_service = import_module("src.services.excel_service")
+    import_module("src.services.excel_processor")
+
+    service = excel_service.ExcelService()
+    service.extract_fund_info_from_filename(WARMUP_FILENAME)
+    service.normalize_header("  Investor   Name ")
+
+
+def _warm_rule_context(session_factory: Callable[[], Session]) -> None:
+    """Build the rule set period index and load the active rule context."""
+    from .rule_set_index import rule_set_index_cache
+    from .tax_calculation_service import TaxCalculationService
+
+    db = session_factory()
+    try:
+        rule_set_index_cache.get(db)
+        TaxCalculationService(db).get_rule_context()
+    finally:
+        db.close()
+
+
+def prewarm(session_factory: Callable[[], Session]) -> Dict[str, float]:
+    """Run each warm-up step, logging and continuing past failures.
+
+    Returns the seconds spent per step.
+    """
+    steps = {
+        "parsers": _warm_parsers,
+        "rule_context": lambda: _warm_rule_context(session_factory),
+    }
+    timings: Dict[str, float] = {}
+    for name, step in steps.items():
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:
+            logger.warning(f"Pre-warm step '{name}' failed: {exc}")
+        timings[name] = time.perf_counter() - start
+    logger.info(f"Pre-warm completed: {timings}")
+    return timings
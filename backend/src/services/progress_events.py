@@ -0,0 +1,147 @@
+"""In-process event bus for upload progress.
+
+The upload pipeline publishes a full progress snapshot per session at each
+stage and, throttled, while rows are saved. Server-sent event streams
+subscribe per session. Snapshots reach only streams in the same process;
+streams served by another worker fall back to polling the session row,
+which the pipeline commits at stage boundaries.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..models.user_session import UploadStatus
+
+logger = logging.getLogger(__name__)
+
+# Shortest gap between two row-progress snapshots of one upload
+PROGRESS_MIN_INTERVAL_SECONDS = float(os.getenv("PROGRESS_MIN_INTERVAL_SECONDS", "0.5"))
+# Latest snapshots kept for streams that subscribe mid-upload
+PROGRESS_HISTORY_SIZE = int(os.getenv("PROGRESS_HISTORY_SIZE", "256"))
+
+TERMINAL_STATUSES = frozenset({
+    UploadStatus.COMPLETED.value,
+    UploadStatus.FAILED_UPLOAD.value,
+    UploadStatus.FAILED_PARSING.value,
+    UploadStatus.FAILED_VALIDATION.value,
+    UploadStatus.FAILED_SAVING.value,
+})
+
+Subscriber = Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[Dict[str, Any]]"]
+
+
+class ProgressBus:
+    """Fan progress snapshots out from worker threads to event-loop subscribers."""
+
+    def __init__(self, history_size: int = PROGRESS_HISTORY_SIZE) -> None:
+        self.history_size = history_size
+        self._latest: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._subscribers: Dict[str, List[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, session_id: str, snapshot: Dict[str, Any]) -> None:
+        """Record ``snapshot`` as the session's latest and deliver it; thread-safe."""
+        with self._lock:
+            self._latest[session_id] = snapshot
+            self._latest.move_to_end(session_id)
+            while len(self._latest) > self.history_size:
+                self._latest.popitem(last=False)
+            subscribers = list(self._subscribers.get(session_id, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                pass
+
+    def latest(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._latest.get(session_id)
+
+    @contextmanager
+    def subscribe(self, session_id: str) -> Iterator["asyncio.Queue[Dict[str, Any]]"]:
+        """Queue of the session's snapshots; call from the event loop."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(session_id, []).append(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                remaining = [item for item in self._subscribers.get(session_id, ()) if item is not subscriber]
+                if remaining:
+                    self._subscribers[session_id] = remaining
+                else:
+                    self._subscribers.pop(session_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._latest.clear()
+
+
+class UploadProgress:
+    """Publishes one upload's progress as cumulative snapshots."""
+
+    def __init__(
+        self,
+        session_id: str,
+        bus: Optional[ProgressBus] = None,
+        min_interval: float = PROGRESS_MIN_INTERVAL_SECONDS,
+    ) -> None:
+        self.session_id = session_id
+        self.bus = bus or progress_bus
+        self.min_interval = min_interval
+        self._last_published = 0.0
+        self.snapshot: Dict[str, Any] = {
+            "session_id": session_id,
+            "status": UploadStatus.QUEUED.value,
+            "stage": None,
+            "progress_percentage": 0,
+            "total_rows": None,
+            "valid_rows": None,
+            "rows_processed": 0,
+            "stage_timings": {},
+        }
+
+    def stage(
+        self,
+        status: UploadStatus,
+        progress_percentage: int,
+        stage: Optional[str] = None,
+        stage_timings: Optional[Dict[str, float]] = None,
+        **fields: Any,
+    ) -> None:
+        """Publish a stage transition immediately."""
+        self.snapshot["status"] = status.value
+        self.snapshot["progress_percentage"] = progress_percentage
+        self.snapshot["stage"] = stage
+        if stage_timings:
+            self.snapshot["stage_timings"] = {
+                **self.snapshot["stage_timings"],
+                **{name: round(seconds * 1000, 3) for name, seconds in stage_timings.items()},
+            }
+        self.snapshot.update(fields)
+        self._publish()
+
+    def rows(self, processed: int, total: int, start_percentage: int, end_percentage: int) -> None:
+        """Publish row progress within a stage, at most once per ``min_interval``."""
+        self.snapshot["rows_processed"] = processed
+        if time.monotonic() - self._last_published < self.min_interval and processed < total:
+            return
+        span = end_percentage - start_percentage
+        self.snapshot["progress_percentage"] = start_percentage + (span * processed // max(total, 1))
+        self._publish()
+
+    def _publish(self) -> None:
+        self._last_published = time.monotonic()
+        self.bus.publish(self.session_id, dict(self.snapshot))
+
+
+progress_bus = ProgressBus()
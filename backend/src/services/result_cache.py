@@ -0,0 +1,118 @@
+"""Single-flight cache for expensive per-session read endpoints."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from ..monitoring.instrumentation import RESULT_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "5"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "128"))
+
+# (endpoint, session_id, *params)
+CacheKey = Tuple[Hashable, ...]
+
+
+class ResultCache:
+    """Coalesce identical concurrent reads and keep their result briefly.
+
+    The first request for a key runs ``compute`` in the thread pool; requests
+    for the same key arriving meanwhile await that computation instead of
+    starting their own. The result is then served for ``ttl_seconds``.
+    The computation outlives a cancelled first caller, so ``compute`` must
+    not use that request's resources, such as its database Session.
+
+    Invalidation drops a session's entries and detaches its in-flight
+    computations. It also bumps a generation counter, so a computation that
+    started before the invalidation still answers its waiters but is not
+    stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0, maxsize: int = 128) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, "asyncio.Future[Any]"] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    async def get_or_compute(self, key: CacheKey, compute: Callable[[], Any]) -> Any:
+        endpoint = key[0]
+        found, value = self._lookup(key)
+        if found:
+            RESULT_CACHE_REQUESTS.labels(endpoint, "hit").inc()
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            RESULT_CACHE_REQUESTS.labels(endpoint, "coalesced").inc()
+        else:
+            RESULT_CACHE_REQUESTS.labels(endpoint, "miss").inc()
+            task = asyncio.ensure_future(self._compute(key, compute, self._generation))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        # A waiter going away must not cancel the computation the others share
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: CacheKey, compute: Callable[[], Any], generation: int) -> Any:
+        value = await run_in_threadpool(compute)
+        self._store(key, value, generation)
+        return value
+
+    def _finish(self, key: CacheKey, task: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark errors as retrieved when every waiter has gone away
+            task.exception()
+
+    def _lookup(self, key: CacheKey) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def _store(self, key: CacheKey, value: Any, generation: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Forget cached and in-flight results for one session."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[1] == session_id]:
+                del self._entries[key]
+            for key in [key for key in self._inflight if key[1] == session_id]:
+                del self._inflight[key]
+
+    def clear(self) -> None:
+        """Forget all cached and in-flight results."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._inflight.clear()
+
+
+result_cache = ResultCache(RESULT_CACHE_TTL_SECONDS, RESULT_CACHE_MAX_ENTRIES)
@@ -0,0 +1,169 @@
+"""Period-aware lookup of active SALT rule sets."""
+
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models.enums import RuleSetStatus
+from ..models.salt_rule_set import SaltRuleSet
+from ..models.salt_rule_version import SaltRuleVersion
+
+RULE_VERSION_ID = 1
+
+QUARTER_START_MONTH = {"Q1": 1, "Q2": 4, "Q3": 7, "Q4": 10}
+
+
+def quarter_start(year: int, quarter: str) -> date:
+    """First day of a fiscal quarter."""
+    return date(year, QUARTER_START_MONTH[quarter], 1)
+
+
+def quarter_end(year: int, quarter: str) -> date:
+    """Last day of a fiscal quarter."""
+    if quarter == "Q4":
+        return date(year, 12, 31)
+    return date(year, QUARTER_START_MONTH[quarter] + 3, 1) - timedelta(days=1)
+
+
+class RuleSetPeriod(NamedTuple):
+    """Dates and period of one active rule set."""
+
+    id: str
+    year: int
+    quarter: str
+    effective_date: date
+    expiration_date: Optional[date]
+
+
+class RuleSetIndex:
+    """Resolve a fund period to the rule set that governs it.
+
+    Resolution order: the rule set published for exactly that year and
+    quarter; otherwise the rule set in force on the quarter's last day
+    (``effective_date`` through ``expiration_date`` inclusive, the most
+    recently effective one winning overlaps); otherwise the latest active
+    rule set.
+
+    Overlapping intervals are flattened once into sorted elementary
+    segments, so a date lookup is a single bisect.
+    """
+
+    def __init__(self, periods: Sequence[RuleSetPeriod]):
+        ordered = sorted(periods, key=lambda period: period.effective_date)
+        self.latest_id: Optional[str] = ordered[-1].id if ordered else None
+
+        # Later effective dates overwrite earlier ones for the same period
+        self._exact: Dict[Tuple[int, str], str] = {
+            (period.year, period.quarter): period.id for period in ordered
+        }
+
+        boundaries = sorted(
+            {period.effective_date for period in ordered}
+            | {
+                period.expiration_date + timedelta(days=1)
+                for period in ordered
+                if period.expiration_date is not None
+            }
+        )
+        self._segment_starts: List[date] = boundaries
+        self._segment_owners: List[Optional[str]] = [
+            self._owner_at(ordered, boundary) for boundary in boundaries
+        ]
+
+    @staticmethod
+    def _owner_at(ordered: Sequence[RuleSetPeriod], day: date) -> Optional[str]:
+        for period in reversed(ordered):
+            if period.effective_date <= day and (
+                period.expiration_date is None or day <= period.expiration_date
+            ):
+                return period.id
+        return None
+
+    def resolve_date(self, day: date) -> Optional[str]:
+        """Return the rule set id in force on ``day``, if any."""
+        position = bisect_right(self._segment_starts, day) - 1
+        return self._segment_owners[position] if position >= 0 else None
+
+    def resolve(self, year: int, quarter: str) -> Optional[str]:
+        """Return the rule set id for a fund period."""
+        exact = self._exact.get((year, quarter))
+        if exact is not None:
+            return exact
+        return self.resolve_date(quarter_end(year, quarter)) or self.latest_id
+
+
+def load_rule_set_index(db: Session) -> RuleSetIndex:
+    """Build the index from all ACTIVE rule sets with one query."""
+    rows = (
+        db.query(
+            SaltRuleSet.id,
+            SaltRuleSet.year,
+            SaltRuleSet.quarter,
+            SaltRuleSet.effective_date,
+            SaltRuleSet.expiration_date,
+        )
+        .filter(SaltRuleSet.status == RuleSetStatus.ACTIVE)
+        .all()
+    )
+    return RuleSetIndex(
+        [
+            RuleSetPeriod(rule_set_id, year, quarter.value, effective_date, expiration_date)
+            for rule_set_id, year, quarter, effective_date, expiration_date in rows
+        ]
+    )
+
+
+def read_rule_version(db: Session) -> int:
+    """Return the published rule version (0 before the first publish)."""
+    version = db.execute(
+        select(SaltRuleVersion.version).where(SaltRuleVersion.id == RULE_VERSION_ID)
+    ).scalar()
+    return version or 0
+
+
+def bump_rule_version(db: Session) -> int:
+    """Increment the rule version in the caller's transaction and return it."""
+    updated = db.execute(
+        update(SaltRuleVersion)
+        .where(SaltRuleVersion.id == RULE_VERSION_ID)
+        .values(version=SaltRuleVersion.version + 1, updated_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    if not updated:
+        db.add(SaltRuleVersion(id=RULE_VERSION_ID, version=1, updated_at=datetime.utcnow()))
+        db.flush()
+    return read_rule_version(db)
+
+
+class RuleSetIndexCache:
+    """Process-wide index, rebuilt when the published rule version changes.
+
+    Each lookup reads the version counter by primary key, so a publish from
+    any process is picked up without reloading the rule sets themselves.
+    """
+
+    def __init__(self) -> None:
+        self._entry: Optional[Tuple[int, RuleSetIndex]] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> RuleSetIndex:
+        version = read_rule_version(db)
+        entry = self._entry
+        if entry is None or entry[0] != version:
+            with self._lock:
+                entry = self._entry
+                if entry is None or entry[0] != version:
+                    entry = (version, load_rule_set_index(db))
+                    self._entry = entry
+        return entry[1]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+
+
+rule_set_index_cache = RuleSetIndexCache()
@@ -0,0 +1,301 @@
+"""Staged publication of SALT rule sets with an atomic ACTIVE/ARCHIVED swap."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.enums import Quarter, RuleSetStatus
+from ..models.salt_rule_set import SaltRuleSet
+from ..models.source_file import SourceFile
+from ..monitoring.instrumentation import observe_stage
+from .admission_control import parse_gate, persist_gate
+from .excel_processor import ExcelProcessor
+from .file_service import FileService
+from .rule_set_index import bump_rule_version, quarter_start
+from .result_cache import result_cache
+from .rule_set_service import RuleSetService
+from .tax_calculation_service import invalidate_rule_caches
+
+logger = logging.getLogger(__name__)
+
+
+class RuleSetPublishError(Exception):
+    """Raised when a rule set cannot be staged or activated."""
+
+
+class WorkbookValidationError(RuleSetPublishError):
+    """Raised when a workbook fails validation; nothing has been saved."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__("File validation failed")
+        self.errors = errors
+
+
+@dataclass
+class PublishResult:
+    """Outcome of a completed publication."""
+
+    rule_set: SaltRuleSet
+    source_file: SourceFile
+    withholding_count: int
+    composite_count: int
+    rule_version: int
+    archived_ids: List[str] = field(default_factory=list)
+
+
+def resolve_publication_period(year: Optional[int], quarter: Optional[str]) -> Tuple[int, Quarter, date]:
+    """Year, quarter and effective date a workbook's rules are published for.
+
+    An explicit ``year``/``quarter`` takes effect from the first day of that
+    quarter; by default the current quarter is used, effective today.
+    Raises ``ValueError`` for an incomplete or out-of-range period.
+    """
+    if (year is None) != (quarter is None):
+        raise ValueError("Year and quarter must be provided together")
+
+    if year is not None:
+        try:
+            quarter_enum = Quarter(quarter.upper())
+        except ValueError:
+            raise ValueError("Quarter must be one of Q1, Q2, Q3, Q4")
+        if not 2020 <= year <= 2030:
+            raise ValueError("Year must be between 2020 and 2030")
+        return year, quarter_enum, quarter_start(year, quarter_enum.value)
+
+    # Auto-detect current year and quarter
+    current_date = datetime.now()
+    quarter_enum = Quarter(f"Q{(current_date.month - 1) // 3 + 1}")
+    return current_date.year, quarter_enum, date.today()
+
+
+class RuleSetPublisher:
+    """Publish a SALT workbook without a window where rules are missing.
+
+    The new rule set and all of its rules are first committed as DRAFT, which
+    calculations never read. A second, short transaction archives the
+    period's ACTIVE set, activates the draft and bumps the rule version, so
+    concurrent calculations see either the old rules or the new ones.
+    """
+
+    ACTIVATE_ATTEMPTS = 3
+
+    def __init__(self, db: Session, file_service: Optional[FileService] = None):
+        self.db = db
+        self.file_service = file_service or FileService(db)
+
+    def publish(
+        self,
+        file_path: Path,
+        filename: str,
+        content_type: str,
+        year: int,
+        quarter: Quarter,
+        effective_date: date,
+        description: Optional[str] = None,
+        created_by: str = "admin@fundflow.com",
+        dataframes: Optional[Dict[str, Any]] = None,
+    ) -> PublishResult:
+        """Stage the workbook's rules as a draft, then activate it."""
+        publish_start = time.perf_counter()
+        rule_set, source_file = self.stage(
+            file_path, filename, content_type, year, quarter, effective_date,
+            description, created_by, dataframes,
+        )
+        try:
+            archived_ids, rule_version = self.activate(rule_set)
+        except Exception:
+            self.discard(rule_set.id)
+            raise
+
+        observe_stage(
+            "rule_set_publish",
+            time.perf_counter() - publish_start,
+            items=rule_set.rule_count_withholding + rule_set.rule_count_composite,
+        )
+        return PublishResult(
+            rule_set=rule_set,
+            source_file=source_file,
+            withholding_count=rule_set.rule_count_withholding,
+            composite_count=rule_set.rule_count_composite,
+            rule_version=rule_version,
+            archived_ids=archived_ids,
+        )
+
+    def publish_workbook(
+        self,
+        file_path: Path,
+        filename: str,
+        content_type: str,
+        year: int,
+        quarter: Quarter,
+        effective_date: date,
+        description: Optional[str] = None,
+        created_by: str = "admin@fundflow.com",
+    ) -> PublishResult:
+        """Validate a workbook that is already on disk, then publish its rules.
+
+        Shared by the upload endpoints and the batch command; the caller
+        owns ``file_path``. Raises ``WorkbookValidationError`` before
+        anything is saved when the workbook is invalid.
+        """
+        excel_processor = ExcelProcessor()
+        with parse_gate.slot():
+            try:
+                dataframes = excel_processor.load_excel_file(file_path)
+            except Exception:
+                # validate_file reports the read failure as a validation error
+                dataframes = None
+            validation_result = excel_processor.validate_file(file_path, dataframes=dataframes)
+        if not validation_result.is_valid:
+            raise WorkbookValidationError(validation_result.errors)
+
+        with persist_gate.slot():
+            return self.publish(
+                file_path,
+                filename,
+                content_type,
+                year,
+                quarter,
+                effective_date,
+                description=description,
+                created_by=created_by,
+                dataframes=dataframes,
+            )
+
+    def stage(
+        self,
+        file_path: Path,
+        filename: str,
+        content_type: str,
+        year: int,
+        quarter: Quarter,
+        effective_date: date,
+        description: Optional[str],
+        created_by: str,
+        dataframes: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[SaltRuleSet, SourceFile]:
+        """Store the file and commit the rule set with all rules as DRAFT."""
+        rule_set_id = str(uuid4())
+        # A per-rule-set name so the active set's source file is never replaced
+        storage_result = self.file_service.store_uploaded_file(
+            file_path, filename, content_type, created_by, year, quarter.value,
+            storage_name=f"{rule_set_id}_{filename}",
+        )
+        if storage_result.error_message:
+            raise RuleSetPublishError(storage_result.error_message)
+        source_file = storage_result.source_file
+
+        try:
+            processing_result = ExcelProcessor().process_file(
+                Path(source_file.filepath), rule_set_id, dataframes=dataframes
+            )
+            rule_set = SaltRuleSet(
+                id=rule_set_id,
+                year=year,
+                quarter=quarter,
+                version="1.0.0",
+                status=RuleSetStatus.DRAFT,
+                effective_date=effective_date,
+                created_at=datetime.now(),
+                created_by=created_by,
+                description=description,
+                source_file_id=source_file.id,
+                rule_count_withholding=len(processing_result.withholding_rules),
+                rule_count_composite=len(processing_result.composite_rules),
+            )
+            self.db.add(rule_set)
+            self.db.add_all(processing_result.withholding_rules)
+            self.db.add_all(processing_result.composite_rules)
+            self.db.add_all(processing_result.validation_issues)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._remove_source_file(source_file)
+            raise
+
+        logger.info(
+            f"Staged draft rule set {rule_set_id} for {year} {quarter.value}: "
+            f"{rule_set.rule_count_withholding} withholding, {rule_set.rule_count_composite} composite rules"
+        )
+        return rule_set, source_file
+
+    def activate(self, rule_set: SaltRuleSet) -> Tuple[List[str], int]:
+        """Swap the draft in for the period's active rule set in one transaction.
+
+        Returns the archived rule set ids and the new rule version. A unique
+        conflict with a concurrent activation for the same period is retried.
+        """
+        for attempt in range(1, self.ACTIVATE_ATTEMPTS + 1):
+            try:
+                archived_ids = self._swap(rule_set)
+                rule_version = bump_rule_version(self.db)
+                self.db.commit()
+                break
+            except IntegrityError as exc:
+                self.db.rollback()
+                logger.warning(
+                    f"Activation of rule set {rule_set.id} conflicted (attempt {attempt}): {exc}"
+                )
+                if attempt == self.ACTIVATE_ATTEMPTS:
+                    raise RuleSetPublishError(
+                        f"Could not activate rule set for {rule_set.year} {rule_set.quarter.value}; "
+                        "another publication for the same period is in progress"
+                    ) from exc
+
+        invalidate_rule_caches()
+        # Tax reports show the rules of the active set
+        result_cache.clear()
+        logger.info(
+            f"Activated rule set {rule_set.id} (rule version {rule_version}), "
+            f"archived {len(archived_ids)} previous rule set(s)"
+        )
+        return archived_ids, rule_version
+
+    def _swap(self, rule_set: SaltRuleSet) -> List[str]:
+        active_rule_sets = (
+            self.db.query(SaltRuleSet)
+            .filter(
+                SaltRuleSet.year == rule_set.year,
+                SaltRuleSet.quarter == rule_set.quarter,
+                SaltRuleSet.status == RuleSetStatus.ACTIVE,
+                SaltRuleSet.id != rule_set.id,
+            )
+            .with_for_update()
+            .all()
+        )
+        for active_rule_set in active_rule_sets:
+            active_rule_set.status = RuleSetStatus.ARCHIVED
+        # Archive before activating so the one-active-per-period index holds
+        self.db.flush()
+
+        rule_set.status = RuleSetStatus.ACTIVE
+        rule_set.published_at = datetime.now()
+        self.db.flush()
+        return [active_rule_set.id for active_rule_set in active_rule_sets]
+
+    def discard(self, rule_set_id: str) -> None:
+        """Delete a draft that could not be activated, with its rules and file."""
+        self.db.rollback()
+        rule_set = self.db.get(SaltRuleSet, rule_set_id)
+        if rule_set is None or rule_set.status != RuleSetStatus.DRAFT:
+            return
+        source_file = rule_set.source_file
+        try:
+            RuleSetService(self.db).delete_rule_set(rule_set_id)
+            if source_file is not None:
+                self._remove_source_file(source_file)
+        except Exception as exc:
+            self.db.rollback()
+            logger.error(f"Failed to discard draft rule set {rule_set_id}: {str(exc)}")
+
+    def _remove_source_file(self, source_file: SourceFile) -> None:
+        Path(source_file.filepath).unlink(missing_ok=True)
+        self.db.delete(source_file)
+        self.db.commit()
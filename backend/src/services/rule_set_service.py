@@ -9,6 +9,7 @@ from ..models.salt_rule_set import SaltRuleSet, RuleSetStatus
 from ..models.withholding_rule import WithholdingRule
 from ..models.composite_rule import CompositeRule
 from ..models.validation_issue import ValidationIssue
+from ..utils.money import money_float
 logger = logging.getLogger(__name__)
 
 
@@ -126,8 +127,8 @@ class RuleSetService:
                     "stateCode": rule.state_code.value,
                     "entityType": rule.entity_type,
                     "taxRate": float(rule.tax_rate),
-                    "incomeThreshold": float(rule.income_threshold),
-                    "taxThreshold": float(rule.tax_threshold)
+                    "incomeThreshold": money_float(rule.income_threshold),
+                    "taxThreshold": money_float(rule.tax_threshold)
                 }
                 for rule in withholding_rules
             ]
@@ -139,7 +140,7 @@ class RuleSetService:
                     "stateCode": rule.state_code.value,
                     "entityType": rule.entity_type,
                     "taxRate": float(rule.tax_rate),
-                    "incomeThreshold": float(rule.income_threshold),
+                    "incomeThreshold": money_float(rule.income_threshold),
                     "mandatoryFiling": rule.mandatory_filing
                 }
                 for rule in composite_rules
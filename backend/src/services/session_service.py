@@ -1,10 +1,24 @@
 """Session management service."""
 
 import uuid
-from typing import Optional
+from typing import Any, Dict, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from ..models.user_session import UserSession, UploadStatus
+from ..models.session_processing_profile import SessionProcessingProfile
+from ..models.session_error_count import SessionErrorCount
+from ..models.validation_error import ValidationError
+from ..models.distribution import Distribution
 from ..models.user import User
+from .distribution_service import DistributionService
+
+
+class SessionDeleteError(Exception):
+    """Raised when a session cannot be deleted while other sessions depend on it."""
+
+    def __init__(self, message: str, status_code: int = 409):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class SessionService:
@@ -18,11 +32,12 @@ class SessionService:
         user_id: int,
         upload_filename: str,
         original_filename: str,
-        file_size: int
+        file_size: int,
+        session_id: Optional[str] = None
     ) -> UserSession:
-        """Create a new upload session."""
+        """Create a new upload session, optionally under a client-chosen id."""
         session = UserSession(
-            session_id=str(uuid.uuid4()),
+            session_id=session_id or str(uuid.uuid4()),
             user_id=user_id,
             upload_filename=upload_filename,
             original_filename=original_filename,
@@ -85,6 +100,26 @@ class SessionService:
         session.valid_rows = valid_rows
         return True
 
+    def save_processing_profile(
+        self,
+        session_id: str,
+        fields: Dict[str, Any]
+    ) -> SessionProcessingProfile:
+        """Create or replace the processing profile for a session."""
+        profile = self.get_processing_profile(session_id)
+        if profile is None:
+            profile = SessionProcessingProfile(session_id=session_id)
+            self.db.add(profile)
+
+        for field, value in fields.items():
+            setattr(profile, field, value)
+        return profile
+
+    def get_processing_profile(self, session_id: str) -> Optional[SessionProcessingProfile]:
+        """Get the processing profile recorded for a session."""
+        return self.db.query(SessionProcessingProfile).filter(
+            SessionProcessingProfile.session_id == session_id
+        ).first()
 
     def get_user_sessions(
         self,
@@ -100,6 +135,26 @@ class SessionService:
 
         return query.order_by(UserSession.created_at.desc()).limit(limit).all()
 
+    def get_progress_snapshot(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Status columns of a session, read without loading the row or relationships."""
+        row = self.db.query(
+            UserSession.status,
+            UserSession.progress_percentage,
+            UserSession.total_rows,
+            UserSession.valid_rows,
+            UserSession.error_message,
+        ).filter(UserSession.session_id == session_id).first()
+        if row is None:
+            return None
+        return {
+            "session_id": session_id,
+            "status": row.status.value,
+            "progress_percentage": row.progress_percentage,
+            "total_rows": row.total_rows,
+            "valid_rows": row.valid_rows,
+            "error_message": row.error_message,
+        }
+
     def get_session_summary(self, session_id: str) -> Optional[dict]:
         """Get session summary with related data counts."""
         session = self.get_session_by_id(session_id)
@@ -107,8 +162,23 @@ class SessionService:
             return None
 
         # Count related records
-        distribution_count = len(session.distributions)
-        error_count = len(session.validation_errors)
+        distribution_count = (
+            self.db.query(func.count(Distribution.id))
+            .filter(Distribution.session_id == session_id)
+            .scalar()
+        )
+        # Exact count when recorded; the stored error rows are capped per code
+        error_count = (
+            self.db.query(func.sum(SessionErrorCount.error_count))
+            .filter(SessionErrorCount.session_id == session_id)
+            .scalar()
+        )
+        if error_count is None:
+            error_count = (
+                self.db.query(func.count(ValidationError.id))
+                .filter(ValidationError.session_id == session_id)
+                .scalar()
+            )
 
         return {
             "session_id": session.session_id,
@@ -126,7 +196,12 @@ class SessionService:
         }
 
     def delete_session(self, session_id: str, user_id: int) -> bool:
-        """Delete a session and all its related data."""
+        """Delete a session and all its related data.
+
+        Deleting a delta upload restores the distributions it superseded.
+        Raises ``SessionDeleteError`` for a session whose distributions a
+        later delta upload superseded.
+        """
         session = self.db.query(UserSession).filter(
             UserSession.session_id == session_id,
             UserSession.user_id == user_id
@@ -138,18 +213,33 @@ class SessionService:
         # Delete related records (cascading delete should handle this automatically
         # if foreign key constraints are set up properly, but we'll be explicit)
 
-        # Delete distributions
-        from ..models.distribution import Distribution
-        self.db.query(Distribution).filter(
-            Distribution.session_id == session_id
-        ).delete()
+        # A delta upload's rows give way to the versions it superseded; a
+        # session superseded by a later delta would leave that delta's
+        # versions pointing at nothing, so it is deleted after it
+        distribution_service = DistributionService(self.db)
+        superseding = distribution_service.superseding_session_ids(session_id)
+        if superseding:
+            raise SessionDeleteError(
+                f"Session {session_id} was superseded by delta upload(s) "
+                f"{', '.join(superseding)}; delete those first"
+            )
+        distribution_service.restore_superseded(session_id)
 
         # Delete validation errors
-        from ..models.validation_error import ValidationError
         self.db.query(ValidationError).filter(
             ValidationError.session_id == session_id
         ).delete()
 
+        # Delete error counts
+        self.db.query(SessionErrorCount).filter(
+            SessionErrorCount.session_id == session_id
+        ).delete()
+
+        # Delete processing profile
+        self.db.query(SessionProcessingProfile).filter(
+            SessionProcessingProfile.session_id == session_id
+        ).delete()
+
         # Delete the session itself
         self.db.delete(session)
 
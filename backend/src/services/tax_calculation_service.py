@@ -2,21 +2,53 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Optional, Tuple
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 
+from sqlalchemy import BigInteger, and_, case, cast, func, literal_column, select, update
 from sqlalchemy.orm import Session, joinedload
 
 from ..models.composite_rule import CompositeRule
 from ..models.distribution import Distribution
 from ..models.enums import InvestorEntityType, RuleSetStatus
+from ..models.fund import Fund
 from ..models.investor import Investor
 from ..models.salt_rule_set import SaltRuleSet
 from ..models.withholding_rule import WithholdingRule
+from ..monitoring.instrumentation import STAGE_ITEMS, timed_stage
+from ..utils.money import (
+    CENTS_PER_UNIT,
+    RATE_SCALE,
+    from_cents,
+    mul_rate,
+    optional_cents,
+    to_cents,
+    to_rate_units,
+)
+from .rule_set_index import rule_set_index_cache
 
 
 RuleKey = Tuple[str, str]
+# Fund period as (period_year, period_quarter)
+Period = Tuple[int, str]
+
+# Keeps ``IN (...)`` lists well under SQLite's bound-parameter limit
+ID_BATCH_SIZE = 500
+
+# "orm" loads a session's distributions and applies the rules in Python;
+# "sql" runs the same rules as set-based UPDATE statements in the database
+TAX_CALCULATION_MODE = os.getenv("TAX_CALCULATION_MODE", "orm").lower()
+
+
+class RuleTerms(NamedTuple):
+    """Fixed-point rate and thresholds of a single rule."""
+
+    rate_units: Optional[int]
+    income_threshold_cents: Optional[int]
+    tax_threshold_cents: Optional[int]
 
 
 @dataclass
@@ -26,22 +58,137 @@ class RuleContext:
     rule_set: SaltRuleSet
     composite_rules: Dict[RuleKey, CompositeRule]
     withholding_rules: Dict[RuleKey, WithholdingRule]
+    _terms: Dict[int, RuleTerms] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_rules(
+        cls,
+        rule_set: Optional[SaltRuleSet],
+        withholding_rules: Sequence[WithholdingRule],
+        composite_rules: Sequence[CompositeRule],
+    ) -> "RuleContext":
+        """Index rules by (state, entity coding)."""
+        return cls(
+            rule_set=rule_set,
+            composite_rules={
+                (rule.state_code.value, rule.entity_type): rule for rule in composite_rules
+            },
+            withholding_rules={
+                (rule.state_code.value, rule.entity_type): rule for rule in withholding_rules
+            },
+        )
 
     def is_empty(self) -> bool:
         """Return True when no usable rules exist."""
         return not (self.composite_rules or self.withholding_rules)
 
+    def terms(self, rule: Union[CompositeRule, WithholdingRule]) -> RuleTerms:
+        """Return the rule's rate and thresholds as integers, converted once per rule."""
+        # Keyed by object identity: unsaved rules in tests have no primary key yet
+        terms = self._terms.get(id(rule))
+        if terms is None:
+            terms = RuleTerms(
+                rate_units=to_rate_units(rule.tax_rate) if rule.tax_rate is not None else None,
+                income_threshold_cents=optional_cents(rule.income_threshold),
+                tax_threshold_cents=optional_cents(getattr(rule, "tax_threshold", None)),
+            )
+            self._terms[id(rule)] = terms
+        return terms
+
+
+class RuleContextCache:
+    """Process-wide cache of loaded rule contexts keyed by rule set id.
+
+    Rules are written once when a rule set is published and never updated, so
+    an entry for a given rule set id cannot go stale. Cached rules are detached
+    from the session that loaded them; callers get a copy bound to their own
+    ``rule_set`` instance.
+    """
+
+    def __init__(self, maxsize: int = 4) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, RuleContext]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, rule_set_id: str) -> Optional[RuleContext]:
+        with self._lock:
+            context = self._entries.get(rule_set_id)
+            if context is not None:
+                self._entries.move_to_end(rule_set_id)
+            return context
+
+    def put(self, rule_set_id: str, context: RuleContext) -> None:
+        with self._lock:
+            self._entries[rule_set_id] = context
+            self._entries.move_to_end(rule_set_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+rule_context_cache = RuleContextCache()
+
+
+def invalidate_rule_caches() -> None:
+    """Drop cached rule contexts and the period index after rule sets change."""
+    rule_context_cache.clear()
+    rule_set_index_cache.invalidate()
+
+
+def _sql_cents(column: Any) -> Any:
+    """Integer cents of a two-place money column, rounded half away from zero."""
+    return cast(func.round(column * CENTS_PER_UNIT), BigInteger)
+
+
+def _sql_rate_units(column: Any) -> Any:
+    """Tax rate column as integer units of 1/RATE_SCALE (see ``to_rate_units``)."""
+    return cast(func.round(column * RATE_SCALE), BigInteger)
+
+
+def _sql_mul_rate(cents: Any, rate_units: Any) -> Any:
+    """SQL counterpart of ``mul_rate`` for non-negative operands.
+
+    Amounts are only taxed above a non-negative threshold and rates are
+    constrained to [0, 1], so floor division after adding half a unit is
+    ROUND_HALF_UP and stays within BIGINT.
+    """
+    return (cents * rate_units + RATE_SCALE // 2) // RATE_SCALE
+
+
+def _sql_from_cents(cents: Any) -> Any:
+    # A decimal literal keeps the division fractional on both SQLite and Postgres
+    return cents / literal_column("100.0")
+
+
+def _sql_entity_code() -> Any:
+    """Map the stored investor entity enum to the SALT coding rules are keyed by."""
+    return case(
+        *(
+            (Investor.investor_entity_type == entity_type, entity_type.coding)
+            for entity_type in InvestorEntityType
+        )
+    )
+
 
 class TaxCalculationService:
     """Applies composite and withholding tax calculations to distributions."""
 
-    _CENT = Decimal("0.01")
-
     def __init__(self, db: Session) -> None:
         self.db = db
 
     def apply_for_session(self, session_id: str) -> None:
         """Apply withholding/composite tax calculations for a session."""
+        with timed_stage("tax_apply_for_session"):
+            if TAX_CALCULATION_MODE == "sql":
+                self._apply_for_session_sql(session_id)
+            else:
+                self._apply_for_session(session_id)
+
+    def _apply_for_session(self, session_id: str) -> None:
+        """Load session distributions and apply the rule context for their period."""
         distributions = (
             self.db.query(Distribution)
             .options(
@@ -51,27 +198,180 @@ class TaxCalculationService:
             .filter(Distribution.session_id == session_id)
             .all()
         )
+        self._apply_to_distributions(distributions, "tax_apply_for_session")
+
+    def apply_for_session_sql(self, session_id: str) -> int:
+        """Apply tax calculations for a session with set-based UPDATE statements.
+
+        Produces the same amounts as ``apply_for_session`` without loading
+        distributions into Python. Returns the number of taxed distributions.
+        """
+        with timed_stage("tax_apply_for_session_sql"):
+            return self._apply_for_session_sql(session_id)
+
+    def _apply_for_session_sql(self, session_id: str) -> int:
+        """Reset, then set composite and withholding tax per fund period in the database."""
+        self.db.flush()
+        funds_by_period: Dict[Period, List[str]] = {}
+        for fund_code, period_year, period_quarter in self.db.execute(
+            select(Fund.fund_code, Fund.period_year, Fund.period_quarter)
+            .join(Distribution, Distribution.fund_code == Fund.fund_code)
+            .where(Distribution.session_id == session_id)
+            .distinct()
+        ):
+            funds_by_period.setdefault((period_year, period_quarter), []).append(fund_code)
+
+        in_session = Distribution.session_id == session_id
+        # Ensure stale values are cleared, including where no rules apply
+        reset = self._execute_update(
+            update(Distribution)
+            .where(in_session)
+            .values(composite_tax_amount=None, withholding_tax_amount=None)
+        )
 
-        if not distributions:
+        taxed = 0
+        for period, fund_codes in funds_by_period.items():
+            rule_set = self._rule_set_for_period(period)
+            if rule_set is None:
+                continue
+            scope = and_(in_session, Distribution.fund_code.in_(fund_codes))
+            taxed += self._execute_update(self._composite_update(scope, rule_set.id))
+            # Runs second: only distributions without composite tax are eligible
+            taxed += self._execute_update(self._withholding_update(scope, rule_set.id))
+
+        # Keep already-loaded instances from reporting pre-update amounts
+        for instance in list(self.db.identity_map.values()):
+            if isinstance(instance, Distribution) and instance.session_id == session_id:
+                self.db.expire(instance, ["composite_tax_amount", "withholding_tax_amount"])
+
+        STAGE_ITEMS.labels("tax_apply_for_session_sql").inc(reset)
+        return taxed
+
+    def _execute_update(self, statement: Any) -> int:
+        result = self.db.execute(statement, execution_options={"synchronize_session": False})
+        return result.rowcount
+
+    @staticmethod
+    def _taxable_conditions(scope: Any, rule: Any, rule_set_id: str) -> List[Any]:
+        """Join and exemption predicates shared by the composite and withholding updates."""
+        return [
+            scope,
+            Investor.id == Distribution.investor_id,
+            rule.rule_set_id == rule_set_id,
+            rule.state_code == Distribution.jurisdiction,
+            rule.entity_type == _sql_entity_code(),
+            Distribution.composite_exemption.is_(False),
+            Distribution.withholding_exemption.is_(False),
+            Distribution.jurisdiction != Investor.investor_tax_state,
+            _sql_cents(Distribution.amount) > _sql_cents(rule.income_threshold),
+        ]
+
+    def _composite_update(self, scope: Any, rule_set_id: str) -> Any:
+        tax_cents = _sql_mul_rate(
+            _sql_cents(Distribution.amount), _sql_rate_units(CompositeRule.tax_rate)
+        )
+        return (
+            update(Distribution)
+            .where(
+                *self._taxable_conditions(scope, CompositeRule, rule_set_id),
+                CompositeRule.mandatory_filing.is_(True),
+                tax_cents > 0,
+            )
+            .values(composite_tax_amount=_sql_from_cents(tax_cents))
+        )
+
+    def _withholding_update(self, scope: Any, rule_set_id: str) -> Any:
+        tax_cents = _sql_mul_rate(
+            _sql_cents(Distribution.amount), _sql_rate_units(WithholdingRule.tax_rate)
+        )
+        return (
+            update(Distribution)
+            .where(
+                *self._taxable_conditions(scope, WithholdingRule, rule_set_id),
+                Distribution.composite_tax_amount.is_(None),
+                tax_cents > _sql_cents(WithholdingRule.tax_threshold),
+                tax_cents > 0,
+            )
+            .values(withholding_tax_amount=_sql_from_cents(tax_cents))
+        )
+
+    def apply_for_sessions(self, session_ids: Sequence[str]) -> None:
+        """Apply taxes for several sessions at once, each fund period with its own rules.
+
+        Distributions are loaded in batches of ``ID_BATCH_SIZE`` sessions and
+        rule sets are resolved per distinct period, not per session.
+        """
+        if not session_ids:
             return
+        with timed_stage("tax_apply_for_sessions"):
+            self._apply_to_distributions(
+                self._load_distributions(Distribution.session_id, session_ids),
+                "tax_apply_for_sessions",
+            )
 
-        active_rule_set = self._get_active_rule_set()
-        if not active_rule_set:
-            # Ensure stale values are cleared when no rules are active
-            for distribution in distributions:
-                distribution.composite_tax_amount = None
-                distribution.withholding_tax_amount = None
+    def apply_for_distributions(self, distribution_ids: Sequence[int]) -> None:
+        """Recalculate taxes for specific distributions (e.g. rows touched by a delta upload)."""
+        if not distribution_ids:
             return
+        with timed_stage("tax_apply_for_distributions"):
+            self._apply_to_distributions(
+                self._load_distributions(Distribution.id, distribution_ids),
+                "tax_apply_for_distributions",
+            )
 
-        rule_context = self._build_rule_context(active_rule_set)
-        if rule_context.is_empty():
-            for distribution in distributions:
-                distribution.composite_tax_amount = None
-                distribution.withholding_tax_amount = None
+    def _load_distributions(self, column: Any, keys: Sequence[Any]) -> List[Distribution]:
+        """Load distributions with investor and fund for ``column IN keys``, in batches."""
+        distributions: List[Distribution] = []
+        for start in range(0, len(keys), ID_BATCH_SIZE):
+            distributions.extend(
+                self.db.query(Distribution)
+                .options(
+                    joinedload(Distribution.investor),
+                    joinedload(Distribution.fund),
+                )
+                .filter(column.in_(keys[start:start + ID_BATCH_SIZE]))
+                .all()
+            )
+        return distributions
+
+    def _apply_to_distributions(self, distributions: List[Distribution], stage: str) -> None:
+        """Apply the rule context for each distribution's fund period."""
+        if not distributions:
             return
 
+        by_period: Dict[Optional[Period], List[Distribution]] = {}
         for distribution in distributions:
-            self._apply_tax_logic(distribution, rule_context)
+            by_period.setdefault(self._fund_period(distribution), []).append(distribution)
+
+        for period, period_distributions in by_period.items():
+            rule_set = self._rule_set_for_period(period)
+            rule_context = self._build_rule_context(rule_set) if rule_set else None
+            if rule_context is None or rule_context.is_empty():
+                # Ensure stale values are cleared when no rules apply
+                for distribution in period_distributions:
+                    distribution.composite_tax_amount = None
+                    distribution.withholding_tax_amount = None
+                continue
+
+            for distribution in period_distributions:
+                self._apply_tax_logic(distribution, rule_context)
+        STAGE_ITEMS.labels(stage).inc(len(distributions))
+
+    @staticmethod
+    def _fund_period(distribution: Distribution) -> Optional[Period]:
+        fund = distribution.fund
+        if fund is None:
+            return None
+        return fund.period_year, fund.period_quarter
+
+    def _rule_set_for_period(self, period: Optional[Period]) -> Optional[SaltRuleSet]:
+        """Resolve the rule set for a fund period; without a period, the latest active one."""
+        if period is None:
+            return self._get_active_rule_set()
+        rule_set_id = rule_set_index_cache.get(self.db).resolve(*period)
+        if rule_set_id is None:
+            return None
+        return self.db.get(SaltRuleSet, rule_set_id)
 
     def _get_active_rule_set(self) -> Optional[SaltRuleSet]:
         """Return the current active SALT rule set if one exists."""
@@ -83,7 +383,27 @@ class TaxCalculationService:
         )
 
     def _build_rule_context(self, rule_set: SaltRuleSet) -> RuleContext:
-        """Load withholding and composite rules for the active rule set."""
+        """Return the rule context for a rule set, loading it on a cache miss."""
+        cached = rule_context_cache.get(rule_set.id)
+        if cached is not None:
+            return replace(cached, rule_set=rule_set)
+
+        with timed_stage("rule_context_load"):
+            rule_context = self._load_rule_context(rule_set)
+
+        # An ACTIVE rule set is committed before its rules, so an empty context
+        # may just be a publish in progress; only cache populated contexts.
+        if not rule_context.is_empty():
+            for rule in (
+                *rule_context.withholding_rules.values(),
+                *rule_context.composite_rules.values(),
+            ):
+                self.db.expunge(rule)
+            rule_context_cache.put(rule_set.id, rule_context)
+        return rule_context
+
+    def _load_rule_context(self, rule_set: SaltRuleSet) -> RuleContext:
+        """Query rules for a rule set and index them by (state, entity coding)."""
         withholding_rules = (
             self.db.query(WithholdingRule)
             .filter(WithholdingRule.rule_set_id == rule_set.id)
@@ -95,30 +415,31 @@ class TaxCalculationService:
             .all()
         )
 
-        withholding_lookup: Dict[RuleKey, WithholdingRule] = {
-            (rule.state_code.value, rule.entity_type): rule for rule in withholding_rules
-        }
-        composite_lookup: Dict[RuleKey, CompositeRule] = {
-            (rule.state_code.value, rule.entity_type): rule for rule in composite_rules
-        }
+        return RuleContext.from_rules(rule_set, withholding_rules, composite_rules)
 
-        return RuleContext(
-            rule_set=rule_set,
-            composite_rules=composite_lookup,
-            withholding_rules=withholding_lookup,
+    def get_rule_context(self, period: Optional[Period] = None) -> Optional[RuleContext]:
+        """Expose the rule context for a fund period (default: latest active) for reporting."""
+        rule_set = (
+            self._get_active_rule_set() if period is None else self._rule_set_for_period(period)
         )
-
-    def get_rule_context(self) -> Optional[RuleContext]:
-        """Expose active rule context for reporting endpoints."""
-        active_rule_set = self._get_active_rule_set()
-        if not active_rule_set:
+        if not rule_set:
             return None
 
-        rule_context = self._build_rule_context(active_rule_set)
+        rule_context = self._build_rule_context(rule_set)
         if rule_context.is_empty():
             return None
         return rule_context
 
+    def get_rule_context_for_session(self, session_id: str) -> Optional[RuleContext]:
+        """Return the rule context used for a session's fund period."""
+        period = (
+            self.db.query(Fund.period_year, Fund.period_quarter)
+            .join(Distribution, Distribution.fund_code == Fund.fund_code)
+            .filter(Distribution.session_id == session_id)
+            .first()
+        )
+        return self.get_rule_context(tuple(period) if period else None)
+
     def _apply_tax_logic(self, distribution: Distribution, context: RuleContext) -> None:
         """Apply exemption, composite, and withholding tax logic to a distribution."""
         # Reset amounts before recalculation to avoid stale data
@@ -129,64 +450,92 @@ class TaxCalculationService:
         if investor is None:
             return
 
-        investor_entity = investor.investor_entity_type
-        investor_state = (
-            investor.investor_tax_state.value
-            if hasattr(investor.investor_tax_state, "value")
-            else str(investor.investor_tax_state)
+        composite_tax, withholding_tax = self.compute_tax_cents(
+            amount_cents=to_cents(distribution.amount),
+            jurisdiction=distribution.jurisdiction.value,
+            investor_state=(
+                investor.investor_tax_state.value
+                if hasattr(investor.investor_tax_state, "value")
+                else str(investor.investor_tax_state)
+            ),
+            entity_code=self.entity_code(investor.investor_entity_type),
+            composite_exemption=distribution.composite_exemption,
+            withholding_exemption=distribution.withholding_exemption,
+            context=context,
         )
-
+        if composite_tax is not None:
+            distribution.composite_tax_amount = from_cents(composite_tax)
+        if withholding_tax is not None:
+            distribution.withholding_tax_amount = from_cents(withholding_tax)
+
+    @staticmethod
+    def entity_code(investor_entity: Union[InvestorEntityType, str]) -> str:
+        """Return the SALT coding used to key rules for an investor entity type."""
+        if isinstance(investor_entity, InvestorEntityType):
+            return investor_entity.coding
+        return str(investor_entity)
+
+    def compute_tax_cents(
+        self,
+        amount_cents: int,
+        jurisdiction: str,
+        investor_state: Optional[str],
+        entity_code: str,
+        composite_exemption: bool,
+        withholding_exemption: bool,
+        context: RuleContext,
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Return (composite, withholding) tax in cents for one distribution.
+
+        At most one of the two is set; None means no tax of that kind applies.
+        """
         # Step 1: Handle exemptions
-        if distribution.composite_exemption or distribution.withholding_exemption:
-            return
+        if composite_exemption or withholding_exemption:
+            return None, None
 
-        if investor_state and distribution.jurisdiction.value == investor_state:
-            return
+        if investor_state and jurisdiction == investor_state:
+            return None, None
 
-        entity_code = (
-            investor_entity.coding
-            if isinstance(investor_entity, InvestorEntityType)
-            else str(investor_entity)
-        )
-        rule_key: RuleKey = (distribution.jurisdiction.value, entity_code)
+        rule_key: RuleKey = (jurisdiction, entity_code)
 
         # Step 2: Composite tax (mandatory states only)
         composite_rule = context.composite_rules.get(rule_key)
         if composite_rule and composite_rule.mandatory_filing:
-            if self._amount_exceeds_threshold(distribution.amount, composite_rule.income_threshold):
-                composite_tax = self._calculate_tax(distribution.amount, composite_rule.tax_rate)
-                if composite_tax is not None and composite_tax > Decimal("0.00"):
-                    distribution.composite_tax_amount = composite_tax
-                    return
+            terms = context.terms(composite_rule)
+            if self._amount_exceeds_threshold(amount_cents, terms.income_threshold_cents):
+                composite_tax = self._calculate_tax(amount_cents, terms.rate_units)
+                if composite_tax is not None and composite_tax > 0:
+                    return composite_tax, None
 
         # Step 3: Withholding tax (only if composite not applied)
         withholding_rule = context.withholding_rules.get(rule_key)
         if not withholding_rule:
-            return
+            return None, None
 
-        if not self._amount_exceeds_threshold(distribution.amount, withholding_rule.income_threshold):
-            return
+        terms = context.terms(withholding_rule)
+        if not self._amount_exceeds_threshold(amount_cents, terms.income_threshold_cents):
+            return None, None
 
-        withholding_tax = self._calculate_tax(distribution.amount, withholding_rule.tax_rate)
+        withholding_tax = self._calculate_tax(amount_cents, terms.rate_units)
         if withholding_tax is None:
-            return
+            return None, None
 
         # Apply per-partner withholding tax threshold rule (> threshold)
-        if withholding_rule.tax_threshold is not None and withholding_tax <= withholding_rule.tax_threshold:
-            return
+        if terms.tax_threshold_cents is not None and withholding_tax <= terms.tax_threshold_cents:
+            return None, None
 
-        if withholding_tax > Decimal("0.00"):
-            distribution.withholding_tax_amount = withholding_tax
+        if withholding_tax > 0:
+            return None, withholding_tax
+        return None, None
 
-    def _amount_exceeds_threshold(self, amount: Decimal, threshold: Optional[Decimal]) -> bool:
+    def _amount_exceeds_threshold(self, amount_cents: int, threshold_cents: Optional[int]) -> bool:
         """Return True when the amount exceeds a given threshold."""
-        if threshold is None:
+        if threshold_cents is None:
             return True
-        return amount > threshold
+        return amount_cents > threshold_cents
 
-    def _calculate_tax(self, amount: Decimal, rate: Optional[Decimal]) -> Optional[Decimal]:
-        """Calculate tax amount using the provided rate."""
-        if rate is None:
+    def _calculate_tax(self, amount_cents: int, rate_units: Optional[int]) -> Optional[int]:
+        """Calculate tax in cents using a scaled-integer rate (ROUND_HALF_UP)."""
+        if rate_units is None:
             return None
-        tax_amount = (amount * rate).quantize(self._CENT, rounding=ROUND_HALF_UP)
-        return tax_amount
+        return mul_rate(amount_cents, rate_units)
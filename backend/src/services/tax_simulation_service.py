@@ -0,0 +1,200 @@
+"""What-if tax simulation of a candidate SALT workbook against stored sessions."""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.distribution import Distribution
+from ..models.investor import Investor
+from ..monitoring.instrumentation import observe_stage
+from ..utils.money import cents_to_float, optional_cents, to_cents
+from .excel_processor import ExcelProcessor
+from .tax_calculation_service import ID_BATCH_SIZE, RuleContext, TaxCalculationService
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateRulesError(Exception):
+    """Raised when a candidate workbook cannot be turned into rules."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(errors[0]["message"] if errors else "Invalid candidate workbook")
+        self.errors = errors
+
+
+class _Totals:
+    """Current and simulated tax totals in cents for one grouping key."""
+
+    __slots__ = ("current_composite", "current_withholding", "simulated_composite",
+                 "simulated_withholding", "distributions", "changed")
+
+    def __init__(self) -> None:
+        self.current_composite = 0
+        self.current_withholding = 0
+        self.simulated_composite = 0
+        self.simulated_withholding = 0
+        self.distributions = 0
+        self.changed = 0
+
+    def add(self, current: Tuple[int, int], simulated: Tuple[int, int]) -> None:
+        self.current_composite += current[0]
+        self.current_withholding += current[1]
+        self.simulated_composite += simulated[0]
+        self.simulated_withholding += simulated[1]
+        self.distributions += 1
+        if current != simulated:
+            self.changed += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        composite_delta = self.simulated_composite - self.current_composite
+        withholding_delta = self.simulated_withholding - self.current_withholding
+        return {
+            "distributions": self.distributions,
+            "changed_distributions": self.changed,
+            "current_composite_tax": cents_to_float(self.current_composite),
+            "simulated_composite_tax": cents_to_float(self.simulated_composite),
+            "composite_tax_delta": cents_to_float(composite_delta),
+            "current_withholding_tax": cents_to_float(self.current_withholding),
+            "simulated_withholding_tax": cents_to_float(self.simulated_withholding),
+            "withholding_tax_delta": cents_to_float(withholding_delta),
+            "total_tax_delta": cents_to_float(composite_delta + withholding_delta),
+        }
+
+    @property
+    def total_delta_cents(self) -> int:
+        return (
+            self.simulated_composite + self.simulated_withholding
+            - self.current_composite - self.current_withholding
+        )
+
+
+class TaxSimulationService:
+    """Run the tax logic with candidate rules over stored distributions, read-only.
+
+    Distributions are read as plain column tuples, so no ORM instances are
+    loaded or modified and nothing can be flushed back to the database.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._tax_service = TaxCalculationService(db)
+
+    def load_candidate_rules(self, file_path: Path) -> RuleContext:
+        """Validate and parse a SALT workbook into an in-memory rule context."""
+        processor = ExcelProcessor()
+        try:
+            dataframes = processor.load_excel_file(file_path)
+        except Exception as exc:
+            raise CandidateRulesError([{
+                "sheet": "FILE",
+                "row": 1,
+                "column": None,
+                "error_code": "VALIDATION_FAILED",
+                "message": f"File validation failed: {str(exc)}",
+                "field_value": None,
+            }]) from exc
+
+        validation = processor.validate_file(file_path, dataframes=dataframes)
+        if not validation.is_valid:
+            raise CandidateRulesError(validation.errors)
+
+        processing = processor.process_file(file_path, None, dataframes=dataframes)
+        return RuleContext.from_rules(None, processing.withholding_rules, processing.composite_rules)
+
+    def simulate(
+        self,
+        session_ids: Sequence[str],
+        candidate: RuleContext,
+        investor_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Compare stored tax amounts with those the candidate rules would produce.
+
+        Returns overall, per-jurisdiction and per-investor totals. Investors
+        are limited to those whose tax changes, largest absolute delta first.
+        """
+        start = time.perf_counter()
+        overall = _Totals()
+        by_jurisdiction: Dict[str, _Totals] = {}
+        by_investor: Dict[int, _Totals] = {}
+        investor_names: Dict[int, str] = {}
+        compute = self._tax_service.compute_tax_cents
+        entity_code = self._tax_service.entity_code
+
+        for row in self._iter_distribution_rows(session_ids):
+            (investor_id, investor_name, entity_type, tax_state, jurisdiction, amount,
+             composite_exemption, withholding_exemption, composite_tax, withholding_tax) = row
+
+            current = (optional_cents(composite_tax) or 0, optional_cents(withholding_tax) or 0)
+            simulated_composite, simulated_withholding = compute(
+                amount_cents=to_cents(amount),
+                jurisdiction=jurisdiction.value,
+                investor_state=tax_state.value if tax_state is not None else None,
+                entity_code=entity_code(entity_type),
+                composite_exemption=composite_exemption,
+                withholding_exemption=withholding_exemption,
+                context=candidate,
+            )
+            simulated = (simulated_composite or 0, simulated_withholding or 0)
+
+            overall.add(current, simulated)
+            jurisdiction_totals = by_jurisdiction.get(jurisdiction.value)
+            if jurisdiction_totals is None:
+                jurisdiction_totals = by_jurisdiction[jurisdiction.value] = _Totals()
+            jurisdiction_totals.add(current, simulated)
+            investor_totals = by_investor.get(investor_id)
+            if investor_totals is None:
+                investor_totals = by_investor[investor_id] = _Totals()
+                investor_names[investor_id] = investor_name
+            investor_totals.add(current, simulated)
+
+        changed_investors = sorted(
+            (item for item in by_investor.items() if item[1].changed),
+            key=lambda item: (-abs(item[1].total_delta_cents), item[0]),
+        )
+        if investor_limit is not None:
+            changed_investors = changed_investors[:investor_limit]
+
+        elapsed = time.perf_counter() - start
+        observe_stage("tax_simulation", elapsed, items=overall.distributions)
+        logger.info(
+            f"Simulated {overall.distributions} distributions across {len(session_ids)} sessions "
+            f"in {elapsed * 1000:.1f} ms"
+        )
+        return {
+            "session_ids": list(session_ids),
+            "summary": overall.as_dict(),
+            "jurisdictions": {
+                jurisdiction: totals.as_dict()
+                for jurisdiction, totals in sorted(by_jurisdiction.items())
+            },
+            "investors": [
+                {"investor_id": investor_id, "investor_name": investor_names[investor_id], **totals.as_dict()}
+                for investor_id, totals in changed_investors
+            ],
+            "unchanged_investors": sum(1 for totals in by_investor.values() if not totals.changed),
+            "duration_ms": round(elapsed * 1000, 3),
+        }
+
+    def _iter_distribution_rows(self, session_ids: Sequence[str]):
+        """Yield the columns the tax logic needs, batched by session id."""
+        for offset in range(0, len(session_ids), ID_BATCH_SIZE):
+            yield from self.db.execute(
+                select(
+                    Distribution.investor_id,
+                    Investor.investor_name,
+                    Investor.investor_entity_type,
+                    Investor.investor_tax_state,
+                    Distribution.jurisdiction,
+                    Distribution.amount,
+                    Distribution.composite_exemption,
+                    Distribution.withholding_exemption,
+                    Distribution.composite_tax_amount,
+                    Distribution.withholding_tax_amount,
+                )
+                .join(Investor, Investor.id == Distribution.investor_id)
+                .where(Distribution.session_id.in_(session_ids[offset:offset + ID_BATCH_SIZE]))
+            )
@@ -1,40 +1,191 @@
-"""Validation service for SALT rule sets - simplified to only include used methods."""
+"""Validation service for persisted upload validation errors."""
 
+import csv
+import io
 import logging
-from typing import Dict, List, Optional
+import os
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
-from ..models.salt_rule_set import SaltRuleSet
-from ..models.validation_issue import ValidationIssue, IssueSeverity
+from ..models.session_error_count import SessionErrorCount
+from ..models.validation_error import ErrorSeverity, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT batch and per page when streaming the CSV export
+ERROR_BATCH_SIZE = int(os.getenv("VALIDATION_ERROR_BATCH_SIZE", "1000"))
+
+ERROR_CSV_COLUMNS = [
+    "row_number", "column_name", "error_code", "severity", "error_message", "field_value"
+]
+
 
 class ValidationService:
-    """Service for validation of SALT rule sets."""
+    """Service for storing and reporting upload validation errors."""
 
     def __init__(self, db: Session):
         self.db = db
 
+    def save_errors(self, session_id: str, errors: Iterable, batch_size: int = ERROR_BATCH_SIZE) -> int:
+        """Bulk insert parsed validation errors for a session.
+
+        ``errors`` yields objects shaped like ``ExcelValidationError``; rows
+        are written with one executemany per batch. Counts per code and
+        severity are saved alongside: an ``ErrorStore``'s exact counts, which
+        include the errors it did not keep, or else those of the errors
+        given. The caller commits.
+        """
+        kind_counts = getattr(errors, "kind_counts", None)
+        counted = Counter() if kind_counts is None else None
+        saved = 0
+        batch: List[Dict] = []
+        for error in errors:
+            if counted is not None:
+                counted[(error.error_code, error.severity)] += 1
+            batch.append({
+                "session_id": session_id,
+                "row_number": error.row_number,
+                "column_name": error.column_name,
+                "error_code": error.error_code,
+                "error_message": error.error_message[:500],
+                "severity": error.severity,
+                "field_value": error.field_value,
+            })
+            if len(batch) >= batch_size:
+                self.db.execute(insert(ValidationError), batch)
+                saved += len(batch)
+                batch = []
+        if batch:
+            self.db.execute(insert(ValidationError), batch)
+            saved += len(batch)
+
+        counts = [
+            {
+                "session_id": session_id,
+                "error_code": error_code,
+                "severity": severity,
+                "error_count": count,
+            }
+            for (error_code, severity), count in (kind_counts if counted is None else counted).items()
+        ]
+        if counts:
+            self.db.execute(insert(SessionErrorCount), counts)
+
+        if saved:
+            logger.info(f"Saved {saved} validation errors for session {session_id}")
+        return saved
+
+    def get_errors_by_session(
+        self,
+        session_id: str,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[ValidationError]:
+        """Get a session's validation errors in id order.
 
-    def get_errors_by_session(self, session_id: str) -> List[Dict]:
-        """Get validation errors for a session (used by results API)."""
-        # This method should be implemented based on the session model
-        # For now, return empty list since this seems to be for a different validation system
-        return []
+        Pages are keyed on the last id seen (``after_id``) rather than an
+        offset, so each page is an index range scan.
+        """
+        query = self.db.query(ValidationError).filter(ValidationError.session_id == session_id)
+        if after_id is not None:
+            query = query.filter(ValidationError.id > after_id)
+        query = query.order_by(ValidationError.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def count_errors(self, session_id: str) -> int:
+        """Count a session's validation errors without loading them."""
+        return (
+            self.db.query(func.count(ValidationError.id))
+            .filter(ValidationError.session_id == session_id)
+            .scalar()
+        )
 
     def get_error_summary(self, session_id: str) -> Dict:
-        """Get error summary for a session (used by results API)."""
-        # This method should be implemented based on the session model
-        # For now, return empty summary since this seems to be for a different validation system
+        """Summarize a session's errors by severity, code and column in SQL.
+
+        Totals and per-code counts come from the saved exact counts; sessions
+        saved before those were recorded are counted from their error rows.
+        Per-column counts cover the error rows kept in detail.
+        """
+        by_code = (
+            self.db.query(
+                SessionErrorCount.error_code,
+                SessionErrorCount.severity,
+                func.sum(SessionErrorCount.error_count),
+            )
+            .filter(SessionErrorCount.session_id == session_id)
+            .group_by(SessionErrorCount.error_code, SessionErrorCount.severity)
+            .all()
+        )
+        if not by_code:
+            by_code = (
+                self.db.query(ValidationError.error_code, ValidationError.severity, func.count())
+                .filter(ValidationError.session_id == session_id)
+                .group_by(ValidationError.error_code, ValidationError.severity)
+                .all()
+            )
+        by_column = (
+            self.db.query(ValidationError.column_name, func.count())
+            .filter(ValidationError.session_id == session_id)
+            .group_by(ValidationError.column_name)
+            .all()
+        )
+
+        errors_by_code: Dict[str, int] = {}
+        severity_counts = {severity: 0 for severity in ErrorSeverity}
+        for error_code, severity, count in by_code:
+            errors_by_code[error_code] = errors_by_code.get(error_code, 0) + count
+            severity_counts[severity] += count
+
         return {
-            "totalErrors": 0,
-            "errorsByType": {},
-            "errorsBySheet": {}
+            "total_errors": sum(severity_counts.values()),
+            "error_count": severity_counts[ErrorSeverity.ERROR],
+            "warning_count": severity_counts[ErrorSeverity.WARNING],
+            "errors_by_code": errors_by_code,
+            "errors_by_column": dict(by_column),
         }
 
+    def iter_errors_csv(self, session_id: str, batch_size: int = ERROR_BATCH_SIZE) -> Iterator[str]:
+        """Yield a session's errors as CSV text, one chunk per keyset page."""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(ERROR_CSV_COLUMNS)
+
+        after_id = None
+        while True:
+            page = (
+                self.db.query(
+                    ValidationError.id,
+                    ValidationError.row_number,
+                    ValidationError.column_name,
+                    ValidationError.error_code,
+                    ValidationError.severity,
+                    ValidationError.error_message,
+                    ValidationError.field_value,
+                )
+                .filter(ValidationError.session_id == session_id)
+                .filter(ValidationError.id > (after_id or 0))
+                .order_by(ValidationError.id)
+                .limit(batch_size)
+                .all()
+            )
+            for error_id, row_number, column_name, error_code, severity, message, value in page:
+                writer.writerow([row_number, column_name, error_code, severity.value, message, value])
+
+            chunk = output.getvalue()
+            if chunk:
+                yield chunk
+                output.seek(0)
+                output.truncate()
+            if len(page) < batch_size:
+                break
+            after_id = page[-1].id
+
     def export_errors_to_csv_data(self, session_id: str) -> str:
-        """Export errors to CSV format (used by download API)."""
-        # This method should be implemented based on the session model
-        # For now, return empty CSV since this seems to be for a different validation system
-        return "error_type,sheet_name,row_number,message\n"
\ No newline at end of file
+        """Export errors to CSV format as a single string."""
+        return "".join(self.iter_errors_csv(session_id))
@@ -0,0 +1,180 @@
+"""Encoded response bodies with strong ETags, precompressed variants and 304s.
+
+Payloads that are cached between requests (session results, published rule
+sets) keep their compressed variants next to the identity body, so repeat
+requests neither re-serialize nor re-compress. Other responses are
+compressed on the fly by the gzip middleware, which leaves bodies that
+already carry a ``Content-Encoding`` alone.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Mapping, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip is used without it
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+_COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    # mtime=0 keeps the gzip bytes stable for a given body
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+}
+if brotli is not None:
+    _COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=9)
+
+# Preferred first when the client accepts several
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def content_etag(body: bytes) -> str:
+    """Strong validator for a body: a 128-bit digest of its bytes."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def version_etag(*parts: object) -> str:
+    """Strong validator derived from version fields instead of the body."""
+    return content_etag("|".join(str(part) for part in parts).encode("utf-8"))
+
+
+class EncodedPayload:
+    """An encoded response body, its ETag and compressed variants made on demand."""
+
+    __slots__ = ("body", "media_type", "etag", "_variants")
+
+    def __init__(self, body: bytes, media_type: str, etag: Optional[str] = None) -> None:
+        self.body = body
+        self.media_type = media_type
+        self.etag = etag or content_etag(body)
+        self._variants: Dict[str, bytes] = {}
+
+    def variant(self, encoding: str) -> bytes:
+        """The body compressed with ``encoding``, compressed once and kept."""
+        compressed = self._variants.get(encoding)
+        if compressed is None:
+            # Racing requests may both compress; either result is identical
+            compressed = _COMPRESSORS[encoding](self.body)
+            self._variants[encoding] = compressed
+        return compressed
+
+
+class PayloadCache:
+    """LRU of payloads for content that never changes under its key."""
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, EncodedPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[EncodedPayload]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: Hashable, payload: EncodedPayload) -> None:
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding the client accepts, if any."""
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in _COMPRESSORS:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def _representation_etag(etag: str, encoding: Optional[str]) -> str:
+    # Each encoding is a different representation, so it gets its own tag
+    return f'"{etag}-{encoding}"' if encoding else f'"{etag}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``If-None-Match`` against any representation of ``etag``."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate == etag or candidate.rsplit("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when the request's validator matches ``etag``."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or not etag_matches(if_none_match, etag):
+        return None
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    return Response(
+        status_code=304,
+        headers={
+            "ETag": _representation_etag(etag, encoding),
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+        },
+    )
+
+
+def payload_response(
+    request: Request,
+    payload: EncodedPayload,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Send ``payload`` compressed as negotiated, or 304 when it is unchanged."""
+    unchanged = not_modified(request, payload.etag)
+    if unchanged is not None:
+        return unchanged
+
+    encoding = None
+    if len(payload.body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    response_headers = {
+        **(headers or {}),
+        "ETag": _representation_etag(payload.etag, encoding),
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache",
+    }
+    if encoding is None:
+        return Response(payload.body, media_type=payload.media_type, headers=response_headers)
+    response_headers["Content-Encoding"] = encoding
+    return Response(
+        payload.variant(encoding), media_type=payload.media_type, headers=response_headers
+    )
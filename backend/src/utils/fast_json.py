@@ -0,0 +1,37 @@
+"""JSON encoding for large API payloads, bypassing ``jsonable_encoder``.
+
+Callers pass only JSON-native values (str, int, float, bool, None, lists and
+dicts); enums, Decimals and datetimes are converted when rows are built.
+orjson is used when installed, otherwise the C-accelerated stdlib encoder
+with the same compact output as FastAPI's ``JSONResponse``.
+"""
+
+import json
+from typing import Any
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize JSON-native content to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return _encoder.encode(content).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response that renders with :func:`dumps`; bytes are sent as-is."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,50 @@
+"""Deferred imports for heavy optional-at-startup modules (pandas)."""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Module stand-in that imports the real module on first attribute access.
+
+    Attribute lookups are forwarded to the real module on every access, so
+    monkeypatching the real module (e.g. ``pandas.read_excel`` in tests) is seen
+    through the proxy.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return ``name`` itself if already imported, otherwise a :class:`LazyModule`."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """Return True once the real module has been imported."""
+    return name in sys.modules
@@ -0,0 +1,148 @@
+"""Fixed-point money kernel.
+
+Amounts are carried as integer cents and tax rates as integers scaled by
+``RATE_SCALE``, so multiplication and rounding are exact and cheap compared to
+``Decimal`` arithmetic. Conversions to ``Decimal`` happen only at the ORM
+boundary (``Numeric(12, 2)`` columns) and to text only at export time.
+
+All rounding is ROUND_HALF_UP (half away from zero), matching the previous
+``Decimal.quantize(..., rounding=ROUND_HALF_UP)`` behaviour.
+"""
+
+import re
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Optional, Sequence, Union
+
+CENTS_PER_UNIT = 100
+RATE_DECIMALS = 6
+RATE_SCALE = 10 ** RATE_DECIMALS
+
+# int64 products stay exact while |cents * rate_units| < 2**63, i.e. amounts up
+# to ~92 billion dollars at a 100% rate; Numeric(12, 2) tops out at 10 billion.
+MAX_VECTOR_CENTS = (2 ** 63 - 1) // RATE_SCALE
+
+_AMOUNT_PATTERN = re.compile(r"^([+-]?)(\d*)(?:\.(\d*))?$")
+
+MoneyValue = Union[int, float, str, Decimal]
+
+
+def parse_cents(text: str) -> Optional[int]:
+    """Parse a plain decimal string (no separators) into integer cents.
+
+    Handles the common ``"1234"``/``"1234.5"``/``"-0.125"`` forms without
+    ``Decimal``; anything else (exponents, ``NaN``) falls back to ``Decimal``.
+    Returns None when the text is not a finite number.
+    """
+    match = _AMOUNT_PATTERN.match(text)
+    if match is None:
+        try:
+            return _decimal_to_cents(Decimal(text))
+        except (InvalidOperation, ValueError):
+            return None
+
+    sign, whole, fraction = match.group(1), match.group(2), match.group(3) or ""
+    if not whole and not fraction:
+        return None
+
+    cents = int(whole or "0") * CENTS_PER_UNIT + int(fraction[:2].ljust(2, "0"))
+    # Only the third fractional digit decides a half-up round at cent precision
+    if len(fraction) > 2 and fraction[2] >= "5":
+        cents += 1
+    return -cents if sign == "-" else cents
+
+
+def _decimal_to_cents(value: Decimal) -> int:
+    if not value.is_finite():
+        raise InvalidOperation(f"Non-finite amount: {value}")
+    return int((value * CENTS_PER_UNIT).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def to_cents(value: MoneyValue) -> int:
+    """Convert an amount to integer cents with ROUND_HALF_UP."""
+    if isinstance(value, Decimal):
+        return _decimal_to_cents(value)
+    if isinstance(value, bool):
+        raise TypeError("Boolean is not a money amount")
+    if isinstance(value, int):
+        return value * CENTS_PER_UNIT
+    if isinstance(value, float):
+        # repr gives the shortest round-tripping text, e.g. 0.1 -> "0.1"
+        value = repr(value)
+    cents = parse_cents(str(value).strip())
+    if cents is None:
+        raise ValueError(f"Invalid money amount: {value!r}")
+    return cents
+
+
+def optional_cents(value: Optional[MoneyValue]) -> Optional[int]:
+    """Convert to cents, passing None through."""
+    return None if value is None else to_cents(value)
+
+
+def from_cents(cents: int) -> Decimal:
+    """Return a two-place ``Decimal`` for ORM ``Numeric(12, 2)`` columns."""
+    return Decimal(cents).scaleb(-2)
+
+
+def cents_to_str(cents: int) -> str:
+    """Format cents as a plain ``"1234.56"`` string for CSV/JSON text."""
+    sign = "-" if cents < 0 else ""
+    whole, fraction = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"{sign}{whole}.{fraction:02d}"
+
+
+def cents_to_float(cents: int) -> float:
+    """Return the nearest float to ``cents / 100`` (exact decimal round trip)."""
+    return cents / CENTS_PER_UNIT
+
+
+def format_money(value: Optional[MoneyValue]) -> str:
+    """Format an amount as a two-place string, or "" when missing."""
+    return "" if value is None else cents_to_str(to_cents(value))
+
+
+def money_float(value: Optional[MoneyValue]) -> Optional[float]:
+    """Convert an amount to a JSON number rounded to cents, or None."""
+    return None if value is None else cents_to_float(to_cents(value))
+
+
+def to_rate_units(rate: MoneyValue) -> int:
+    """Convert a fractional rate (``0.0525``) to integer units of 1/RATE_SCALE."""
+    if isinstance(rate, float):
+        rate = repr(rate)
+    decimal_rate = rate if isinstance(rate, Decimal) else Decimal(str(rate))
+    return int((decimal_rate * RATE_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def mul_rate(cents: int, rate_units: int) -> int:
+    """Multiply cents by a scaled rate, rounding the result ROUND_HALF_UP to cents."""
+    product = cents * rate_units
+    quotient, remainder = divmod(abs(product), RATE_SCALE)
+    if remainder * 2 >= RATE_SCALE:
+        quotient += 1
+    return quotient if product >= 0 else -quotient
+
+
+def mul_rate_array(cents: Any, rate_units: Any) -> Any:
+    """Vectorized :func:`mul_rate` over int64 arrays (or an array and a scalar).
+
+    Inputs must satisfy ``abs(cents) <= MAX_VECTOR_CENTS`` for rates up to 100%.
+    """
+    import numpy as np
+
+    product = np.asarray(cents, dtype=np.int64) * np.asarray(rate_units, dtype=np.int64)
+    quotient, remainder = np.divmod(np.abs(product), RATE_SCALE)
+    quotient += remainder * 2 >= RATE_SCALE
+    return np.where(product < 0, -quotient, quotient)
+
+
+def to_cents_array(values: Sequence[Optional[MoneyValue]]) -> Any:
+    """Convert a sequence of amounts to an int64 cents array (None -> 0)."""
+    import numpy as np
+
+    return np.fromiter(
+        (0 if value is None else to_cents(value) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+
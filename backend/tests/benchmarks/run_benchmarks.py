@@ -0,0 +1,359 @@
+"""Benchmark the upload pipeline against deterministic synthetic workbooks.
+
+Usage (from ``backend/``)::
+
+    python tests/benchmarks/run_benchmarks.py --rows 1000 5000 --output bench.json
+    python tests/benchmarks/run_benchmarks.py --save-baseline
+    python tests/benchmarks/run_benchmarks.py --compare
+
+``--compare`` exits with status 1 when any benchmark median is slower than the
+stored baseline by more than ``--threshold`` (and by at least
+``--min-delta-ms``, so sub-millisecond noise is not reported).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCHMARK_DIR.parents[1]
+for path in (str(BACKEND_DIR), str(BENCHMARK_DIR)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from fastapi.testclient import TestClient  # noqa: E402
+import numpy as np  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.main import app  # noqa: E402
+from src.database.connection import Base, get_db  # noqa: E402
+from src.services.allocation_service import allocate_cents  # noqa: E402
+from src.services.excel_processor import ExcelProcessor  # noqa: E402
+from src.services.excel_service import ExcelService  # noqa: E402
+from src.services.tax_calculation_service import TaxCalculationService  # noqa: E402
+from synthetic import (  # noqa: E402
+    DEFAULT_STATES,
+    InvestorWorkbookSpec,
+    SaltMatrixSpec,
+    write_investor_workbook,
+    write_salt_matrix,
+)
+
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+SALT_MATRIX_FILENAME = "SALT Matrix_bench.xlsx"
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Jurisdiction pools in the allocation benchmark
+ALLOCATION_POOLS = 50
+
+
+def _summarize(samples: List[float], items: int) -> Dict[str, Any]:
+    median = statistics.median(samples)
+    return {
+        "median_s": round(median, 6),
+        "min_s": round(min(samples), 6),
+        "max_s": round(max(samples), 6),
+        "repeat": len(samples),
+        "items": items,
+        "items_per_s": round(items / median, 1) if items and median > 0 else None,
+    }
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> List[float]:
+    """Time ``func`` ``repeat`` times, running ``setup`` untimed before each call."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class BenchEnvironment:
+    """Isolated in-memory database and TestClient bound to the FastAPI app."""
+
+    def __init__(self) -> None:
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.client = TestClient(app)
+
+    def get_db(self) -> Iterator[Any]:
+        db = self.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def bound(self) -> Iterator["BenchEnvironment"]:
+        app.dependency_overrides[get_db] = self.get_db
+        try:
+            yield self
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            self.engine.dispose()
+
+    def upload_salt_matrix(self, salt_path: Path) -> None:
+        with open(salt_path, "rb") as handle:
+            response = self.client.post(
+                "/api/salt-rules/upload",
+                files={"file": (SALT_MATRIX_FILENAME, handle, XLSX_CONTENT_TYPE)},
+            )
+        _expect(response, 201, "SALT matrix upload")
+
+    def upload_workbook(self, workbook_path: Path, filename: str) -> Dict[str, Any]:
+        with open(workbook_path, "rb") as handle:
+            response = self.client.post(
+                "/api/upload", files={"file": (filename, handle, XLSX_CONTENT_TYPE)}
+            )
+        _expect(response, 200, "investor upload")
+        payload = response.json()
+        if payload.get("status") != "completed":
+            raise RuntimeError(f"investor upload did not complete: {payload}")
+        return payload
+
+
+def _expect(response: Any, status_code: int, label: str) -> None:
+    if response.status_code != status_code:
+        raise RuntimeError(
+            f"{label} returned {response.status_code}: {response.text[:500]}"
+        )
+
+
+def run_size(
+    rows: int, states: int, exemption_density: float, repeat: int, workdir: Path
+) -> Dict[str, Dict[str, Any]]:
+    """Run every benchmark for one workbook size and return keyed summaries."""
+    spec = InvestorWorkbookSpec(
+        rows=rows,
+        states=DEFAULT_STATES[:states],
+        exemption_density=exemption_density,
+    )
+    workbook_path = write_investor_workbook(spec, workdir)
+    salt_path = write_salt_matrix(SaltMatrixSpec(), workdir / SALT_MATRIX_FILENAME)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record(name: str, samples: List[float], items: int) -> None:
+        results[f"{name}[rows={rows}]"] = _summarize(samples, items)
+
+    record(
+        "excel_service.parse_excel_file",
+        measure(lambda: ExcelService().parse_excel_file(workbook_path, spec.filename), repeat),
+        rows,
+    )
+    # One pool per jurisdiction column, split across every investor row
+    rng = np.random.default_rng(3)
+    units = rng.multinomial(10 ** 6, np.full(rows, 1 / rows)).astype(np.int64)
+    pools = rng.integers(0, 10 ** 11, size=ALLOCATION_POOLS)
+    record(
+        "allocation.allocate_cents",
+        measure(lambda: allocate_cents(units, pools), repeat),
+        rows * ALLOCATION_POOLS,
+    )
+
+    processed = ExcelProcessor().process_file(salt_path, "bench")
+    record(
+        "excel_processor.process_file",
+        measure(lambda: ExcelProcessor().process_file(salt_path, "bench"), repeat),
+        sum(processed.rules_processed.values()),
+    )
+
+    # Each upload needs a fresh database: re-uploading the same fund would hit
+    # the distribution uniqueness constraint.
+    environments: List[BenchEnvironment] = []
+
+    def fresh_environment() -> None:
+        environment = BenchEnvironment()
+        environments.append(environment)
+        app.dependency_overrides[get_db] = environment.get_db
+        environment.upload_salt_matrix(salt_path)
+
+    upload_payloads: List[Dict[str, Any]] = []
+    record(
+        "api.upload",
+        measure(
+            lambda: upload_payloads.append(
+                environments[-1].upload_workbook(workbook_path, spec.filename)
+            ),
+            repeat,
+            setup=fresh_environment,
+        ),
+        rows,
+    )
+
+    environment = environments[-1]
+    for stale in environments[:-1]:
+        stale.engine.dispose()
+    session_id = upload_payloads[-1]["session_id"]
+    distributions = upload_payloads[-1]["distributions_created"]
+
+    with environment.bound():
+
+        def apply_tax() -> None:
+            db = environment.SessionLocal()
+            try:
+                TaxCalculationService(db).apply_for_session(session_id)
+                db.commit()
+            finally:
+                db.close()
+
+        record("tax.apply_for_session", measure(apply_tax, repeat), distributions)
+
+        endpoints: List[Tuple[str, str]] = [
+            ("api.results", f"/api/results/{session_id}"),
+            ("api.results_preview", f"/api/results/{session_id}/preview?mode=results"),
+            ("api.results_report_csv", f"/api/results/{session_id}/report"),
+            ("api.download_csv", f"/api/results/{session_id}/download?format=csv"),
+            ("api.download_xlsx", f"/api/results/{session_id}/download?format=excel"),
+        ]
+        for name, url in endpoints:
+
+            def fetch(url: str = url, name: str = name) -> None:
+                _expect(environment.client.get(url), 200, name)
+
+            record(name, measure(fetch, repeat), distributions)
+
+    return results
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+    min_delta_ms: float,
+) -> List[Dict[str, Any]]:
+    """Return one comparison row per benchmark present in both result sets."""
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        before = reference["median_s"]
+        after = result["median_s"]
+        ratio = after / before if before > 0 else float("inf")
+        regression = (
+            ratio > 1 + threshold and (after - before) * 1000 >= min_delta_ms
+        )
+        rows.append({
+            "name": name,
+            "baseline_s": before,
+            "current_s": after,
+            "ratio": round(ratio, 3),
+            "regression": regression,
+        })
+    return rows
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000],
+                        help="Workbook sizes to benchmark")
+    parser.add_argument("--states", type=int, default=len(DEFAULT_STATES),
+                        help=f"Distribution states per row (max {len(DEFAULT_STATES)})")
+    parser.add_argument("--exemption-density", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write results to the baseline file")
+    parser.add_argument("--compare", action="store_true",
+                        help="Compare against the baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="fundflow-bench-") as tmp:
+        workdir = Path(tmp)
+        # The upload endpoint persists raw files under ./data/uploads
+        os.chdir(workdir)
+        try:
+            for rows in args.rows:
+                results.update(run_size(
+                    rows, args.states, args.exemption_density, args.repeat, workdir
+                ))
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "states": args.states,
+            "exemption_density": args.exemption_density,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    for name, result in results.items():
+        print(f"{name:60s} {result['median_s'] * 1000:10.2f} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 2
+        baseline = json.loads(args.baseline.read_text())
+        rows = compare(report, baseline, args.threshold, args.min_delta_ms)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"{row['name']:60s} x{row['ratio']:<6} {flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Deterministic synthetic workbooks for benchmarking the upload pipeline.
+
+Every generator takes an explicit seed, so the same spec always produces the
+same cell values and benchmark runs on different machines or commits process
+identical inputs.
+"""
+
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from openpyxl import Workbook
+
+from src.models.enums import InvestorEntityType, USJurisdiction
+from src.services.excel_processor import ExcelProcessor
+from src.services.excel_service import ExcelService
+
+DEFAULT_STATES: Tuple[str, ...] = ("TX", "NM", "CO", "CA", "NY", "IL", "GA", "PA")
+ALL_STATES: Tuple[str, ...] = tuple(state.value for state in USJurisdiction)
+
+# Coding columns in the order used by the published SALT matrix
+SALT_ENTITY_CODINGS: Tuple[str, ...] = (
+    "Individual", "Estate", "Trust", "Partnership",
+    "S Corporation", "Corporation", "Exempt Org", "IRA",
+)
+
+
+@dataclass
+class InvestorWorkbookSpec:
+    """Shape of a synthetic v1.3 investor distribution workbook."""
+
+    rows: int = 1000
+    states: Sequence[str] = DEFAULT_STATES
+    # Probability that a given state exemption cell is marked "X"
+    exemption_density: float = 0.1
+    # Probability that a given distribution cell is left empty
+    sparse_density: float = 0.1
+    # Relative weights keyed by entity display value; uniform when empty
+    entity_mix: Dict[str, float] = field(default_factory=dict)
+    fund_code: str = "Bench Fund"
+    quarter: str = "Q1"
+    year: int = 2025
+    seed: int = 1337
+
+    @property
+    def filename(self) -> str:
+        return (
+            f"(Input Data) {self.fund_code}_{self.quarter} {self.year} "
+            f"distribution data_v1.3.xlsx"
+        )
+
+
+@dataclass
+class SaltMatrixSpec:
+    """Shape of a synthetic SALT rule matrix workbook."""
+
+    states: Sequence[str] = ALL_STATES
+    # Probability that a state/entity rate is zero
+    zero_rate_density: float = 0.3
+    mandatory_density: float = 0.2
+    seed: int = 7331
+
+
+def _format_amount(value: int) -> str:
+    return f"{value:,}"
+
+
+def investor_workbook_headers(spec: InvestorWorkbookSpec) -> List[str]:
+    """Return the header row: base columns, distributions, then exemptions."""
+    headers = list(ExcelService.REQUIRED_BASE_HEADERS)
+    headers.extend(f"Distribution {state}" for state in spec.states)
+    for state in spec.states:
+        headers.append(f"{state} Withholding Exemption")
+        headers.append(f"{state} Composite Exemption")
+    return headers
+
+
+def generate_investor_rows(spec: InvestorWorkbookSpec) -> List[List[Optional[str]]]:
+    """Build the data rows (without header) for ``spec``."""
+    rng = random.Random(spec.seed)
+    entity_values = [entity.value for entity in InvestorEntityType]
+    weights = None
+    if spec.entity_mix:
+        weights = [spec.entity_mix.get(value, 0.0) for value in entity_values]
+
+    rows: List[List[Optional[str]]] = []
+    for index in range(1, spec.rows + 1):
+        entity_type = rng.choices(entity_values, weights=weights)[0]
+        commitment = rng.randint(1, 10000) / 100
+        row: List[Optional[str]] = [
+            f"Investor {index:06d}",
+            entity_type,
+            rng.choice(ALL_STATES),
+            f"{commitment:.2f}%",
+        ]
+        for _state in spec.states:
+            if rng.random() < spec.sparse_density:
+                row.append(None)
+            else:
+                row.append(_format_amount(rng.randint(1, 2_000_000)))
+        for _state in spec.states:
+            row.append("X" if rng.random() < spec.exemption_density else None)
+            row.append("X" if rng.random() < spec.exemption_density else None)
+        rows.append(row)
+    return rows
+
+
+def write_investor_workbook(spec: InvestorWorkbookSpec, directory: Path) -> Path:
+    """Write the investor workbook for ``spec`` into ``directory``."""
+    path = Path(directory) / spec.filename
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Distributions")
+    worksheet.append(investor_workbook_headers(spec))
+    for row in generate_investor_rows(spec):
+        worksheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def write_salt_matrix(spec: SaltMatrixSpec, path: Path) -> Path:
+    """Write a SALT matrix with Withholding and Composite sheets to ``path``."""
+    rng = random.Random(spec.seed)
+    withholding_prefix = ExcelProcessor.WITHHOLDING_ENTITY_PREFIX
+    composite_prefix = ExcelProcessor.COMPOSITE_ENTITY_PREFIX
+
+    def rate() -> float:
+        if rng.random() < spec.zero_rate_density:
+            return 0.0
+        return rng.randint(1, 120) / 1000
+
+    workbook = Workbook(write_only=True)
+
+    withholding = workbook.create_sheet("Withholding")
+    withholding.append(
+        ["State", "State Abbrev"]
+        + [withholding_prefix + coding for coding in SALT_ENTITY_CODINGS]
+        + [
+            ExcelProcessor.WITHHOLDING_INCOME_THRESHOLD_COL,
+            ExcelProcessor.WITHHOLDING_IGNORED_COL,
+            ExcelProcessor.WITHHOLDING_TAX_THRESHOLD_COL,
+        ]
+    )
+    for state in spec.states:
+        withholding.append(
+            [f"State {state}", state]
+            + [rate() for _ in SALT_ENTITY_CODINGS]
+            + [rng.choice((0, 0, 1000, 5000)), 0, rng.choice((0, 0, 100))]
+        )
+
+    composite = workbook.create_sheet("Composite")
+    composite.append(
+        ["State", "State Abbrev"]
+        + [composite_prefix + coding for coding in SALT_ENTITY_CODINGS]
+        + [
+            ExcelProcessor.COMPOSITE_IGNORED_COL,
+            ExcelProcessor.COMPOSITE_INCOME_THRESHOLD_COL,
+            ExcelProcessor.COMPOSITE_MANDATORY_FILING_COL,
+        ]
+    )
+    for state in spec.states:
+        composite.append(
+            [f"State {state}", state]
+            + [rate() for _ in SALT_ENTITY_CODINGS]
+            + [
+                None,
+                rng.choice((0, 0, 1000)),
+                "Mandatory" if rng.random() < spec.mandatory_density else None,
+            ]
+        )
+
+    workbook.save(path)
+    return Path(path)
@@ -0,0 +1,133 @@
+"""Tests for the offline batch processing command."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.cli import batch
+from src.database.connection import Base
+from src.models.distribution import Distribution
+from src.models.investor import Investor
+from src.models.user_session import UploadStatus, UserSession
+from tests.benchmarks.synthetic import (
+    InvestorWorkbookSpec,
+    SaltMatrixSpec,
+    write_investor_workbook,
+    write_salt_matrix,
+)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@pytest.fixture()
+def batch_inputs(tmp_path, monkeypatch):
+    # Published SALT matrices are stored under ./data/uploads
+    monkeypatch.chdir(tmp_path)
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    # Same seed: both funds have the same investors
+    for fund_code in ("Fund A", "Fund B"):
+        write_investor_workbook(InvestorWorkbookSpec(rows=30, fund_code=fund_code), inputs)
+    salt_matrix = write_salt_matrix(SaltMatrixSpec(), tmp_path / "SALT Matrix_test.xlsx")
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}")
+    Base.metadata.create_all(engine)
+    try:
+        yield inputs, salt_matrix, sessionmaker(bind=engine)
+    finally:
+        engine.dispose()
+
+
+def _tax_rows(db, fund_code):
+    return sorted(
+        (name, jurisdiction.value, str(amount), str(composite), str(withholding))
+        for name, jurisdiction, amount, composite, withholding in db.execute(
+            select(
+                Investor.investor_name,
+                Distribution.jurisdiction,
+                Distribution.amount,
+                Distribution.composite_tax_amount,
+                Distribution.withholding_tax_amount,
+            )
+            .join(Investor, Investor.id == Distribution.investor_id)
+            .where(Distribution.fund_code == fund_code)
+        )
+    )
+
+
+def test_batch_saves_like_uploads_and_skips_processed_files_on_resume(batch_inputs, api_client):
+    inputs, salt_matrix, session_factory = batch_inputs
+    args = ["--salt-matrix", str(salt_matrix), "--workers", "2", "--tax-batch-size", "1"]
+
+    summary, stage_seconds = batch.run_batch(batch.parse_args([str(inputs), *args]), session_factory)
+
+    assert (summary.files, summary.completed, summary.failed) == (2, 2, 0)
+    assert summary.rows == 60
+    assert {"parse", "investor_resolution", "distribution_insert", "tax_apply_for_sessions"} <= set(stage_seconds)
+
+    # The same workbook uploaded through the API gives the same rows and taxes
+    workbook = next(inputs.glob("*Fund A*"))
+    with open(salt_matrix, "rb") as matrix:
+        api_client.post(
+            "/api/salt-rules/upload",
+            files={"file": (salt_matrix.name, matrix, XLSX_CONTENT_TYPE)},
+            data={"year": "2025", "quarter": "Q1"},
+        ).raise_for_status()
+    with open(workbook, "rb") as upload:
+        api_client.post(
+            "/api/upload", files={"file": (workbook.name, upload, XLSX_CONTENT_TYPE)}
+        ).raise_for_status()
+    from src.database.connection import get_db
+
+    api_db = next(api_client.app.dependency_overrides[get_db]())
+    db = session_factory()
+    try:
+        expected = _tax_rows(api_db, "Fund A")
+        assert any(row[3] != "None" or row[4] != "None" for row in expected)
+        assert _tax_rows(db, "Fund A") == expected
+        # Investors are resolved across files, not created per file
+        assert db.query(Investor).count() == 30
+    finally:
+        db.close()
+        api_db.close()
+
+    resumed, _ = batch.run_batch(
+        batch.parse_args([str(inputs), *args, "--resume"]), session_factory
+    )
+    assert (resumed.skipped, resumed.completed, resumed.failed) == (2, 0, 0)
+
+
+def test_resume_taxes_sessions_saved_before_an_interruption(batch_inputs, monkeypatch):
+    inputs, _, session_factory = batch_inputs
+
+    def interrupted(self, session_ids):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(batch.TaxCalculationService, "apply_for_sessions", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            batch.run_batch(batch.parse_args([str(inputs), "--workers", "1"]), session_factory)
+
+    manifest = [
+        json.loads(line) for line in (inputs / batch.MANIFEST_NAME).read_text().splitlines()
+    ]
+    assert [entry["status"] for entry in manifest] == ["saved", "saved"]
+
+    summary, _ = batch.run_batch(
+        batch.parse_args([str(inputs), "--workers", "1", "--resume"]), session_factory
+    )
+
+    assert (summary.completed, summary.failed) == (2, 0)
+    db = session_factory()
+    try:
+        # The saved sessions were completed rather than saved a second time
+        sessions = db.query(UserSession).all()
+        assert {session.session_id for session in sessions} == {entry["session_id"] for entry in manifest}
+        assert {session.status for session in sessions} == {UploadStatus.COMPLETED}
+        assert db.query(Distribution).count() == len({
+            (row.session_id, row.investor_id, row.jurisdiction) for row in db.query(Distribution)
+        })
+    finally:
+        db.close()
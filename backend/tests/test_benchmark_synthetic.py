@@ -0,0 +1,64 @@
+"""Tests for the synthetic benchmark inputs and baseline comparison."""
+
+from tests.benchmarks.run_benchmarks import compare
+from tests.benchmarks.synthetic import (
+    InvestorWorkbookSpec,
+    SaltMatrixSpec,
+    generate_investor_rows,
+    write_investor_workbook,
+    write_salt_matrix,
+)
+from src.services.excel_processor import ExcelProcessor
+from src.services.excel_service import ExcelService
+
+
+def test_investor_rows_are_deterministic_for_a_seed():
+    spec = InvestorWorkbookSpec(rows=20, seed=42)
+
+    assert generate_investor_rows(spec) == generate_investor_rows(spec)
+    assert generate_investor_rows(spec) != generate_investor_rows(
+        InvestorWorkbookSpec(rows=20, seed=43)
+    )
+
+
+def test_entity_mix_restricts_generated_entity_types():
+    spec = InvestorWorkbookSpec(rows=50, entity_mix={"Trust": 1.0})
+
+    assert {row[1] for row in generate_investor_rows(spec)} == {"Trust"}
+
+
+def test_generated_workbooks_parse_without_errors(tmp_path):
+    spec = InvestorWorkbookSpec(rows=25, states=("TX", "CO"), exemption_density=0.5)
+    workbook_path = write_investor_workbook(spec, tmp_path)
+
+    result = ExcelService().parse_excel_file(workbook_path, spec.filename)
+
+    assert list(result.errors) == []
+    assert result.valid_rows == 25
+
+    salt_path = write_salt_matrix(SaltMatrixSpec(states=("TX", "CO")), tmp_path / "salt.xlsx")
+    processed = ExcelProcessor().process_file(salt_path, "bench")
+
+    assert processed.validation_issues == []
+    assert processed.rules_processed == {"withholding": 16, "composite": 16}
+
+
+def test_compare_flags_only_significant_slowdowns():
+    baseline = {"results": {
+        "fast": {"median_s": 0.100},
+        "noisy": {"median_s": 0.001},
+        "stable": {"median_s": 0.200},
+    }}
+    current = {"results": {
+        "fast": {"median_s": 0.200},
+        "noisy": {"median_s": 0.003},
+        "stable": {"median_s": 0.210},
+        "new": {"median_s": 1.0},
+    }}
+
+    rows = {row["name"]: row for row in compare(current, baseline, 0.25, 5.0)}
+
+    assert rows["fast"]["regression"] is True
+    assert rows["noisy"]["regression"] is False
+    assert rows["stable"]["regression"] is False
+    assert "new" not in rows
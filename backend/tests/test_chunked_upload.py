@@ -0,0 +1,95 @@
+"""Tests for the resumable chunked upload protocol."""
+
+import hashlib
+
+import pytest
+
+from src.services.chunked_upload_service import ChunkedUploadError, ChunkedUploadService
+
+FILENAME = "(Input Data) Fund A_Q1 2025 distribution data_v1.3.csv"
+HEADER = (
+    "Investor Name,Investor Entity Type,Investor Tax State,Commitment Percentage,"
+    "Distribution TX,Distribution CO"
+)
+BODY = "\n".join([
+    HEADER,
+    "Alpha,Corporation,TX,10%,1250.50,0",
+    "Beta,Individual,CO,5%,10,20.25",
+]).encode()
+
+
+def _initiate(api_client):
+    response = api_client.post("/api/uploads", json={"filename": FILENAME, "size": len(BODY)})
+    assert response.status_code == 201
+    return response.json()["upload_id"]
+
+
+def test_interrupted_upload_resumes_from_reported_offset(api_client, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    upload_id = _initiate(api_client)
+
+    first = api_client.put(f"/api/uploads/{upload_id}", params={"offset": 0}, content=BODY[:40])
+    assert first.json()["offset"] == 40
+
+    # A chunk sent for the wrong offset is refused with the offset to resume from
+    skipped = api_client.put(f"/api/uploads/{upload_id}", params={"offset": 80}, content=BODY[80:])
+    assert skipped.status_code == 409
+    assert skipped.headers["Upload-Offset"] == "40"
+
+    status = api_client.get(f"/api/uploads/{upload_id}").json()
+    assert (status["offset"], status["complete"]) == (40, False)
+
+    api_client.put(f"/api/uploads/{upload_id}", params={"offset": 40}, content=BODY[40:])
+
+    mismatch = api_client.post(
+        f"/api/uploads/{upload_id}/finalize", json={"sha256": hashlib.sha256(b"other").hexdigest()}
+    )
+    assert mismatch.status_code == 422
+
+    payload = api_client.post(
+        f"/api/uploads/{upload_id}/finalize", json={"sha256": hashlib.sha256(BODY).hexdigest()}
+    ).json()
+    assert payload["status"] == "completed"
+    assert payload["distributions_created"] == 3
+
+    # The staged bytes are removed once the file is processed
+    assert api_client.get(f"/api/uploads/{upload_id}").status_code == 404
+
+
+def test_chunks_cannot_exceed_declared_size(api_client, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    upload_id = _initiate(api_client)
+
+    response = api_client.put(
+        f"/api/uploads/{upload_id}", params={"offset": 0}, content=BODY + b"\nextra"
+    )
+
+    assert response.status_code == 413
+    incomplete = api_client.post(
+        f"/api/uploads/{upload_id}/finalize", json={"sha256": hashlib.sha256(BODY).hexdigest()}
+    )
+    assert incomplete.status_code == 409
+    assert api_client.delete(f"/api/uploads/{upload_id}").status_code == 204
+
+
+def test_upload_lock_holds_across_workers(tmp_path):
+    # Two service instances on one directory stand in for two worker processes
+    first = ChunkedUploadService(root=tmp_path)
+    second = ChunkedUploadService(root=tmp_path)
+    state = first.initiate(FILENAME, len(BODY), "distributions")
+
+    writer = first.open_chunk(state.upload_id, 0)
+    try:
+        with pytest.raises(ChunkedUploadError) as busy:
+            second.open_chunk(state.upload_id, 0)
+        assert busy.value.status_code == 409
+        with pytest.raises(ChunkedUploadError):
+            second.cancel(state.upload_id)
+        writer.write(BODY[:10])
+    finally:
+        writer.close()
+
+    # Released: the other worker continues from the offset on disk
+    other = second.open_chunk(state.upload_id, 10)
+    other.write(BODY[10:])
+    assert other.close().offset == len(BODY)
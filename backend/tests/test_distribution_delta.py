@@ -0,0 +1,204 @@
+"""Tests for delta ingestion of re-uploaded fund periods."""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.models.distribution import Distribution
+from src.models.distribution_version import DistributionVersion
+from src.models.enums import InvestorEntityType, USJurisdiction
+from src.models.investor import Investor
+from src.models.user import User
+from src.models.user_session import UploadStatus, UserSession
+from src.services.distribution_service import DistributionService
+from src.services.fund_service import FundService
+from src.services.session_service import SessionDeleteError, SessionService
+from src.services.tax_calculation_service import RuleContext, TaxCalculationService
+
+
+def _row(**distributions):
+    return {
+        "distributions": {state: Decimal(amount) for state, amount in distributions.items()},
+        "withholding_exemptions": {},
+        "composite_exemptions": {},
+    }
+
+
+@pytest.fixture()
+def seeded(db_session):
+    fund = FundService(db_session).get_or_create_fund("FUND-DELTA", "Q1", 2025)
+    investors = []
+    for name in ("Alpha", "Beta", "Gamma"):
+        investor = Investor(
+            investor_name=name,
+            investor_entity_type=InvestorEntityType.CORPORATION,
+            investor_tax_state=USJurisdiction.NY,
+        )
+        db_session.add(investor)
+        investors.append(investor)
+    db_session.flush()
+
+    service = DistributionService(db_session)
+    initial = {
+        investors[0].id: _row(TX="100.00", CO="50.00"),
+        investors[1].id: _row(TX="200.00"),
+        investors[2].id: _row(CO="75.00"),
+    }
+    for investor in investors:
+        service.create_distributions_for_investor(investor, "session-1", fund, initial[investor.id])
+    db_session.commit()
+    return fund, investors
+
+
+def _stored(db_session):
+    return {
+        (row.investor_id, row.jurisdiction.value): (row.amount, row.withholding_exemption, row.session_id)
+        for row in db_session.query(Distribution).all()
+    }
+
+
+def test_apply_delta_inserts_updates_and_deletes(db_session, seeded):
+    fund, (alpha, beta, gamma) = seeded
+    unchanged_id = (
+        db_session.query(Distribution.id)
+        .filter(Distribution.investor_id == beta.id)
+        .scalar()
+    )
+    changed = _row(TX="100.00", CO="55.00", NM="10.00")
+    changed["withholding_exemptions"] = {"TX": True}
+
+    delta = DistributionService(db_session).apply_delta(
+        fund,
+        "session-2",
+        [(alpha.id, changed), (beta.id, _row(TX="200.00"))],
+    )
+    db_session.commit()
+
+    assert delta.summary() == {"inserted": 1, "updated": 2, "deleted": 1, "unchanged": 1}
+    assert unchanged_id not in delta.touched_ids
+    assert _stored(db_session) == {
+        (alpha.id, "TX"): (Decimal("100.00"), True, "session-2"),
+        (alpha.id, "CO"): (Decimal("55.00"), False, "session-2"),
+        (alpha.id, "NM"): (Decimal("10.00"), False, "session-2"),
+        (beta.id, "TX"): (Decimal("200.00"), False, "session-2"),
+    }
+
+
+def test_apply_delta_is_a_no_op_for_identical_upload(db_session, seeded):
+    fund, (alpha, beta, gamma) = seeded
+
+    delta = DistributionService(db_session).apply_delta(
+        fund,
+        "session-2",
+        [
+            (alpha.id, _row(TX="100", CO="50")),
+            (beta.id, _row(TX="200")),
+            (gamma.id, _row(CO="75")),
+        ],
+    )
+
+    assert delta.touched_ids == []
+    assert delta.summary()["unchanged"] == 4
+
+
+def test_tax_recalculation_only_visits_touched_rows(db_session, seeded, monkeypatch):
+    fund, (alpha, beta, gamma) = seeded
+    delta = DistributionService(db_session).apply_delta(
+        fund,
+        "session-2",
+        [(alpha.id, _row(TX="100", CO="60")), (beta.id, _row(TX="200")), (gamma.id, _row(CO="75"))],
+    )
+
+    service = TaxCalculationService(db_session)
+    visited = []
+    context = RuleContext(MagicMock(), {("TX", "CORP"): MagicMock()}, {})
+    monkeypatch.setattr(service, "_rule_set_for_period", MagicMock())
+    monkeypatch.setattr(service, "_build_rule_context", lambda rule_set: context)
+    monkeypatch.setattr(service, "_apply_tax_logic", lambda distribution, context: visited.append(distribution.id))
+
+    service.apply_for_distributions(delta.touched_ids)
+
+    assert visited == delta.updated_ids
+    assert len(visited) == 1
+
+
+def _add_sessions(db_session, *session_ids):
+    user = User(email="delta@fundflow.com", company_name="Delta Co")
+    db_session.add(user)
+    db_session.flush()
+    for session_id in session_ids:
+        db_session.add(UserSession(
+            session_id=session_id,
+            user_id=user.id,
+            upload_filename="upload.xlsx",
+            original_filename="upload.xlsx",
+            file_size=1,
+            status=UploadStatus.COMPLETED,
+        ))
+    db_session.commit()
+    return user.id
+
+
+def _rows(db_session):
+    return {
+        (row.investor_id, row.jurisdiction.value): (
+            row.id, row.amount, row.withholding_exemption, row.composite_tax_amount, row.session_id
+        )
+        for row in db_session.query(Distribution).all()
+    }
+
+
+def _apply(db_session, fund, session_id, rows):
+    delta = DistributionService(db_session).apply_delta(fund, session_id, rows)
+    db_session.commit()
+    return delta
+
+
+def test_deleting_delta_sessions_restores_superseded_rows(db_session, seeded):
+    fund, (alpha, beta, gamma) = seeded
+    user_id = _add_sessions(db_session, "session-1", "session-2", "session-3")
+    db_session.query(Distribution).update({Distribution.composite_tax_amount: Decimal("1.00")})
+    db_session.commit()
+    initial = _rows(db_session)
+
+    # Updates Alpha CO, inserts Alpha NM, removes Gamma CO, keeps Beta TX
+    second = _apply(db_session, fund, "session-2", [
+        (alpha.id, _row(TX="100.00", CO="55.00", NM="10.00")),
+        (beta.id, _row(TX="200.00")),
+    ])
+    db_session.query(Distribution).filter(Distribution.id.in_(second.touched_ids)).update(
+        {Distribution.composite_tax_amount: Decimal("2.00")}, synchronize_session=False
+    )
+    db_session.commit()
+    after_second = _rows(db_session)
+
+    third = _apply(db_session, fund, "session-3", [
+        (alpha.id, _row(TX="100.00", CO="60.00")),
+        (beta.id, _row(TX="250.00")),
+        (gamma.id, _row(CO="80.00")),
+    ])
+    assert third.summary() == {"inserted": 1, "updated": 2, "deleted": 1, "unchanged": 1}
+
+    service = SessionService(db_session)
+    assert service.delete_session("session-3", user_id)
+    db_session.commit()
+    assert _rows(db_session) == after_second
+
+    assert service.delete_session("session-2", user_id)
+    db_session.commit()
+    assert _rows(db_session) == initial
+    assert db_session.query(DistributionVersion).count() == 0
+
+
+def test_a_superseded_session_is_deleted_after_its_delta(db_session, seeded):
+    fund, (alpha, beta, gamma) = seeded
+    user_id = _add_sessions(db_session, "session-1", "session-2")
+    _apply(db_session, fund, "session-2", [(alpha.id, _row(TX="100.00", CO="55.00"))])
+    stored = _rows(db_session)
+
+    with pytest.raises(SessionDeleteError):
+        SessionService(db_session).delete_session("session-1", user_id)
+    db_session.rollback()
+
+    assert _rows(db_session) == stored
@@ -38,7 +38,7 @@ def test_excel_flow_creates_investor_commitment(db_session, tmp_path, monkeypatc
         "(Input Data) FundBeta_Q2 2024 distribution data_v1.3.xlsx",
     )
 
-    assert result.errors == []
+    assert list(result.errors) == []
     assert result.valid_rows == 1
 
     fund_service = FundService(db_session)
@@ -0,0 +1,114 @@
+"""Tests for the streaming xlsx export service."""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from openpyxl import load_workbook
+
+from src.models.composite_rule import CompositeRule
+from src.models.distribution import Distribution
+from src.models.enums import InvestorEntityType, USJurisdiction
+from src.models.fund import Fund
+from src.models.investor import Investor
+from src.models.user import User
+from src.models.user_session import UploadStatus, UserSession
+from src.services.export_service import ExcelExportService
+from src.services.tax_calculation_service import RuleContext
+
+
+def _seed_session(db) -> str:
+    user = User(email="export@fundflow.com", company_name="Export Co")
+    db.add(user)
+    db.flush()
+
+    session = UserSession(
+        session_id="export-session",
+        user_id=user.id,
+        upload_filename="upload.xlsx",
+        original_filename="upload.xlsx",
+        file_size=1,
+        status=UploadStatus.COMPLETED,
+    )
+    fund = Fund(fund_code="FUNDX", period_quarter="Q1", period_year=2025)
+    investor = Investor(
+        investor_name="Alpha Capital",
+        investor_entity_type=InvestorEntityType.PARTNERSHIP,
+        investor_tax_state=USJurisdiction.CA,
+    )
+    db.add_all([session, fund, investor])
+    db.flush()
+
+    db.add_all([
+        Distribution(
+            investor_id=investor.id,
+            session_id=session.session_id,
+            fund_code=fund.fund_code,
+            jurisdiction=USJurisdiction.NY,
+            amount=Decimal("1200.00"),
+            composite_tax_amount=Decimal("75.00"),
+        ),
+        Distribution(
+            investor_id=investor.id,
+            session_id=session.session_id,
+            fund_code=fund.fund_code,
+            jurisdiction=USJurisdiction.TX,
+            amount=Decimal("1500.50"),
+            withholding_exemption=True,
+        ),
+    ])
+    db.commit()
+    return session.session_id
+
+
+def test_results_workbook_has_summary_and_jurisdiction_sheets(db_session, tmp_path):
+    session_id = _seed_session(db_session)
+    destination = tmp_path / "results.xlsx"
+
+    rows = ExcelExportService(db_session).write_results_workbook(session_id, destination)
+
+    assert rows == 2
+    workbook = load_workbook(destination)
+    assert workbook.sheetnames == ["Summary", "NY", "TX"]
+
+    ny_sheet = workbook["NY"]
+    header = [cell.value for cell in ny_sheet[1]]
+    assert header[0] == "Investor Name"
+    amount_cell = ny_sheet.cell(row=2, column=header.index("Distribution Amount") + 1)
+    assert amount_cell.value == 1200
+    assert amount_cell.data_type == "n"
+    assert amount_cell.number_format == "#,##0.00"
+
+    summary = {row[0]: row[1:] for row in workbook["Summary"].iter_rows(min_row=2, values_only=True)}
+    assert summary["TX"][0] == 1
+    assert summary["TX"][1] == 1500.5
+
+
+def test_report_workbook_includes_rule_details(db_session, tmp_path):
+    session_id = _seed_session(db_session)
+    destination = tmp_path / "report.xlsx"
+    composite_rule = CompositeRule(
+        id="rule-1",
+        rule_set_id="ruleset",
+        state="New York",
+        state_code=USJurisdiction.NY,
+        entity_type="Partnership",
+        tax_rate=Decimal("0.0625"),
+        income_threshold=Decimal("1000.00"),
+        mandatory_filing=True,
+    )
+    context = RuleContext(
+        rule_set=MagicMock(),
+        composite_rules={("NY", "Partnership"): composite_rule},
+        withholding_rules={},
+    )
+
+    ExcelExportService(db_session).write_report_workbook(session_id, destination, context)
+
+    sheet = load_workbook(destination)["NY"]
+    header = [cell.value for cell in sheet[1]]
+    values = [cell.value for cell in sheet[2]]
+    record = dict(zip(header, values))
+    assert record["Applied Tax"] == "Composite"
+    assert record["Composite Rule ID"] == "rule-1"
+    assert record["Composite Rate"] == 0.0625
+    assert sheet.cell(row=2, column=header.index("Composite Rate") + 1).number_format == "0.0000"
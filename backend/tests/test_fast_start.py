@@ -0,0 +1,93 @@
+"""Tests for fast-start: schema version skip, lazy imports and rule context caching."""
+
+import sys
+from unittest.mock import MagicMock
+
+import pandas
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
+
+from src.database import connection
+from src.services.tax_calculation_service import (
+    RuleContext,
+    RuleContextCache,
+    TaxCalculationService,
+    rule_context_cache,
+)
+from src.utils.lazy import LazyModule
+
+
+@pytest.fixture()
+def memory_engine(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    monkeypatch.setattr(connection, "engine", engine)
+    monkeypatch.setattr(connection, "DATABASE_URL", "sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_init_db_skips_ddl_when_schema_version_matches(memory_engine, monkeypatch):
+    assert connection.init_db(skip_if_current=True) is True
+    assert "distributions" in inspect(memory_engine).get_table_names()
+
+    create_all = MagicMock()
+    monkeypatch.setattr(connection.Base.metadata, "create_all", create_all)
+
+    assert connection.init_db(skip_if_current=True) is False
+    create_all.assert_not_called()
+
+    # Without fast start the DDL always runs
+    assert connection.init_db() is True
+    create_all.assert_called_once()
+
+
+def test_init_db_reruns_ddl_when_fingerprint_changes(memory_engine, monkeypatch):
+    connection.init_db(skip_if_current=True)
+    monkeypatch.setattr(connection, "schema_fingerprint", lambda: "changed")
+
+    assert connection.init_db(skip_if_current=True) is True
+    assert connection._stored_schema_version(memory_engine) == "changed"
+
+
+def test_lazy_module_forwards_to_real_module(monkeypatch):
+    proxy = LazyModule("pandas")
+    sentinel = object()
+    monkeypatch.setattr(pandas, "read_excel", sentinel)
+
+    assert proxy.read_excel is sentinel
+    assert proxy.DataFrame is sys.modules["pandas"].DataFrame
+
+
+def test_rule_context_cache_evicts_least_recently_used():
+    cache = RuleContextCache(maxsize=2)
+    contexts = {key: RuleContext(MagicMock(), {}, {}) for key in ("a", "b", "c")}
+
+    cache.put("a", contexts["a"])
+    cache.put("b", contexts["b"])
+    assert cache.get("a") is contexts["a"]
+    cache.put("c", contexts["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is contexts["a"]
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_build_rule_context_reuses_cached_rules_with_request_rule_set():
+    cached_rule_set = MagicMock(id="rule-set-1")
+    composite = {("NY", 1): MagicMock()}
+    rule_context_cache.put("rule-set-1", RuleContext(cached_rule_set, composite, {}))
+    try:
+        request_rule_set = MagicMock(id="rule-set-1")
+        service = TaxCalculationService(MagicMock())
+
+        context = service._build_rule_context(request_rule_set)
+
+        assert context.rule_set is request_rule_set
+        assert context.composite_rules is composite
+        service.db.query.assert_not_called()
+    finally:
+        rule_context_cache.clear()
@@ -0,0 +1,119 @@
+"""Tests for allocating fund source data to investors by commitment."""
+
+import random
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.models.distribution import Distribution
+from src.models.enums import InvestorEntityType, USJurisdiction
+from src.models.fund_source_data import FundSourceData
+from src.models.investor import Investor
+from src.services.allocation_service import FundAllocationService, allocate_cents, percentage_units
+from src.services.fund_service import FundService
+from src.services.investor_service import InvestorService
+
+
+def test_allocate_cents_ties_out_and_breaks_ties_by_investor_order():
+    # Three equal thirds of 100 cents: the leftover penny goes to the first investor
+    amounts = allocate_cents([333_334, 333_333, 333_333], [100, 200])
+
+    assert amounts[:, 0].tolist() == [34, 33, 33]
+    assert amounts[:, 1].tolist() == [67, 67, 66]
+    assert amounts.sum(axis=0).tolist() == [100, 200]
+
+
+def test_allocate_cents_matches_rounded_target_for_partial_commitments():
+    rng = random.Random(11)
+    for _ in range(50):
+        units = [rng.randint(0, 20_000) for _ in range(rng.randint(1, 40))]
+        pools = [rng.randint(0, 10 ** 11) for _ in range(rng.randint(1, 50))]
+
+        amounts = allocate_cents(units, pools)
+        total_units = sum(units)
+
+        for column, pool in enumerate(pools):
+            exact = [Decimal(pool * unit) / 10 ** 6 for unit in units]
+            assert int(amounts[:, column].sum()) == int(
+                (Decimal(pool * total_units) / 10 ** 6).to_integral_value(rounding="ROUND_HALF_UP")
+            )
+            # Largest remainder never moves a cell more than one penny from its exact share
+            assert all(abs(Decimal(int(cents)) - share) < 1 for cents, share in zip(amounts[:, column], exact))
+
+
+def test_allocate_cents_rejects_overcommitted_funds():
+    with pytest.raises(ValueError):
+        allocate_cents([600_000, 500_000], [100])
+
+
+def test_allocate_cents_ties_out_large_matrices():
+    # Timing is tracked by tests/benchmarks/run_benchmarks.py
+    rng = np.random.default_rng(3)
+    units = rng.multinomial(10 ** 6, np.full(5000, 1 / 5000)).astype(np.int64)
+    pools = rng.integers(0, 10 ** 11, size=50)
+
+    amounts = allocate_cents(units, pools)
+
+    assert amounts.shape == (5000, 50)
+    assert amounts.sum(axis=0).tolist() == pools.tolist()
+
+
+def test_create_distributions_from_source_data_and_commitments(db_session):
+    fund = FundService(db_session).get_or_create_fund("FUND-ALLOC", "Q2", 2025)
+    investor_service = InvestorService(db_session)
+    investors = []
+    for name, percentage in (("Alpha", "50"), ("Beta", "33.3333"), ("Gamma", "16.6667")):
+        investor = Investor(
+            investor_name=name,
+            investor_entity_type=InvestorEntityType.PARTNERSHIP,
+            investor_tax_state=USJurisdiction.NY,
+        )
+        db_session.add(investor)
+        db_session.flush()
+        investor_service.upsert_commitment(investor, fund, Decimal(percentage))
+        investors.append(investor)
+
+    for company, state, amount, share in (
+        ("Co 1", USJurisdiction.TX, "1000.01", "25"),
+        ("Co 2", USJurisdiction.TX, "333.33", "100"),
+        ("Co 1", USJurisdiction.CA, "0.03", "100"),
+    ):
+        db_session.add(
+            FundSourceData(
+                fund_code=fund.fund_code,
+                company_name=company,
+                state_jurisdiction=state,
+                fund_share_percentage=Decimal(share),
+                total_distribution_amount=Decimal(amount),
+                session_id="session-alloc",
+            )
+        )
+    db_session.flush()
+
+    service = FundAllocationService(db_session)
+    allocation = service.compute_allocation(fund.fund_code)
+
+    assert allocation.jurisdictions == [USJurisdiction.CA, USJurisdiction.TX]
+    # TX pool: 250.00 (1000.01 x 25% rounded) + 333.33
+    assert allocation.pool_cents.tolist() == [3, 58333]
+    assert allocation.total_cents() == 58336
+
+    inserted = service.create_distributions(fund, "session-alloc", allocation)
+    db_session.commit()
+
+    rows = db_session.query(Distribution).filter(Distribution.session_id == "session-alloc").all()
+    assert inserted == len(rows) == 6
+    by_key = {(row.investor_id, row.jurisdiction): row.amount for row in rows}
+    assert by_key[(investors[0].id, USJurisdiction.TX)] == Decimal("291.67")
+    assert sum(amount for (_, state), amount in by_key.items() if state == USJurisdiction.TX) == Decimal("583.33")
+    assert [by_key[(investor.id, USJurisdiction.CA)] for investor in investors] == [
+        Decimal("0.01"),
+        Decimal("0.01"),
+        Decimal("0.01"),
+    ]
+
+
+def test_percentage_units_is_exact():
+    assert percentage_units(Decimal("33.3333")) == 333_333
+    assert percentage_units(Decimal("100")) == 10 ** 6
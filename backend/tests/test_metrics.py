@@ -0,0 +1,85 @@
+"""Tests for the metrics registry, stage instrumentation and /metrics endpoint."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.main import app
+from src.database.connection import TimedQueuePool
+from src.monitoring.instrumentation import (
+    DB_POOL_CHECKOUT_WAIT,
+    StageAccumulator,
+    STAGE_DURATION,
+    timed_stage,
+)
+from src.monitoring.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "test_latency_seconds", "Test latency", labelnames=("route",), buckets=(0.1, 1.0)
+    )
+    histogram.labels("/a").observe(0.05)
+    histogram.labels("/a").observe(0.5)
+    histogram.labels("/a").observe(5)
+
+    output = registry.render()
+
+    assert "# TYPE test_latency_seconds histogram" in output
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in output
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'test_latency_seconds_count{route="/a"} 3' in output
+
+
+def test_counter_and_gauge_render_values():
+    registry = MetricsRegistry()
+    registry.counter("test_total", "Test counter", labelnames=("kind",)).labels("x").inc(3)
+    registry.gauge("test_depth", "Test gauge").set(7)
+
+    output = registry.render()
+
+    assert 'test_total{kind="x"} 3' in output
+    assert "test_depth 7" in output
+
+
+def test_stage_helpers_record_durations():
+    child = STAGE_DURATION.labels("unit_test_stage")
+    before = child.count
+
+    with timed_stage("unit_test_stage"):
+        pass
+
+    accumulator = StageAccumulator()
+    for _ in range(3):
+        with accumulator.track("unit_test_stage"):
+            pass
+    totals = accumulator.flush()
+
+    assert child.count == before + 2
+    assert set(totals) == {"unit_test_stage"}
+
+
+def test_metrics_endpoint_exposes_request_histograms():
+    client = TestClient(app)
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'fundflow_http_request_duration_seconds_count{method="GET",route="/health"}' in response.text
+
+
+def test_pool_checkout_wait_is_recorded_when_a_session_first_connects(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+    before = DB_POOL_CHECKOUT_WAIT._default_child().count
+    try:
+        with Session(engine) as db:
+            # Sessions hold no connection until their first statement
+            assert DB_POOL_CHECKOUT_WAIT._default_child().count == before
+            db.execute(text("SELECT 1"))
+            assert DB_POOL_CHECKOUT_WAIT._default_child().count == before + 1
+    finally:
+        engine.dispose()
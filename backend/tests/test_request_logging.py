@@ -0,0 +1,62 @@
+"""Tests for the request timing and sampled access logging middleware."""
+
+import logging
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.request_logging import (
+    REQUEST_DURATION,
+    REQUESTS_TOTAL,
+    RequestTimingMiddleware,
+    configure_structlog,
+)
+
+
+def _make_client(sample_rate: float) -> TestClient:
+    configure_structlog("json")
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware, sample_rate=sample_rate)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404, detail="missing")
+        return {"id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("kaboom")
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_latency_recorded_per_route_template():
+    client = _make_client(sample_rate=0.0)
+    child = REQUEST_DURATION.labels("GET", "/items/{item_id}")
+    before = child.count
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert child.count == before + 2
+    assert REQUESTS_TOTAL.labels("GET", "/items/{item_id}", "200").value >= 2
+
+
+def test_successful_requests_are_sampled_out(caplog):
+    client = _make_client(sample_rate=0.0)
+    with caplog.at_level(logging.INFO, logger="fundflow.access"):
+        client.get("/items/1")
+    assert not [r for r in caplog.records if r.name == "fundflow.access"]
+
+
+def test_failures_always_logged(caplog):
+    client = _make_client(sample_rate=0.0)
+    with caplog.at_level(logging.INFO, logger="fundflow.access"):
+        client.get("/items/0")
+        response = client.get("/boom")
+
+    assert response.status_code == 500
+    messages = [r.getMessage() for r in caplog.records if r.name == "fundflow.access"]
+    assert any('"status": 404' in message for message in messages)
+    assert any('"error": "RuntimeError"' in message for message in messages)
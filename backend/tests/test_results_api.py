@@ -0,0 +1,111 @@
+"""Tests for the session results and preview endpoints."""
+
+FILENAME = "(Input Data) Fund A_Q1 2025 distribution data_v1.3.csv"
+HEADER = (
+    "Investor Name,Investor Entity Type,Investor Tax State,Commitment Percentage,"
+    "Distribution TX,Distribution CO"
+)
+
+
+def _upload(api_client, monkeypatch, tmp_path):
+    # Successful uploads keep a copy of the file under the working directory
+    monkeypatch.chdir(tmp_path)
+    body = "\n".join([
+        HEADER,
+        "Alpha,Corporation,TX,10%,1250.50,0",
+        "Beta,Individual,CO,5%,10,20.25",
+    ]).encode()
+    payload = api_client.post("/api/upload", files={"file": (FILENAME, body, "text/csv")}).json()
+    assert payload["status"] == "completed"
+    return payload["session_id"]
+
+
+def test_results_rows_are_serialized_from_plain_values(api_client, monkeypatch, tmp_path):
+    session_id = _upload(api_client, monkeypatch, tmp_path)
+
+    response = api_client.get(f"/api/results/{session_id}")
+
+    assert response.headers["content-type"] == "application/json"
+    distributions = response.json()["distributions"]
+    assert distributions["count"] == 3
+    first = distributions["data"][0]
+    assert {key: first[key] for key in (
+        "investor_name", "investor_entity_type", "investor_tax_state",
+        "period_quarter", "period_year", "jurisdiction", "amount", "withholding_tax_amount",
+    )} == {
+        "investor_name": "Alpha",
+        "investor_entity_type": "Corporation",
+        "investor_tax_state": "TX",
+        "period_quarter": "Q1",
+        "period_year": 2025,
+        "jurisdiction": "TX",
+        "amount": 1250.5,
+        "withholding_tax_amount": None,
+    }
+    assert distributions["summary"]["TOTAL"] == 1280.75
+    assert response.json()["session"]["distribution_count"] == 3
+
+
+def test_preview_limits_rows_and_counts_all(api_client, monkeypatch, tmp_path):
+    session_id = _upload(api_client, monkeypatch, tmp_path)
+
+    payload = api_client.get(f"/api/results/{session_id}/preview", params={"limit": 2}).json()
+
+    assert payload["total_records"] == 3
+    assert payload["showing_count"] == 2
+    assert [row["investor_name"] for row in payload["preview_data"]] == ["Alpha", "Beta"]
+    assert payload["preview_data"][1] == {
+        "investor_name": "Beta",
+        "entity_type": "Individual",
+        "tax_state": "CO",
+        "jurisdiction": "TX",
+        "amount": 10.0,
+        "fund_code": "Fund A",
+        "period": "Q1 2025",
+        "commitment_percentage": 5.0,
+        "composite_exemption": "No",
+        "withholding_exemption": "No",
+    }
+
+
+def test_results_are_compressed_and_revalidated(api_client, monkeypatch, tmp_path):
+    session_id = _upload(api_client, monkeypatch, tmp_path)
+    url = f"/api/results/{session_id}"
+
+    first = api_client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    etag = first.headers["etag"]
+
+    repeat = api_client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+
+    identity = api_client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": '"stale"'})
+    assert identity.status_code == 200
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == first.json()
+
+
+def test_shared_result_computation_does_not_use_the_request_session(
+    api_client, monkeypatch, tmp_path
+):
+    from app.main import app
+    from src.database.connection import get_db
+
+    session_id = _upload(api_client, monkeypatch, tmp_path)
+    override = app.dependency_overrides[get_db]
+
+    def closed_request_db():
+        # The computation may outlive its first caller, whose Session is then closed
+        for db in override():
+            db.close()
+            db.execute = db.query = None
+            yield db
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, closed_request_db)
+
+    response = api_client.get(f"/api/results/{session_id}/preview", params={"limit": 1})
+
+    assert response.status_code == 200
+    assert response.json()["total_records"] == 3
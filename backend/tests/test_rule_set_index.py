@@ -0,0 +1,131 @@
+"""Tests for period-aware SALT rule set resolution."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.models.distribution import Distribution
+from src.models.enums import InvestorEntityType, Quarter, RuleSetStatus, USJurisdiction
+from src.models.investor import Investor
+from src.models.salt_rule_set import SaltRuleSet
+from src.models.withholding_rule import WithholdingRule
+from src.services.fund_service import FundService
+from src.services.rule_set_index import RuleSetIndex, RuleSetPeriod, quarter_end, rule_set_index_cache
+from src.services.tax_calculation_service import TaxCalculationService, invalidate_rule_caches
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    invalidate_rule_caches()
+    yield
+    invalidate_rule_caches()
+
+
+def test_quarter_end_dates():
+    assert quarter_end(2025, "Q1") == date(2025, 3, 31)
+    assert quarter_end(2024, "Q4") == date(2024, 12, 31)
+
+
+def test_index_resolves_exact_then_interval_then_latest():
+    index = RuleSetIndex(
+        [
+            RuleSetPeriod("q1", 2025, "Q1", date(2025, 1, 1), date(2025, 6, 30)),
+            RuleSetPeriod("q3", 2025, "Q3", date(2025, 7, 1), None),
+            RuleSetPeriod("patch", 2025, "Q1", date(2025, 2, 1), date(2025, 2, 28)),
+        ]
+    )
+
+    # Two sets published for 2025 Q1: the later effective one wins the exact match
+    assert index.resolve(2025, "Q1") == "patch"
+    assert index.resolve(2025, "Q2") == "q1"
+    assert index.resolve(2026, "Q1") == "q3"
+    assert index.resolve(2024, "Q4") == "q3"
+
+    assert index.resolve_date(date(2025, 2, 15)) == "patch"
+    assert index.resolve_date(date(2025, 3, 1)) == "q1"
+    assert index.resolve_date(date(2024, 12, 31)) is None
+
+
+def test_empty_index_resolves_nothing():
+    assert RuleSetIndex([]).resolve(2025, "Q1") is None
+
+
+def _publish(db_session, year, quarter, rate):
+    rule_set = SaltRuleSet(
+        year=year,
+        quarter=Quarter(quarter),
+        version="1.0.0",
+        status=RuleSetStatus.ACTIVE,
+        effective_date=date(year, {"Q1": 1, "Q3": 7}[quarter], 1),
+        created_by="tests",
+        source_file_id="file",
+    )
+    db_session.add(rule_set)
+    db_session.flush()
+    db_session.add(
+        WithholdingRule(
+            rule_set_id=rule_set.id,
+            state="Texas",
+            state_code=USJurisdiction.TX,
+            entity_type="Corporation",
+            tax_rate=Decimal(rate),
+            income_threshold=Decimal("0"),
+            tax_threshold=Decimal("0"),
+        )
+    )
+    return rule_set
+
+
+def test_batch_applies_each_period_with_its_rules(db_session):
+    _publish(db_session, 2025, "Q1", "0.0500")
+    _publish(db_session, 2025, "Q3", "0.1000")
+
+    investor = Investor(
+        investor_name="Alpha",
+        investor_entity_type=InvestorEntityType.CORPORATION,
+        investor_tax_state=USJurisdiction.NY,
+    )
+    db_session.add(investor)
+    funds = FundService(db_session)
+    for fund_code, quarter, session_id in (
+        ("FUND-Q1", "Q1", "session-q1"),
+        ("FUND-Q2", "Q2", "session-q2"),
+        ("FUND-Q3", "Q3", "session-q3"),
+    ):
+        funds.get_or_create_fund(fund_code, quarter, 2025)
+        db_session.flush()
+        db_session.add(
+            Distribution(
+                investor_id=investor.id,
+                session_id=session_id,
+                fund_code=fund_code,
+                jurisdiction=USJurisdiction.TX,
+                amount=Decimal("1000.00"),
+            )
+        )
+    db_session.commit()
+
+    service = TaxCalculationService(db_session)
+    service.apply_for_sessions(["session-q1", "session-q2", "session-q3"])
+    db_session.commit()
+
+    withheld = {
+        row.session_id: row.withholding_tax_amount for row in db_session.query(Distribution)
+    }
+    assert withheld == {
+        "session-q1": Decimal("50.00"),
+        # Q2 has no rule set of its own; the Q1 set is still in force on June 30
+        "session-q2": Decimal("50.00"),
+        "session-q3": Decimal("100.00"),
+    }
+    assert service.get_rule_context_for_session("session-q3").rule_set.quarter == Quarter.Q3
+
+
+def test_index_is_cached_until_invalidated(db_session):
+    first = rule_set_index_cache.get(db_session)
+    assert rule_set_index_cache.get(db_session) is first
+
+    invalidate_rule_caches()
+
+    assert rule_set_index_cache.get(db_session) is not first
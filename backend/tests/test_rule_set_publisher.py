@@ -0,0 +1,153 @@
+"""Tests for staged SALT rule set publication."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.models.enums import Quarter, RuleSetStatus, USJurisdiction
+from src.models.salt_rule_set import SaltRuleSet
+from src.models.withholding_rule import WithholdingRule
+from src.services.excel_processor import ExcelProcessingResult, ExcelProcessor
+from src.services.file_service import FileService
+from src.services.rule_set_index import bump_rule_version, read_rule_version, rule_set_index_cache
+from src.services.rule_set_publisher import (
+    RuleSetPublisher,
+    RuleSetPublishError,
+    WorkbookValidationError,
+    resolve_publication_period,
+)
+from src.services.tax_calculation_service import TaxCalculationService, invalidate_rule_caches
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    invalidate_rule_caches()
+    yield
+    invalidate_rule_caches()
+
+
+@pytest.fixture()
+def workbook(tmp_path, monkeypatch):
+    """A stand-in workbook whose Texas withholding rate is read from its content."""
+
+    def process_file(self, file_path, rule_set_id=None, dataframes=None):
+        rate = Decimal(open(file_path).read())
+        rule = WithholdingRule(
+            rule_set_id=rule_set_id,
+            state="Texas",
+            state_code=USJurisdiction.TX,
+            entity_type="Corporation",
+            tax_rate=rate,
+            income_threshold=Decimal("0"),
+            tax_threshold=Decimal("0"),
+        )
+        return ExcelProcessingResult([rule], [], [], {"withholding": 1, "composite": 0})
+
+    monkeypatch.setattr(ExcelProcessor, "process_file", process_file)
+
+    def write(rate):
+        path = tmp_path / f"matrix-{rate}.xlsx"
+        path.write_text(rate)
+        return path
+
+    return write
+
+
+def _publisher(db_session, tmp_path):
+    return RuleSetPublisher(db_session, FileService(db_session, storage_root=tmp_path / "store"))
+
+
+def _publish(publisher, path):
+    return publisher.publish(path, "SALT Matrix.xlsx", XLSX, 2025, Quarter.Q1, date(2025, 1, 1))
+
+
+def _texas_rate(db_session):
+    context = TaxCalculationService(db_session).get_rule_context((2025, "Q1"))
+    return context.withholding_rules[("TX", "Corporation")].tax_rate
+
+
+def test_republishing_archives_previous_sets_and_bumps_version(db_session, tmp_path, workbook):
+    publisher = _publisher(db_session, tmp_path)
+
+    results = [_publish(publisher, workbook(rate)) for rate in ("0.0100", "0.0200", "0.0300")]
+
+    statuses = {rule_set.id: rule_set.status for rule_set in db_session.query(SaltRuleSet)}
+    assert statuses == {
+        results[0].rule_set.id: RuleSetStatus.ARCHIVED,
+        results[1].rule_set.id: RuleSetStatus.ARCHIVED,
+        results[2].rule_set.id: RuleSetStatus.ACTIVE,
+    }
+    assert results[2].archived_ids == [results[1].rule_set.id]
+    assert [result.rule_version for result in results] == [1, 2, 3]
+    assert _texas_rate(db_session) == Decimal("0.0300")
+
+
+def test_staged_draft_is_invisible_until_activated(db_session, tmp_path, workbook):
+    publisher = _publisher(db_session, tmp_path)
+    _publish(publisher, workbook("0.0100"))
+    assert _texas_rate(db_session) == Decimal("0.0100")
+
+    draft, _ = publisher.stage(
+        workbook("0.0500"), "SALT Matrix.xlsx", XLSX, 2025, Quarter.Q1,
+        date(2025, 1, 1), None, "tests",
+    )
+
+    assert draft.status == RuleSetStatus.DRAFT
+    assert _texas_rate(db_session) == Decimal("0.0100")
+
+    publisher.activate(draft)
+
+    assert _texas_rate(db_session) == Decimal("0.0500")
+
+
+def test_failed_activation_keeps_active_rules(db_session, tmp_path, workbook, monkeypatch):
+    publisher = _publisher(db_session, tmp_path)
+    active = _publish(publisher, workbook("0.0100")).rule_set
+
+    def conflict(self, rule_set):
+        raise IntegrityError("UPDATE salt_rule_sets", {}, Exception("unique"))
+
+    monkeypatch.setattr(RuleSetPublisher, "_swap", conflict)
+
+    with pytest.raises(RuleSetPublishError):
+        _publish(publisher, workbook("0.0500"))
+
+    assert [(rule_set.id, rule_set.status) for rule_set in db_session.query(SaltRuleSet)] == [
+        (active.id, RuleSetStatus.ACTIVE)
+    ]
+    assert db_session.query(WithholdingRule).count() == 1
+    assert read_rule_version(db_session) == 1
+    assert _texas_rate(db_session) == Decimal("0.0100")
+
+
+def test_index_cache_follows_version_bumped_elsewhere(db_session):
+    first = rule_set_index_cache.get(db_session)
+
+    # Another process publishing only bumps the shared counter
+    bump_rule_version(db_session)
+    db_session.commit()
+
+    second = rule_set_index_cache.get(db_session)
+    assert second is not first
+    assert rule_set_index_cache.get(db_session) is second
+
+
+def test_invalid_workbook_or_period_is_rejected_without_saving(db_session, tmp_path):
+    path = tmp_path / "matrix.xlsx"
+    path.write_text("not a workbook")
+
+    with pytest.raises(WorkbookValidationError) as exc_info:
+        _publisher(db_session, tmp_path).publish_workbook(
+            path, "SALT Matrix.xlsx", XLSX, 2025, Quarter.Q1, date(2025, 1, 1)
+        )
+    assert exc_info.value.errors
+    assert db_session.query(SaltRuleSet).count() == 0
+
+    assert resolve_publication_period(2025, "q3") == (2025, Quarter.Q3, date(2025, 7, 1))
+    for year, quarter in ((2025, None), (2025, "Q5"), (2019, "Q1")):
+        with pytest.raises(ValueError):
+            resolve_publication_period(year, quarter)
@@ -0,0 +1,115 @@
+"""Tests for the session progress event stream."""
+
+import json
+import uuid
+
+from src.services.progress_events import ProgressBus, UploadProgress, progress_bus
+from src.models.user_session import UploadStatus
+
+FILENAME = "(Input Data) Fund A_Q1 2025 distribution data_v1.3.csv"
+BODY = "\n".join([
+    "Investor Name,Investor Entity Type,Investor Tax State,Commitment Percentage,Distribution TX",
+    "Alpha,Corporation,TX,10%,1250.50",
+    "Beta,Individual,TX,5%,10",
+]).encode()
+
+
+def _events(response):
+    events = []
+    for block in response.text.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _upload(api_client, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    session_id = str(uuid.uuid4())
+    payload = api_client.post(
+        "/api/upload",
+        params={"session_id": session_id},
+        files={"file": (FILENAME, BODY, "text/csv")},
+    ).json()
+    assert payload["session_id"] == session_id
+    return session_id
+
+
+def test_stream_replays_latest_pipeline_event(api_client, monkeypatch, tmp_path):
+    session_id = _upload(api_client, monkeypatch, tmp_path)
+
+    response = api_client.get(f"/api/sessions/{session_id}/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    [(event, data)] = _events(response)
+    assert event == "progress"
+    assert (data["status"], data["progress_percentage"]) == ("completed", 100)
+    assert (data["total_rows"], data["rows_processed"], data["distributions_created"]) == (2, 2, 2)
+    assert "tax_apply_for_session" in data["stage_timings"]
+
+
+def test_stream_falls_back_to_session_row(api_client, monkeypatch, tmp_path):
+    session_id = _upload(api_client, monkeypatch, tmp_path)
+    # As seen from a worker that did not process the upload
+    progress_bus.clear()
+
+    [(event, data)] = _events(api_client.get(f"/api/sessions/{session_id}/events"))
+
+    assert event == "progress"
+    assert (data["status"], data["progress_percentage"], data["valid_rows"]) == ("completed", 100, 2)
+
+
+def test_row_progress_is_throttled():
+    bus = ProgressBus()
+    progress = UploadProgress("session", bus=bus, min_interval=60)
+    progress.stage(UploadStatus.SAVING, 50, stage="investor_rows")
+
+    progress.rows(1, 4, 50, 80)
+    assert bus.latest("session")["rows_processed"] == 0
+
+    progress.rows(4, 4, 50, 80)
+    assert bus.latest("session")["rows_processed"] == 4
+    assert bus.latest("session")["progress_percentage"] == 80
+
+
+def test_other_workers_see_uploads_that_fail_before_saving(api_client, monkeypatch, tmp_path):
+    from src.api import upload as upload_api
+    from src.database.connection import get_db
+    from src.services.admission_control import AdmissionGate
+    from src.services.session_service import SessionService
+
+    monkeypatch.chdir(tmp_path)
+    session_id = str(uuid.uuid4())
+    gate = AdmissionGate("test-events", 1, queue_limit=0)
+    gate.acquire()
+    monkeypatch.setattr(upload_api, "parse_gate", gate)
+
+    def post():
+        return api_client.post(
+            "/api/upload",
+            params={"session_id": session_id},
+            files={"file": (FILENAME, BODY, "text/csv")},
+        )
+
+    assert post().status_code == 429
+    db = next(api_client.app.dependency_overrides[get_db]())
+    try:
+        snapshot = SessionService(db).get_progress_snapshot(session_id)
+    finally:
+        db.close()
+    assert snapshot["status"] == "queued"
+
+    # The retry takes over the id; a parse crash is then recorded as terminal
+    gate.release()
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("workbook is corrupt")
+
+    monkeypatch.setattr(upload_api.ExcelService, "parse_excel_file", crash)
+    assert post().status_code == 500
+    progress_bus.clear()
+
+    [(event, data)] = _events(api_client.get(f"/api/sessions/{session_id}/events"))
+    assert event == "progress"
+    assert data["status"] == "failed_parsing"
+    assert "workbook is corrupt" in data["error_message"]
@@ -0,0 +1,81 @@
+"""Tests for per-session processing profiles."""
+
+import pandas as pd
+
+from src.models.user import User
+from src.models.user_session import UploadStatus, UserSession
+from src.monitoring.profiling import build_profile_fields
+from src.services.excel_service import ExcelService
+from src.services.session_service import SessionService
+
+
+def _seed_session(db) -> str:
+    user = User(email="profile@fundflow.com", company_name="Profile Co")
+    db.add(user)
+    db.flush()
+    session = UserSession(
+        session_id="profile-session",
+        user_id=user.id,
+        upload_filename="upload.xlsx",
+        original_filename="upload.xlsx",
+        file_size=1,
+        status=UploadStatus.COMPLETED,
+    )
+    db.add(session)
+    db.commit()
+    return session.session_id
+
+
+def test_build_profile_fields_maps_stages_to_columns():
+    fields = build_profile_fields(
+        {"read_file": 0.25, "tax_apply_for_session": 0.0015, "unknown_stage": 1.0},
+        1.5,
+        total_rows=10,
+    )
+
+    assert fields["read_file_ms"] == 250.0
+    assert fields["calculate_tax_ms"] == 1.5
+    assert fields["total_ms"] == 1500.0
+    assert fields["total_rows"] == 10
+    assert "parse_rows_ms" not in fields
+    assert "unknown_stage" not in fields
+
+
+def test_save_processing_profile_replaces_existing_row(db_session):
+    session_id = _seed_session(db_session)
+    service = SessionService(db_session)
+
+    service.save_processing_profile(session_id, {"total_ms": 10.0, "total_rows": 3})
+    db_session.commit()
+    service.save_processing_profile(session_id, {"total_ms": 20.0})
+    db_session.commit()
+
+    profile = service.get_processing_profile(session_id)
+    assert profile.total_ms == 20.0
+    assert profile.total_rows == 3
+
+    user_id = db_session.query(UserSession).one().user_id
+    assert service.delete_session(session_id, user_id)
+    db_session.commit()
+    assert service.get_processing_profile(session_id) is None
+
+
+def test_parse_excel_file_reports_stage_timings(tmp_path, monkeypatch):
+    fake_file = tmp_path / "profile_input.xlsx"
+    fake_file.write_bytes(b"ignored")
+    frame = pd.DataFrame([{
+        "Investor Name": "Gamma LLC",
+        "Investor Entity Type": "Corporation",
+        "Investor Tax State": "TX",
+        "Commitment Percentage": "10%",
+        "Distribution TX": 100,
+    }])
+    monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: frame)
+
+    result = ExcelService().parse_excel_file(
+        fake_file, "(Input Data) FundGamma_Q1 2025 distribution data_v1.3.xlsx"
+    )
+
+    assert result.valid_rows == 1
+    assert set(result.stage_timings) == {"read_file", "validate_headers", "parse_rows"}
+    assert all(seconds >= 0 for seconds in result.stage_timings.values())
@@ -0,0 +1,121 @@
+"""Tests for read-only what-if tax simulation."""
+
+from decimal import Decimal
+
+import pytest
+
+from src.models.composite_rule import CompositeRule
+from src.models.distribution import Distribution
+from src.models.enums import InvestorEntityType, USJurisdiction
+from src.models.investor import Investor
+from src.models.withholding_rule import WithholdingRule
+from src.services.fund_service import FundService
+from src.services.tax_calculation_service import RuleContext
+from src.services.tax_simulation_service import CandidateRulesError, TaxSimulationService
+
+
+@pytest.fixture()
+def stored_session(db_session):
+    FundService(db_session).get_or_create_fund("FUND-SIM", "Q1", 2025)
+    investors = []
+    for name, entity_type in (("Alpha", InvestorEntityType.CORPORATION), ("Beta", InvestorEntityType.PARTNERSHIP)):
+        investor = Investor(
+            investor_name=name,
+            investor_entity_type=entity_type,
+            investor_tax_state=USJurisdiction.NY,
+        )
+        db_session.add(investor)
+        investors.append(investor)
+    db_session.flush()
+
+    for investor, jurisdiction, amount, withholding in (
+        (investors[0], USJurisdiction.TX, "1000.00", "50.00"),
+        (investors[0], USJurisdiction.CO, "200.00", None),
+        (investors[1], USJurisdiction.TX, "400.00", "20.00"),
+    ):
+        db_session.add(
+            Distribution(
+                investor_id=investor.id,
+                session_id="session-sim",
+                fund_code="FUND-SIM",
+                jurisdiction=jurisdiction,
+                amount=Decimal(amount),
+                withholding_tax_amount=Decimal(withholding) if withholding else None,
+            )
+        )
+    db_session.commit()
+    return investors
+
+
+def _candidate() -> RuleContext:
+    withholding = WithholdingRule(
+        state="Texas",
+        state_code=USJurisdiction.TX,
+        entity_type="Corporation",
+        tax_rate=Decimal("0.0600"),
+        income_threshold=Decimal("0"),
+        tax_threshold=Decimal("0"),
+    )
+    composite = CompositeRule(
+        state="Colorado",
+        state_code=USJurisdiction.CO,
+        entity_type="Corporation",
+        tax_rate=Decimal("0.0450"),
+        income_threshold=Decimal("0"),
+        mandatory_filing=True,
+    )
+    return RuleContext.from_rules(None, [withholding], [composite])
+
+
+def test_simulation_reports_deltas_without_writing(db_session, stored_session):
+    alpha, beta = stored_session
+
+    result = TaxSimulationService(db_session).simulate(["session-sim"], _candidate())
+
+    assert result["summary"]["distributions"] == 3
+    assert result["summary"]["changed_distributions"] == 3
+    assert result["jurisdictions"]["TX"]["withholding_tax_delta"] == 10.0 - 20.0
+    assert result["jurisdictions"]["CO"]["simulated_composite_tax"] == 9.0
+    assert [entry["investor_id"] for entry in result["investors"]] == [beta.id, alpha.id]
+    assert result["investors"][0]["total_tax_delta"] == -20.0
+    assert result["investors"][1]["total_tax_delta"] == 19.0
+
+    assert not db_session.new and not db_session.dirty
+    stored = {
+        (row.investor_id, row.jurisdiction): row.withholding_tax_amount
+        for row in db_session.query(Distribution)
+    }
+    assert stored[(alpha.id, USJurisdiction.TX)] == Decimal("50.00")
+    assert stored[(beta.id, USJurisdiction.TX)] == Decimal("20.00")
+
+
+def test_simulation_investor_limit(db_session, stored_session):
+    result = TaxSimulationService(db_session).simulate(["session-sim"], _candidate(), investor_limit=1)
+
+    assert len(result["investors"]) == 1
+    assert result["unchanged_investors"] == 0
+
+
+def test_invalid_candidate_workbook_raises(db_session, tmp_path):
+    path = tmp_path / "candidate.xlsx"
+    path.write_bytes(b"not a workbook")
+
+    with pytest.raises(CandidateRulesError) as excinfo:
+        TaxSimulationService(db_session).load_candidate_rules(path)
+
+    assert excinfo.value.errors[0]["error_code"] == "VALIDATION_FAILED"
+
+
+def test_simulate_endpoint_rejects_oversized_files_and_negative_limits(api_client, monkeypatch):
+    from src.api import salt_rules
+
+    monkeypatch.setattr(salt_rules, "SALT_UPLOAD_MAX_BYTES", 10)
+    files = {"file": ("candidate.xlsx", b"x" * 100, "application/octet-stream")}
+
+    oversized = api_client.post("/api/salt-rules/simulate", files=files, data={"session_ids": "s1"})
+    negative = api_client.post(
+        "/api/salt-rules/simulate", files=files, data={"session_ids": "s1", "investor_limit": "-1"}
+    )
+
+    assert oversized.status_code == 413
+    assert negative.status_code == 422
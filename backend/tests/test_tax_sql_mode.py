@@ -0,0 +1,167 @@
+"""Parity of the set-based SQL tax mode with the Python tax logic."""
+
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.models.composite_rule import CompositeRule
+from src.models.distribution import Distribution
+from src.models.enums import InvestorEntityType, Quarter, RuleSetStatus, USJurisdiction
+from src.models.investor import Investor
+from src.models.salt_rule_set import SaltRuleSet
+from src.models.withholding_rule import WithholdingRule
+from src.services import tax_calculation_service
+from src.services.fund_service import FundService
+from src.services.tax_calculation_service import TaxCalculationService, invalidate_rule_caches
+
+STATES = [USJurisdiction.TX, USJurisdiction.CO, USJurisdiction.NY, USJurisdiction.CA, USJurisdiction.GA]
+CODINGS = sorted(InvestorEntityType.get_unique_codings())
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    invalidate_rule_caches()
+    yield
+    invalidate_rule_caches()
+
+
+def _money(rng, upper_cents):
+    return Decimal(rng.randint(0, upper_cents)).scaleb(-2)
+
+
+def _rate(rng):
+    # Four-place rates; odd ones make half-cent products common
+    return Decimal(rng.choice([0, 1, 5, 25, 250, 425, 500, 575, 1000, rng.randint(0, 10000)])).scaleb(-4)
+
+
+def _seed(db_session, rng):
+    FundService(db_session).get_or_create_fund("FUND-SQL", "Q1", 2025)
+    rule_set = SaltRuleSet(
+        year=2025,
+        quarter=Quarter.Q1,
+        version="1.0.0",
+        status=RuleSetStatus.ACTIVE,
+        effective_date=date(2025, 1, 1),
+        created_by="tests",
+        source_file_id="file",
+    )
+    db_session.add(rule_set)
+    db_session.flush()
+
+    for state in STATES:
+        for coding in CODINGS:
+            if rng.random() < 0.6:
+                db_session.add(
+                    WithholdingRule(
+                        rule_set_id=rule_set.id,
+                        state=state.value,
+                        state_code=state,
+                        entity_type=coding,
+                        tax_rate=_rate(rng),
+                        income_threshold=_money(rng, 50000),
+                        tax_threshold=_money(rng, 2000),
+                    )
+                )
+            if rng.random() < 0.4:
+                db_session.add(
+                    CompositeRule(
+                        rule_set_id=rule_set.id,
+                        state=state.value,
+                        state_code=state,
+                        entity_type=coding,
+                        tax_rate=_rate(rng),
+                        income_threshold=_money(rng, 50000),
+                        mandatory_filing=rng.random() < 0.7,
+                    )
+                )
+
+    entity_types = list(InvestorEntityType)
+    for index in range(120):
+        investor = Investor(
+            investor_name=f"Investor {index}",
+            investor_entity_type=rng.choice(entity_types),
+            investor_tax_state=rng.choice(STATES),
+        )
+        db_session.add(investor)
+        db_session.flush()
+        for jurisdiction in rng.sample(STATES, rng.randint(1, len(STATES))):
+            db_session.add(
+                Distribution(
+                    investor_id=investor.id,
+                    session_id="session-sql",
+                    fund_code="FUND-SQL",
+                    jurisdiction=jurisdiction,
+                    amount=_money(rng, 5_000_000),
+                    composite_exemption=rng.random() < 0.1,
+                    withholding_exemption=rng.random() < 0.1,
+                    # Stale values must be cleared or overwritten
+                    withholding_tax_amount=Decimal("1.23") if rng.random() < 0.2 else None,
+                )
+            )
+    db_session.commit()
+
+
+def _stored_taxes(db_session):
+    db_session.expire_all()
+    return {
+        row.id: (row.composite_tax_amount, row.withholding_tax_amount)
+        for row in db_session.query(Distribution)
+    }
+
+
+@pytest.mark.parametrize("seed", [7, 2025, 31337])
+def test_sql_mode_matches_python_tax_logic(db_session, seed):
+    _seed(db_session, random.Random(seed))
+    service = TaxCalculationService(db_session)
+
+    taxed = service.apply_for_session_sql("session-sql")
+    db_session.commit()
+    from_sql = _stored_taxes(db_session)
+
+    service._apply_for_session("session-sql")
+    db_session.commit()
+    from_python = _stored_taxes(db_session)
+
+    assert from_sql == from_python
+    assert taxed == sum(1 for amounts in from_python.values() if amounts != (None, None))
+    assert any(composite for composite, _ in from_python.values())
+    assert any(withholding for _, withholding in from_python.values())
+
+
+def test_sql_mode_clears_taxes_without_rule_set(db_session):
+    FundService(db_session).get_or_create_fund("FUND-SQL", "Q1", 2025)
+    investor = Investor(
+        investor_name="Alpha",
+        investor_entity_type=InvestorEntityType.CORPORATION,
+        investor_tax_state=USJurisdiction.NY,
+    )
+    db_session.add(investor)
+    db_session.flush()
+    distribution = Distribution(
+        investor_id=investor.id,
+        session_id="session-sql",
+        fund_code="FUND-SQL",
+        jurisdiction=USJurisdiction.TX,
+        amount=Decimal("1000.00"),
+        withholding_tax_amount=Decimal("50.00"),
+    )
+    db_session.add(distribution)
+    db_session.commit()
+
+    assert TaxCalculationService(db_session).apply_for_session_sql("session-sql") == 0
+    # The loaded instance is expired rather than left with the stale amount
+    assert distribution.withholding_tax_amount is None
+
+
+def test_apply_for_session_uses_configured_mode(db_session, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tax_calculation_service, "TAX_CALCULATION_MODE", "sql")
+    monkeypatch.setattr(
+        TaxCalculationService, "_apply_for_session_sql", lambda self, session_id: calls.append(session_id)
+    )
+
+    TaxCalculationService(db_session).apply_for_session("session-sql")
+
+    assert calls == ["session-sql"]
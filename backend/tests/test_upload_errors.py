@@ -0,0 +1,37 @@
+"""Tests for validation errors recorded by failed uploads."""
+
+FILENAME = "(Input Data) Fund A_Q1 2025 distribution data_v1.3.csv"
+HEADER = "Investor Name,Investor Entity Type,Investor Tax State,Commitment Percentage,Distribution TX"
+
+
+def test_failed_upload_records_errors_for_download(api_client):
+    rows = [f"Investor {index},Corporation,ZZ,10%,100" for index in range(120)]
+    body = ("\n".join([HEADER, *rows]) + "\n").encode()
+
+    payload = api_client.post("/api/upload", files={"file": (FILENAME, body, "text/csv")}).json()
+
+    assert payload["status"] == "validation_failed"
+    assert payload["error_count"] == 120
+    kept = len(payload["errors"])
+    session_id = payload["session_id"]
+
+    results = api_client.get(f"/api/results/{session_id}", params={"errors_limit": 10}).json()
+    errors = results["validation_errors"]
+    assert results["session"]["status"] == "failed_validation"
+    assert [error["row_number"] for error in errors["data"]] == list(range(2, 12))
+    # Detail is capped per code; the summary still counts every error
+    assert kept < 120
+    assert errors["summary"]["errors_by_code"] == {"INVALID_STATE_CODE": 120}
+    assert errors["summary"]["total_errors"] == 120
+
+    next_page = api_client.get(
+        f"/api/results/{session_id}",
+        params={"errors_limit": 10, "errors_after": errors["next_cursor"]},
+    ).json()
+    assert next_page["validation_errors"]["data"][0]["row_number"] == 12
+
+    download = api_client.get(f"/api/results/{session_id}/download-errors")
+    assert download.status_code == 200
+    lines = download.text.splitlines()
+    assert lines[1].startswith("2,Investor Tax State,INVALID_STATE_CODE,ERROR")
+    assert len(lines) == kept + 1
@@ -0,0 +1,81 @@
+"""Tests for the dry-run upload validation endpoint."""
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.main import app
+from src.services.excel_service import ExcelService
+
+client = TestClient(app)
+
+FILENAME = "(Input Data) Fund A_Q1 2025 distribution data_v1.3.csv"
+HEADER = "Investor Name,Investor Entity Type,Investor Tax State,Commitment Percentage,Distribution TX"
+
+
+def _post(lines, **params):
+    body = ("\n".join(lines) + "\n").encode()
+    return client.post(
+        "/api/upload/validate",
+        params=params,
+        files={"file": (FILENAME, body, "text/csv")},
+    )
+
+
+def test_validate_reports_valid_file():
+    response = _post([HEADER, "Alpha,Corporation,TX,10%,100"])
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["status"] == "valid"
+    assert payload["valid_rows"] == 1
+    assert payload["error_counts"] == {}
+    assert payload["truncated"] is False
+
+
+def test_validate_stops_after_error_limit():
+    rows = [f"Investor {index},Corporation,ZZ,10%,100" for index in range(500)]
+
+    payload = _post([HEADER, *rows], max_errors=5).json()
+
+    assert payload["status"] == "validation_failed"
+    assert payload["truncated"] is True
+    assert payload["error_counts"] == {"INVALID_STATE_CODE": 5}
+    assert len(payload["errors"]) == 5
+    assert payload["errors"][0].startswith("Row 2, Investor Tax State")
+    assert payload["valid_rows"] == 0
+
+
+def test_validate_short_circuits_on_header_errors(monkeypatch):
+    def fail_full_read(*args, **kwargs):
+        raise AssertionError("data rows should not be read")
+
+    monkeypatch.setattr(ExcelService, "iter_csv_chunks", fail_full_read)
+
+    payload = _post(["Investor Name,Distribution TX", "Alpha,100"]).json()
+
+    assert payload["status"] == "validation_failed"
+    assert payload["error_counts"] == {"MISSING_HEADER": 3}
+    assert payload["total_rows"] == 0
+
+
+def test_validate_only_mode_keeps_no_parsed_rows(tmp_path, monkeypatch):
+    df = pd.DataFrame(
+        [{"Investor Name": "Alpha", "Investor Entity Type": "Corporation", "Investor Tax State": "TX",
+          "Commitment Percentage": "10%", "Distribution TX": "1,00x"}]
+    )
+    monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: df)
+    path = tmp_path / "input.xlsx"
+    path.write_bytes(b"ignored by mock")
+
+    result = ExcelService().validate_file(path, FILENAME.replace(".csv", ".xlsx"), max_errors=10)
+
+    assert result.data == []
+    assert result.errors.counts == {"ZERO_DISTRIBUTIONS": 1, "INVALID_NUMBER_FORMAT": 1}
+
+
+def test_validate_rejects_unsupported_type():
+    response = client.post(
+        "/api/upload/validate", files={"file": ("notes.txt", b"hello", "text/plain")}
+    )
+
+    assert response.status_code == 415
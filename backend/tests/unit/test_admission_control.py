@@ -0,0 +1,69 @@
+"""Unit coverage for upload admission control."""
+
+import threading
+import time
+
+import pytest
+
+from src.api import upload as upload_api
+from src.monitoring.instrumentation import ADMISSION_QUEUE_DEPTH
+from src.services.admission_control import AdmissionGate, AdmissionRejected
+
+
+def test_full_queue_is_rejected_with_429():
+    gate = AdmissionGate("test-full", 1, queue_limit=0, min_retry_after=3)
+    gate.acquire()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        gate.acquire()
+
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after == 3
+
+
+def test_wait_times_out_with_503():
+    gate = AdmissionGate("test-timeout", 1, queue_limit=1, timeout_seconds=0.05)
+    gate.acquire()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        gate.acquire()
+
+    assert rejected.value.status_code == 503
+    assert gate.waiting == 0
+
+
+def test_waiter_is_admitted_when_a_slot_is_released():
+    gate = AdmissionGate("test-queue", 1, queue_limit=1, timeout_seconds=5)
+    gate.acquire()
+    admitted = threading.Event()
+
+    def wait_for_slot():
+        with gate.slot():
+            admitted.set()
+
+    waiter = threading.Thread(target=wait_for_slot)
+    waiter.start()
+    while gate.waiting == 0:
+        time.sleep(0.001)
+    assert ADMISSION_QUEUE_DEPTH.labels("test-queue").value == 1
+    assert not admitted.is_set()
+
+    gate.release()
+    waiter.join(timeout=5)
+
+    assert admitted.is_set()
+    assert (gate.active, gate.waiting) == (0, 0)
+
+
+def test_saturated_upload_answers_with_retry_after(api_client, monkeypatch):
+    gate = AdmissionGate("test-upload", 1, queue_limit=0, min_retry_after=7)
+    gate.acquire()
+    monkeypatch.setattr(upload_api, "parse_gate", gate)
+
+    response = api_client.post(
+        "/api/upload",
+        files={"file": ("(Input Data) Fund A_Q1 2025 distribution data_v1.3.csv", b"x", "text/csv")},
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
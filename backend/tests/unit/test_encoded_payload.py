@@ -0,0 +1,30 @@
+"""Unit coverage for content negotiation and ETag matching."""
+
+import gzip
+
+from src.utils.encoded_payload import EncodedPayload, etag_matches, negotiate_encoding
+
+
+def test_negotiate_encoding_honours_quality_values():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_etag_matches_any_representation_of_the_tag():
+    assert etag_matches('"abc"', "abc")
+    assert etag_matches('"other", W/"abc-gzip"', "abc")
+    assert etag_matches("*", "abc")
+    assert not etag_matches('"abcd"', "abc")
+
+
+def test_compressed_variant_is_built_once():
+    payload = EncodedPayload(b'{"rows":[' + b"1," * 1000 + b"1]}", "application/json")
+
+    compressed = payload.variant("gzip")
+
+    assert payload.variant("gzip") is compressed
+    assert gzip.decompress(compressed) == payload.body
+    assert EncodedPayload(payload.body, "application/json").etag == payload.etag
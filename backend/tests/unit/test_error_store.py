@@ -0,0 +1,48 @@
+"""Unit coverage for the capped validation error store."""
+
+from src.models.validation_error import ErrorSeverity
+from src.services.excel_service import ErrorStore, ExcelValidationError
+
+
+def test_detail_is_capped_per_code_while_counts_stay_exact():
+    store = ErrorStore(detail_per_code=2)
+    for row_number in range(2, 12):
+        store.add(row_number, "Distribution TX", "NEGATIVE_AMOUNT", field_value="-1")
+    store.add(3, "Investor Tax State", "INVALID_STATE_CODE", ErrorSeverity.WARNING, "ZZ")
+
+    assert len(store) == 3
+    assert store.total == 11
+    assert store.counts == {"NEGATIVE_AMOUNT": 10, "INVALID_STATE_CODE": 1}
+    assert store.severity_counts[ErrorSeverity.ERROR] == 10
+    assert store.severity_counts[ErrorSeverity.WARNING] == 1
+    assert store.truncated
+    assert [error.row_number for error in store.of_severity(ErrorSeverity.ERROR)] == [2, 3]
+
+
+def test_messages_are_rendered_from_templates_on_iteration():
+    store = ErrorStore()
+    store.add(4, "Distribution CO", "INVALID_NUMBER_FORMAT", field_value="abc")
+    store.append(
+        ExcelValidationError(
+            5, "Investor Name", "MISSING_REQUIRED_FIELD", "Investor name is required", ErrorSeverity.ERROR
+        )
+    )
+
+    first, second = list(store)
+
+    assert first.error_message == "Invalid number format: abc"
+    assert first.field_value == "abc"
+    assert (second.row_number, second.error_code, second.error_message) == (
+        5, "MISSING_REQUIRED_FIELD", "Investor name is required"
+    )
+    assert not store.truncated
+
+
+def test_limit_reached_counts_dropped_errors():
+    store = ErrorStore(detail_per_code=1, limit=3)
+    for row_number in range(3):
+        assert not store.limit_reached
+        store.add(row_number, "Distribution TX", "NEGATIVE_AMOUNT", field_value="-1")
+
+    assert store.limit_reached
+    assert len(store) == 1
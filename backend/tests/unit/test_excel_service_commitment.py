@@ -46,7 +46,7 @@ def test_commitment_percentage_parses_and_quantizes(tmp_path, monkeypatch):
     _, result = _run_parse(tmp_path, monkeypatch, lambda: _make_dataframe())
 
     assert result.valid_rows == 1
-    assert result.errors == []
+    assert list(result.errors) == []
     assert result.data[0]["commitment_percentage"] == Decimal("12.5000")
 
 
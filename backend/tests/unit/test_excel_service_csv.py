@@ -0,0 +1,86 @@
+"""Unit coverage for the CSV ingestion path in ExcelService."""
+
+from decimal import Decimal
+from pathlib import Path
+
+from src.services.excel_service import ExcelService
+
+SAMPLE_DIR = Path(__file__).resolve().parents[3] / "data" / "samples" / "input"
+SAMPLE_NAME = "(Input Data) Fund A_Q1 2025 distribution data_v1.3"
+
+
+def _write_csv(tmp_path: Path, lines) -> Path:
+    path = tmp_path / f"{SAMPLE_NAME}.csv"
+    # Exports from Excel carry a BOM and trailing unnamed columns
+    path.write_text("﻿" + "\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_filename_pattern_accepts_csv():
+    info = ExcelService().extract_fund_info_from_filename(f"{SAMPLE_NAME}.csv")
+
+    assert info["fund_code"] == "Fund A"
+    assert info["file_extension"] == "csv"
+
+
+def test_csv_matches_excel_sample():
+    excel = ExcelService().parse_excel_file(SAMPLE_DIR / f"{SAMPLE_NAME}.xlsx", f"{SAMPLE_NAME}.xlsx")
+    csv = ExcelService().parse_excel_file(SAMPLE_DIR / f"{SAMPLE_NAME}.csv", f"{SAMPLE_NAME}.csv")
+
+    assert list(csv.errors) == []
+    assert (csv.total_rows, csv.valid_rows) == (excel.total_rows, excel.valid_rows)
+    assert csv.data == excel.data
+
+
+def test_csv_rows_validate_with_excel_row_numbers(tmp_path, monkeypatch):
+    monkeypatch.setattr(ExcelService, "CSV_CHUNK_ROWS", 2)
+    path = _write_csv(
+        tmp_path,
+        [
+            "Investor Name,Investor Entity Type,Investor Tax State,Commitment Percentage,Distribution TX,TX Withholding Exemption,,",
+            'Alpha,Corporation,TX,10%,"1,250.50",x,,',
+            ",,,,,,,",
+            "Beta,Corporation,ZZ,5%,100,,,",
+            "Gamma,Corporation,TX,5%,0,,,",
+        ],
+    )
+
+    result = ExcelService().parse_excel_file(path, path.name)
+
+    assert result.total_rows == 3
+    assert result.valid_rows == 1
+    assert result.data[0]["distributions"] == {"TX": Decimal("1250.50")}
+    assert result.data[0]["withholding_exemptions"] == {"TX": True}
+    assert {(error.row_number, error.error_code) for error in result.errors} == {
+        (4, "INVALID_STATE_CODE"),
+        (5, "ZERO_DISTRIBUTIONS"),
+    }
+
+
+def test_csv_missing_headers_reports_same_errors(tmp_path):
+    path = _write_csv(tmp_path, ["Investor Name,Distribution TX", "Alpha,100"])
+
+    result = ExcelService().parse_excel_file(path, path.name)
+
+    assert result.data == []
+    assert {error.error_code for error in result.errors} == {"MISSING_HEADER"}
+
+
+def test_csv_row_limit_counts_rows_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(ExcelService, "CSV_CHUNK_ROWS", 2)
+    monkeypatch.setattr(ExcelService, "MAX_ROWS", 2)
+    path = _write_csv(
+        tmp_path,
+        [
+            "Investor Name,Investor Entity Type,Investor Tax State,Commitment Percentage,Distribution TX",
+            "Alpha,Corporation,TX,10%,100",
+            "Beta,Corporation,ZZ,5%,100",
+            "Gamma,Corporation,TX,5%,100",
+        ],
+    )
+
+    result = ExcelService().parse_excel_file(path, path.name)
+
+    assert result.data == []
+    assert result.total_rows == 3
+    assert {error.error_code for error in result.errors} == {"ROW_LIMIT_EXCEEDED"}
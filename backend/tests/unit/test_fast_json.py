@@ -0,0 +1,18 @@
+"""Unit coverage for the fast JSON response path."""
+
+from fastapi.responses import JSONResponse
+
+from src.utils.fast_json import FastJSONResponse, dumps
+
+
+def test_dumps_matches_fastapi_json_rendering():
+    content = {"name": "Société Générale", "amount": 1250.5, "tax": None, "rows": [1, True]}
+
+    assert dumps(content) == JSONResponse(content).body
+
+
+def test_response_sends_pre_encoded_bytes_unchanged():
+    response = FastJSONResponse(b'{"cached":true}')
+
+    assert response.body == b'{"cached":true}'
+    assert response.headers["content-type"] == "application/json"
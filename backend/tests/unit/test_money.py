@@ -0,0 +1,76 @@
+"""Unit tests for the fixed-point money kernel."""
+
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+from src.utils.money import (
+    cents_to_str,
+    format_money,
+    from_cents,
+    money_float,
+    mul_rate,
+    mul_rate_array,
+    parse_cents,
+    to_cents,
+    to_cents_array,
+    to_rate_units,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1234", 123400),
+        ("1234.5", 123450),
+        ("0.005", 1),
+        ("0.0049", 0),
+        ("-0.125", -13),
+        (".5", 50),
+        ("1e3", 100000),
+        ("", None),
+        ("abc", None),
+        ("NaN", None),
+    ],
+)
+def test_parse_cents(text, expected):
+    assert parse_cents(text) == expected
+
+
+def test_to_cents_accepts_common_types():
+    assert to_cents(Decimal("971900.00")) == 97190000
+    assert to_cents(12) == 1200
+    assert to_cents(0.1) == 10
+    assert to_cents(" 28100.555 ") == 2810056
+
+
+def test_formatting_helpers():
+    assert cents_to_str(-5) == "-0.05"
+    assert cents_to_str(123456789) == "1234567.89"
+    assert from_cents(1205) == Decimal("12.05")
+    assert format_money(None) == ""
+    assert format_money(Decimal("2.675")) == "2.68"
+    assert money_float(Decimal("19.99")) == 19.99
+
+
+def test_mul_rate_matches_decimal_quantize():
+    rng = random.Random(2024)
+    for _ in range(5000):
+        amount = Decimal(rng.randint(0, 10 ** 11)).scaleb(-2)
+        rate = Decimal(rng.randint(0, 10 ** 4)).scaleb(-4)
+        expected = (amount * rate).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+        assert from_cents(mul_rate(to_cents(amount), to_rate_units(rate))) == expected
+
+
+def test_mul_rate_array_matches_scalar():
+    rng = random.Random(7)
+    cents = [rng.randint(-10 ** 9, 10 ** 12) for _ in range(1000)]
+    rate_units = to_rate_units(Decimal("0.0575"))
+
+    vectorized = mul_rate_array(to_cents_array([Decimal(c).scaleb(-2) for c in cents]), rate_units)
+
+    assert vectorized.dtype == np.int64
+    assert vectorized.tolist() == [mul_rate(c, rate_units) for c in cents]
@@ -0,0 +1,60 @@
+"""Unit coverage for the compact parsed investor row."""
+
+from array import array
+from decimal import Decimal
+
+from src.models.enums import USJurisdiction
+from src.services.distribution_service import DistributionService
+from src.services.excel_service import ExcelService, ParsedRow
+
+
+def _service() -> ExcelService:
+    service = ExcelService()
+    service.detected_columns = {
+        "distribution": {state: f"Distribution {state}" for state in ("TX", "CO", "NY")},
+        "withholding_exemption": {"TX": "TX Withholding Exemption", "CO": "CO Withholding Exemption"},
+        "composite_exemption": {"NY": "NY Composite Exemption"},
+    }
+    return service
+
+
+def test_parse_row_keeps_only_non_zero_amounts():
+    row = _service().parse_row(
+        {
+            "Investor Name": " Alpha ",
+            "Investor Entity Type": "Corporation",
+            "Investor Tax State": "tx",
+            "Distribution TX": "1,250.50",
+            "Distribution CO": "",
+            "Distribution NY": "10",
+            # Exemption on a zero-amount state is dropped with the state
+            "CO Withholding Exemption": "x",
+            "NY Composite Exemption": "Exemption",
+        },
+        7,
+    )
+
+    assert isinstance(row, ParsedRow)
+    assert row.states == ("TX", "NY")
+    assert list(row.amounts_cents) == [125050, 1000]
+    assert list(row.iter_entries()) == [("TX", 125050, False, False), ("NY", 1000, True, False)]
+
+    # Dict-style access still works for existing callers
+    assert row["investor_name"] == "Alpha"
+    assert row.get("investor_tax_state") == "TX"
+    assert row["distributions"] == {"TX": Decimal("1250.50"), "NY": Decimal("10.00")}
+    assert row["composite_exemptions"] == {"TX": False, "NY": True}
+    assert row.get("missing", "default") == "default"
+
+
+def test_distribution_service_consumes_parsed_rows(db_session):
+    row = ParsedRow(
+        "Alpha", "Corporation", "TX", 2,
+        states=("TX", "CO"),
+        amounts_cents=array("q", [10000, -500]),
+        flags=bytes([ParsedRow.WITHHOLDING_EXEMPT, 0]),
+    )
+
+    entries = list(DistributionService(db_session)._iter_row_distributions(row))
+
+    assert entries == [(USJurisdiction.TX, Decimal("100.00"), False, True)]
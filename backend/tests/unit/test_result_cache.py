@@ -0,0 +1,85 @@
+"""Unit coverage for the single-flight result cache."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.services.result_cache import ResultCache
+
+
+class Computation:
+    """Counts calls and blocks until released."""
+
+    def __init__(self, value="payload"):
+        self.value = value
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        return f"{self.value}-{self.calls}"
+
+
+async def _released_after_start(cache, key, computation, waiters=1, before_release=None):
+    tasks = [asyncio.ensure_future(cache.get_or_compute(key, computation)) for _ in range(waiters)]
+    await asyncio.sleep(0.05)
+    if before_release:
+        before_release()
+    computation.release.set()
+    return await asyncio.gather(*tasks)
+
+
+def test_concurrent_identical_requests_share_one_computation():
+    cache = ResultCache(ttl_seconds=60)
+    computation = Computation()
+
+    async def scenario():
+        results = await _released_after_start(cache, ("results", "s1"), computation, waiters=5)
+        cached = await cache.get_or_compute(("results", "s1"), computation)
+        other = await cache.get_or_compute(("results", "s2"), computation)
+        return results, cached, other
+
+    results, cached, other = asyncio.run(scenario())
+
+    assert results == ["payload-1"] * 5
+    assert cached == "payload-1"
+    assert other == "payload-2"
+    assert computation.calls == 2
+
+
+def test_invalidation_during_computation_skips_storing_stale_result():
+    cache = ResultCache(ttl_seconds=60)
+    computation = Computation()
+
+    async def scenario():
+        first = await _released_after_start(
+            cache, ("report", "s1"), computation,
+            before_release=lambda: cache.invalidate_session("s1"),
+        )
+        second = await cache.get_or_compute(("report", "s1"), computation)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == ["payload-1"]
+    assert second == "payload-2"
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = ResultCache(ttl_seconds=60)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise LookupError("session not found")
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(LookupError):
+                await asyncio.gather(*(cache.get_or_compute(("preview", "s1"), failing) for _ in range(3)))
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 2
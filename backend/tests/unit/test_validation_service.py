@@ -1,25 +1,90 @@
-"""Unit tests for the simplified ValidationService implementation."""
+"""Unit tests for persisted session validation errors."""
 
-from unittest.mock import MagicMock
+import csv
+import io
 
+from src.models.user import User
+from src.models.validation_error import ErrorSeverity
+from src.services.excel_service import ErrorStore
+from src.services.session_service import SessionService
 from src.services.validation_service import ValidationService
 
 
-class TestValidationService:
-    def setup_method(self) -> None:
-        self.service = ValidationService(db=MagicMock())
+def _session_with_errors(db_session):
+    user = User(email="errors@example.com", company_name="Errors")
+    db_session.add(user)
+    db_session.flush()
+    session = SessionService(db_session).create_session(user.id, "upload.csv", "upload.csv", 10)
 
-    def test_get_errors_by_session_returns_empty_list(self) -> None:
-        assert self.service.get_errors_by_session("session-1") == []
+    store = ErrorStore()
+    for row_number in range(2, 7):
+        store.add(row_number, "Distribution TX", "NEGATIVE_AMOUNT", field_value=f"-{row_number}")
+    store.add(3, "Investor Tax State", "INVALID_STATE_CODE", ErrorSeverity.WARNING, "ZZ")
 
-    def test_get_error_summary_returns_zeroed_structure(self) -> None:
-        summary = self.service.get_error_summary("session-1")
-        assert summary == {
-            "totalErrors": 0,
-            "errorsByType": {},
-            "errorsBySheet": {},
-        }
+    service = ValidationService(db_session)
+    assert service.save_errors(session.session_id, store, batch_size=4) == 6
+    db_session.commit()
+    return service, session.session_id
 
-    def test_export_errors_to_csv_data_returns_headers_only(self) -> None:
-        csv_data = self.service.export_errors_to_csv_data("session-1")
-        assert csv_data.strip() == "error_type,sheet_name,row_number,message"
+
+def test_get_errors_by_session_pages_by_id(db_session):
+    service, session_id = _session_with_errors(db_session)
+
+    first = service.get_errors_by_session(session_id, limit=4)
+    rest = service.get_errors_by_session(session_id, after_id=first[-1].id, limit=4)
+
+    assert [error.row_number for error in first + rest] == [2, 3, 4, 5, 6, 3]
+    assert first[0].error_message == "Negative amount -2 is not allowed"
+    assert service.get_errors_by_session("other-session") == []
+
+
+def test_get_error_summary_groups_in_sql(db_session):
+    service, session_id = _session_with_errors(db_session)
+
+    assert service.get_error_summary(session_id) == {
+        "total_errors": 6,
+        "error_count": 5,
+        "warning_count": 1,
+        "errors_by_code": {"NEGATIVE_AMOUNT": 5, "INVALID_STATE_CODE": 1},
+        "errors_by_column": {"Distribution TX": 5, "Investor Tax State": 1},
+    }
+    assert SessionService(db_session).get_session_summary(session_id)["error_count"] == 6
+
+
+def test_iter_errors_csv_streams_pages(db_session):
+    service, session_id = _session_with_errors(db_session)
+
+    chunks = list(service.iter_errors_csv(session_id, batch_size=2))
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+
+    assert len(chunks) == 3
+    assert rows[0] == ["row_number", "column_name", "error_code", "severity", "error_message", "field_value"]
+    assert rows[-1] == ["3", "Investor Tax State", "INVALID_STATE_CODE", "WARNING", "Invalid state code: ZZ", "ZZ"]
+    assert len(rows) == 7
+
+
+def test_export_errors_to_csv_data_without_errors_is_header_only(db_session):
+    csv_data = ValidationService(db_session).export_errors_to_csv_data("session-1")
+    assert csv_data.strip() == "row_number,column_name,error_code,severity,error_message,field_value"
+
+
+def test_error_summary_counts_errors_beyond_the_kept_details(db_session):
+    user = User(email="capped@example.com", company_name="Capped")
+    db_session.add(user)
+    db_session.flush()
+    session = SessionService(db_session).create_session(user.id, "upload.csv", "upload.csv", 10)
+
+    store = ErrorStore(detail_per_code=2)
+    for row_number in range(2, 12):
+        store.add(row_number, "Distribution TX", "NEGATIVE_AMOUNT", field_value=f"-{row_number}")
+    store.add(3, "Investor Tax State", "INVALID_STATE_CODE", ErrorSeverity.WARNING, "ZZ")
+
+    service = ValidationService(db_session)
+    assert service.save_errors(session.session_id, store) == 3
+    db_session.commit()
+
+    summary = service.get_error_summary(session.session_id)
+    assert summary["total_errors"] == 11
+    assert (summary["error_count"], summary["warning_count"]) == (10, 1)
+    assert summary["errors_by_code"] == {"NEGATIVE_AMOUNT": 10, "INVALID_STATE_CODE": 1}
+    assert SessionService(db_session).get_session_summary(session.session_id)["error_count"] == 11